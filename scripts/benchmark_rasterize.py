@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Rasterization Benchmark
+Times the exporter's PDF to PNG step (pdftoppm and ImageMagick) on a
+100-page PDF with different numbers of parallel page ranges
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "server" / "tools"))
+
+from slide_exporter import SlideExporter  # noqa: E402
+
+
+def make_pdf(path: Path, pages: int):
+    """Write a PDF of slide-sized pages with a little content on each"""
+    images = []
+    for number in range(1, pages + 1):
+        image = Image.new("RGB", (1280, 720), "white")
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((60, 40, 1220, 140), fill=(31, 78, 121))
+        draw.text((80, 70), f"Slide {number}", fill="white", font_size=48)
+        for line in range(8):
+            draw.text((80, 200 + line * 55), f"Bullet point {line + 1} of slide {number}", fill="black", font_size=32)
+        draw.ellipse((900, 300, 1200, 600), fill=(237, 125, 49))
+        images.append(image)
+    images[0].save(path, "PDF", resolution=96, save_all=True, append_images=images[1:])
+
+
+def benchmark(rasterizer: str, pdf_file: Path, pages: int, workers: int) -> float:
+    """Rasterize the PDF once and return the seconds taken"""
+    work_dir = Path(tempfile.mkdtemp(prefix="pptx_raster_"))
+    try:
+        exporter = SlideExporter(work_dir / "presentations", workers=workers)
+        output_dir = work_dir / "images"
+        output_dir.mkdir()
+        convert = exporter._pdf_to_png_pdftoppm if rasterizer == "pdftoppm" else exporter._pdf_to_png_imagemagick
+
+        started = time.perf_counter()
+        convert(pdf_file, output_dir, pages)
+        elapsed = time.perf_counter() - started
+
+        images = sorted(output_dir.glob("slide-*.png"))
+        expected = [f"slide-{number:03d}.png" for number in range(1, pages + 1)]
+        if [image.name for image in images] != expected:
+            raise RuntimeError(f"{rasterizer} with {workers} workers produced {len(images)} of {pages} images")
+        return elapsed
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Main entry point for the benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure PDF rasterization speed by worker count")
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}", help="Comma-separated worker counts")
+    parser.add_argument("--pages", type=int, default=100, help="Pages in the generated PDF")
+    parser.add_argument("--pdf", help="Rasterize this PDF instead of a generated one")
+
+    args = parser.parse_args()
+
+    rasterizers = [name for name, binary in (("pdftoppm", "pdftoppm"), ("imagemagick", "convert")) if shutil.which(binary)]
+    if not rasterizers:
+        print("❌ Neither pdftoppm nor ImageMagick is installed")
+        sys.exit(1)
+
+    pdf_dir = Path(tempfile.mkdtemp(prefix="pptx_raster_pdf_"))
+    try:
+        if args.pdf:
+            pdf_file = Path(args.pdf)
+            pages = SlideExporter(pdf_dir / "presentations")._pdf_page_count(pdf_file)
+            if not pages:
+                print("❌ pdfinfo is needed to count the pages of --pdf")
+                sys.exit(1)
+        else:
+            pdf_file = pdf_dir / "benchmark.pdf"
+            pages = args.pages
+            make_pdf(pdf_file, pages)
+
+        worker_counts = sorted({int(n) for n in args.workers.split(",")})
+        print(f"{pages} pages, {os.cpu_count()} CPU cores")
+        print(f"{'rasterizer':>12} {'workers':>8} {'seconds':>8} {'pages/s':>8} {'speedup':>8}")
+        for rasterizer in rasterizers:
+            baseline = None
+            for workers in worker_counts:
+                elapsed = benchmark(rasterizer, pdf_file, pages, workers)
+                baseline = baseline or elapsed
+                print(f"{rasterizer:>12} {workers:>8} {elapsed:>8.2f} {pages / elapsed:>8.1f} {baseline / elapsed:>7.2f}x")
+    finally:
+        shutil.rmtree(pdf_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
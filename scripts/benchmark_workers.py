@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Worker Scaling Benchmark
+Starts the MCP server with different SERVER_WORKERS counts and measures
+tool call throughput with concurrent clients, each editing its own deck
+"""
+
+import os
+import sys
+import time
+import socket
+import shutil
+import asyncio
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+SERVER = Path(__file__).resolve().parent.parent / "server" / "server.py"
+
+
+def wait_for_port(port: int, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+async def _client(url: str, name: str, slides: int, check: bool) -> int:
+    from fastmcp import Client
+
+    calls = 0
+    async with Client(url) as client:
+        await client.call_tool("create_presentation", {"name": name})
+        calls += 1
+        for i in range(slides):
+            await client.call_tool("add_slide", {"presentation_name": name})
+            await client.call_tool("add_text_to_slide", {
+                "presentation_name": name, "slide_index": -1, "text": f"Slide {i}"
+            })
+            await client.call_tool("get_presentation_info", {"presentation_name": name})
+            calls += 3
+        if check:
+            info = (await client.call_tool("get_presentation_info", {"presentation_name": name})).data
+            if info["slide_count"] != slides:
+                raise RuntimeError(f"{name}: expected {slides} slides, found {info['slide_count']}")
+    return calls
+
+
+def run_client(url: str, name: str, slides: int, check: bool) -> int:
+    """Run one client in its own process so the clients never bottleneck"""
+    return asyncio.run(_client(url, name, slides, check))
+
+
+def benchmark(workers: int, clients: int, slides: int, port: int) -> float:
+    """Start a server with the given number of workers and return calls per second"""
+    data_dir = Path(tempfile.mkdtemp(prefix="pptx_bench_"))
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        SERVER_WORKERS=str(workers),
+        PRESENTATIONS_DIR=str(data_dir),
+        RENDER_POOL_SIZE="0"
+    )
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER)], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        wait_for_port(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+        names = [f"deck{i}" for i in range(clients)]
+
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            # Warm up imports in the client processes before timing
+            list(pool.map(run_client, [url] * clients, [f"warmup{i}" for i in range(clients)], [1] * clients, [False] * clients))
+
+            started = time.perf_counter()
+            calls = sum(pool.map(run_client, [url] * clients, names, [slides] * clients, [True] * clients))
+            elapsed = time.perf_counter() - started
+        return calls / elapsed
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(server.pid, 9)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    """Main entry point for the benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure MCP server throughput by worker count")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--slides", type=int, default=40, help="Slides added by each client")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the benchmark server")
+
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.slides} slides each (3 calls per slide)")
+    print(f"{'workers':>8} {'calls/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in [int(n) for n in args.workers.split(",")]:
+        throughput = benchmark(workers, args.clients, args.slides, args.port)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
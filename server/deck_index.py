@@ -0,0 +1,65 @@
+"""
+Deck Index
+Per-presentation summary of every slide (title, layout, notes, shape and
+word counts), refreshed slide by slide as edits are applied
+"""
+
+from typing import Dict, Any, Iterable, List
+
+from pptx import Presentation
+
+
+def summarize_slide(slide) -> Dict[str, Any]:
+    """Summary of one slide, in the shape get_presentation_info reports it"""
+    shapes = slide.shapes
+    words = 0
+    for shape in shapes:
+        if shape.has_text_frame:
+            words += len(shape.text_frame.text.split())
+
+    summary = {
+        "layout": slide.slide_layout.name if hasattr(slide.slide_layout, 'name') else "unknown",
+        "has_notes": slide.has_notes_slide,
+        "shape_count": len(shapes),
+        "word_count": words
+    }
+    title = shapes.title
+    if title:
+        summary["title"] = title.text
+    return summary
+
+
+class DeckIndex:
+    """Slide summaries of one presentation at a given version"""
+
+    def __init__(self, prs: Presentation, version: int):
+        """
+        Build the index by summarizing every slide
+
+        Args:
+            prs: Presentation to index
+            version: Presentation version the index reflects
+        """
+        self.version = version
+        self.slides: List[Dict[str, Any]] = [summarize_slide(slide) for slide in prs.slides]
+
+    def refresh(self, prs: Presentation, slide_indices: Iterable[int], version: int):
+        """
+        Re-summarize the slides touched by an edit
+
+        Args:
+            prs: The edited presentation
+            slide_indices: Indices of changed or appended slides, in order
+            version: Presentation version after the edit
+        """
+        slides = prs.slides
+        for index in slide_indices:
+            summary = summarize_slide(slides[index])
+            if index < len(self.slides):
+                self.slides[index] = summary
+            else:
+                self.slides.append(summary)
+        self.version = version
+
+    def info(self) -> List[Dict[str, Any]]:
+        return [{"index": i, **summary} for i, summary in enumerate(self.slides)]
@@ -0,0 +1,112 @@
+"""
+Download Cache
+Serializes presentations into memory with a content hash (ETag) and keeps
+the bytes of recent versions so unchanged decks are not serialized again
+"""
+
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+
+from pptx import Presentation
+
+from incremental_save import package_members
+
+# Fixed entry timestamp, so the same content always produces the same bytes
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def serialize_presentation(prs: Presentation) -> bytes:
+    """
+    Serialize a presentation to .pptx bytes deterministically
+
+    Args:
+        prs: Presentation to serialize
+
+    Returns:
+        Package bytes; identical content yields identical bytes
+    """
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as package:
+        for membername, blob, _ in package_members(prs):
+            info = zipfile.ZipInfo(membername, date_time=ZIP_EPOCH)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o600 << 16
+            package.writestr(info, blob)
+    return buffer.getvalue()
+
+
+class SerializedDeck:
+    """Bytes of one presentation version"""
+
+    def __init__(self, version: int, data: bytes):
+        self.version = version
+        self.data = data
+        self.etag = hashlib.sha256(data).hexdigest()
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def chunk_count(self, chunk_size: int) -> int:
+        return max(1, -(-self.size // chunk_size))
+
+    def chunk(self, index: int, chunk_size: int) -> bytes:
+        return self.data[index * chunk_size:(index + 1) * chunk_size]
+
+
+class DownloadCache:
+    """Latest serialized version of each presentation, bounded by total size"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the download cache
+
+        Args:
+            max_bytes: Total size of serialized decks kept in memory
+        """
+        self.max_bytes = max_bytes
+        self._decks: "OrderedDict[str, SerializedDeck]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, version: int, prs: Presentation) -> SerializedDeck:
+        """
+        Return the serialized presentation, serializing it if it changed
+
+        The caller must hold the presentation's lock.
+
+        Args:
+            name: Presentation name
+            version: Current version of the presentation
+            prs: The presentation itself
+
+        Returns:
+            Serialized deck for that version
+        """
+        with self._lock:
+            deck = self._decks.get(name)
+            if deck is not None and deck.version == version:
+                self._decks.move_to_end(name)
+                self.hits += 1
+                return deck
+
+        deck = SerializedDeck(version, serialize_presentation(prs))
+        with self._lock:
+            self.misses += 1
+            self._decks[name] = deck
+            self._decks.move_to_end(name)
+            used = sum(d.size for d in self._decks.values())
+            # The deck just serialized is kept even when it alone exceeds the budget
+            while used > self.max_bytes and len(self._decks) > 1:
+                _, evicted = self._decks.popitem(last=False)
+                used -= evicted.size
+        return deck
+
+    def discard(self, name: str) -> Optional[SerializedDeck]:
+        with self._lock:
+            return self._decks.pop(name, None)
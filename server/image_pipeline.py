@@ -0,0 +1,165 @@
+"""
+Image Pipeline
+Downsamples and re-encodes images to their display size before they are
+embedded, caching processed results by source content hash
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# python-pptx assumes this resolution for images without DPI information
+DEFAULT_IMAGE_DPI = 72
+
+
+class ImagePipeline:
+    """Prepare images for embedding at a target resolution"""
+
+    def __init__(self, cache_dir: Path, dpi: int = 150, jpeg_quality: int = 85):
+        """
+        Initialize the image pipeline
+
+        Args:
+            cache_dir: Directory holding processed images
+            dpi: Pixels per inch of display size to keep
+            jpeg_quality: Quality for re-encoded JPEG images
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> content hash, so unchanged files are not re-read
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.passthrough = 0
+        self.bytes_saved = 0
+
+    def _content_hash(self, path: Path) -> str:
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            digest = hashlib.sha1(path.read_bytes()).hexdigest()
+            with self._lock:
+                if len(self._hashes) > 4096:
+                    self._hashes.clear()
+                self._hashes[key] = digest
+        return digest
+
+    @staticmethod
+    def display_size(
+        image: Image.Image,
+        width: Optional[float],
+        height: Optional[float]
+    ) -> Tuple[float, float]:
+        """Display size in inches, resolved the way python-pptx sizes pictures"""
+        px_width, px_height = image.size
+        if width and height:
+            return width, height
+        if width:
+            return width, width * px_height / px_width
+        if height:
+            return height * px_width / px_height, height
+
+        dpi = image.info.get("dpi", (DEFAULT_IMAGE_DPI, DEFAULT_IMAGE_DPI))
+        dpi_x = int(round(dpi[0])) or DEFAULT_IMAGE_DPI
+        dpi_y = int(round(dpi[1])) or DEFAULT_IMAGE_DPI
+        return px_width / dpi_x, px_height / dpi_y
+
+    def _encode(self, image: Image.Image, source_format: Optional[str]) -> Tuple[Image.Image, str, Dict[str, Any]]:
+        """Pick an output format: PNG for transparency and flat graphics, JPEG for photos"""
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        if has_alpha:
+            return image, "png", {"optimize": True}
+        if source_format == "JPEG" or image.convert("RGB").getcolors(256) is None:
+            return image.convert("RGB"), "jpg", {"quality": self.jpeg_quality, "optimize": True, "progressive": True}
+        return image, "png", {"optimize": True}
+
+    def prepare(
+        self,
+        image_path: str,
+        width: Optional[float] = None,
+        height: Optional[float] = None
+    ) -> Tuple[str, Optional[float], Optional[float]]:
+        """
+        Downsample an image to its display size
+
+        Args:
+            image_path: Source image file
+            width: Optional display width in inches
+            height: Optional display height in inches
+
+        Returns:
+            (path to embed, display width, display height); the size is
+            resolved from the source so the picture keeps its layout size
+        """
+        source = Path(image_path)
+        try:
+            with Image.open(source) as image:
+                source_format = image.format
+                display_width, display_height = self.display_size(image, width, height)
+                target = (
+                    max(1, round(display_width * self.dpi)),
+                    max(1, round(display_height * self.dpi))
+                )
+
+                # Already small enough: embed the original untouched
+                if image.size[0] <= target[0] and image.size[1] <= target[1]:
+                    with self._lock:
+                        self.passthrough += 1
+                    return image_path, display_width, display_height
+
+                digest = self._content_hash(source)
+                cached = list(self.cache_dir.glob(f"{digest}_{target[0]}x{target[1]}.*"))
+                if cached:
+                    with self._lock:
+                        self.hits += 1
+                    return str(cached[0]), display_width, display_height
+
+                image.load()
+                resized = image.resize(target, Image.LANCZOS)
+                resized, ext, options = self._encode(resized, source_format)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            # Formats Pillow cannot handle (SVG, EMF, ...) are embedded as they are
+            logger.info(f"Embedding {image_path} unprocessed: {e}")
+            return image_path, width, height
+
+        output = self.cache_dir / f"{digest}_{target[0]}x{target[1]}.{ext}"
+        # A temporary file of its own, so threads preparing the same image
+        # never write into each other's output before it is published
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f".{output.name}.", suffix=".tmp", delete=False) as tmp:
+            try:
+                resized.save(tmp, format="JPEG" if ext == "jpg" else "PNG", **options)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+        os.replace(tmp.name, output)
+
+        with self._lock:
+            self.misses += 1
+            self.bytes_saved += max(0, source.stat().st_size - output.stat().st_size)
+        return str(output), display_width, display_height
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters and bytes saved by downsampling"""
+        with self._lock:
+            return {
+                "dpi": self.dpi,
+                "hits": self.hits,
+                "misses": self.misses,
+                "passthrough": self.passthrough,
+                "bytes_saved": self.bytes_saved
+            }
@@ -0,0 +1,128 @@
+"""
+Incremental Save
+Saves a presentation by rewriting only the package parts that changed since
+the previous save, copying unchanged zip entries byte-for-byte
+"""
+
+import os
+import copy
+import struct
+import hashlib
+import zipfile
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from pptx import Presentation
+from pptx.opc.serialized import CONTENT_TYPES_URI, PACKAGE_URI, _ContentTypesItem, serialize_part_xml
+
+
+def _copy_raw(src: zipfile.ZipFile, info: zipfile.ZipInfo, dst: zipfile.ZipFile):
+    """Append an entry of src to dst without decompressing and recompressing it"""
+    src.fp.seek(info.header_offset)
+    header = src.fp.read(zipfile.sizeFileHeader)
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    src.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+    data = src.fp.read(info.compress_size)
+
+    new_info = copy.copy(info)
+    # Sizes and CRC are known, so write them in the local header
+    new_info.flag_bits &= ~0x08
+    dst.fp.seek(dst.start_dir)
+    new_info.header_offset = dst.fp.tell()
+    dst.fp.write(new_info.FileHeader())
+    dst.fp.write(data)
+    dst.start_dir = dst.fp.tell()
+    dst.filelist.append(new_info)
+    dst.NameToInfo[new_info.filename] = new_info
+    dst._didModify = True
+
+
+def package_members(prs: Presentation) -> Iterator[Tuple[str, bytes, bool]]:
+    """Yield (membername, blob, binary) in the order python-pptx writes them"""
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+
+    yield CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts)), False
+    yield PACKAGE_URI.rels_uri.membername, package._rels.xml, False
+    for part in parts:
+        yield part.partname.membername, part.blob, not hasattr(part, "_element")
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml, False
+
+
+class IncrementalSaver:
+    """Remembers what was written by the last save of one presentation"""
+
+    def __init__(self):
+        self.path: Optional[Path] = None
+        # membername -> digest of the bytes stored in the last output
+        self._digests: Dict[str, str] = {}
+        # membername -> binary blob object seen at the last save, with its digest
+        self._blobs: Dict[str, Tuple[bytes, str]] = {}
+        self._stat: Optional[Tuple[int, int]] = None
+
+    def _previous_output(self, path: Path) -> Optional[Path]:
+        """The last output, if it is still exactly what we wrote"""
+        if self.path != path or not path.exists():
+            return None
+        stat = path.stat()
+        if (stat.st_size, stat.st_mtime_ns) != self._stat:
+            return None
+        return path
+
+    def _digest(self, membername: str, blob: bytes, binary: bool) -> str:
+        if binary:
+            # Binary parts keep the same bytes object until replaced, skip rehashing it
+            seen = self._blobs.get(membername)
+            if seen and seen[0] is blob:
+                return seen[1]
+            digest = hashlib.sha1(blob).hexdigest()
+            self._blobs[membername] = (blob, digest)
+            return digest
+        return hashlib.sha1(blob).hexdigest()
+
+    def save(self, prs: Presentation, path: Path) -> Dict[str, Any]:
+        """
+        Save the presentation to path, reusing unchanged entries of the last save
+
+        Args:
+            prs: Presentation to save
+            path: Output file; reuse only happens when saving to the same path
+
+        Returns:
+            Dictionary with the number of parts written and copied
+        """
+        path = Path(path)
+        previous = self._previous_output(path)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+
+        written = copied = 0
+        digests: Dict[str, str] = {}
+        src = zipfile.ZipFile(previous) if previous else None
+        try:
+            with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, strict_timestamps=False) as dst:
+                for membername, blob, binary in package_members(prs):
+                    digest = self._digest(membername, blob, binary)
+                    digests[membername] = digest
+
+                    if src is not None and self._digests.get(membername) == digest:
+                        info = src.NameToInfo.get(membername)
+                        if info is not None:
+                            _copy_raw(src, info, dst)
+                            copied += 1
+                            continue
+
+                    dst.writestr(membername, blob)
+                    written += 1
+        finally:
+            if src is not None:
+                src.close()
+
+        os.replace(tmp_path, path)
+        stat = path.stat()
+        self.path = path
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+        self._digests = digests
+        self._blobs = {name: seen for name, seen in self._blobs.items() if name in digests}
+
+        return {"parts_written": written, "parts_copied": copied}
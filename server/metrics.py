@@ -0,0 +1,190 @@
+"""
+Server Metrics
+Per-tool call counts, error counts and latency histograms, recorded by a
+FastMCP middleware and exported as JSON or Prometheus text
+"""
+
+import re
+import math
+import time
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from fastmcp.server.middleware import Middleware
+
+# Error messages of tools that return plain strings
+ERROR_MESSAGE = re.compile(r"^(Error|Failed)\b|\b(not found|out of range)$")
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+
+class _ToolStats:
+    """Counters and latency histogram of one tool"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bucket_counts = [0] * len(buckets)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class ToolMetrics:
+    """Thread-safe registry of per-tool metrics"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize the registry
+
+        Args:
+            buckets: Ascending latency bucket bounds in seconds, ending with inf
+        """
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._tools: Dict[str, _ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, tool: str) -> _ToolStats:
+        stats = self._tools.get(tool)
+        if stats is None:
+            stats = self._tools[tool] = _ToolStats(self.buckets)
+        return stats
+
+    def start(self, tool: str):
+        """Record that a call started"""
+        with self._lock:
+            self._stats(tool).in_flight += 1
+
+    def finish(self, tool: str, seconds: float, error: bool = False):
+        """Record that a call finished after the given number of seconds"""
+        with self._lock:
+            stats = self._stats(tool)
+            stats.in_flight -= 1
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.latency_sum += seconds
+            stats.latency_max = max(stats.latency_max, seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats.bucket_counts[i] += 1
+                    break
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-tool counters and latencies as a dictionary"""
+        with self._lock:
+            uptime = time.time() - self.started_at
+            tools = {}
+            for tool, stats in sorted(self._tools.items()):
+                cumulative = 0
+                histogram = {}
+                for bound, count in zip(self.buckets, stats.bucket_counts):
+                    cumulative += count
+                    histogram[_number(bound)] = cumulative
+                tools[tool] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "in_flight": stats.in_flight,
+                    "calls_per_second": stats.calls / uptime if uptime > 0 else 0.0,
+                    "latency_avg": stats.latency_sum / stats.calls if stats.calls else 0.0,
+                    "latency_max": stats.latency_max,
+                    "latency_buckets": histogram
+                }
+        return {"uptime_seconds": uptime, "tools": tools}
+
+    def prometheus(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+
+        Args:
+            gauges: Extra gauges, metric name -> (help text, value)
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            tools = [(tool, stats) for tool, stats in sorted(self._tools.items())]
+
+            header("pptx_tool_calls_total", "counter", "Completed tool calls")
+            for tool, stats in tools:
+                lines.append(f'pptx_tool_calls_total{{tool="{_label(tool)}"}} {stats.calls}')
+
+            header("pptx_tool_errors_total", "counter", "Tool calls that raised or returned an error")
+            for tool, stats in tools:
+                lines.append(f'pptx_tool_errors_total{{tool="{_label(tool)}"}} {stats.errors}')
+
+            header("pptx_tool_in_flight", "gauge", "Tool calls currently running")
+            for tool, stats in tools:
+                lines.append(f'pptx_tool_in_flight{{tool="{_label(tool)}"}} {stats.in_flight}')
+
+            header("pptx_tool_latency_seconds", "histogram", "Tool call latency")
+            for tool, stats in tools:
+                label = _label(tool)
+                cumulative = 0
+                for bound, count in zip(self.buckets, stats.bucket_counts):
+                    cumulative += count
+                    lines.append(f'pptx_tool_latency_seconds_bucket{{tool="{label}",le="{_number(bound)}"}} {cumulative}')
+                lines.append(f'pptx_tool_latency_seconds_sum{{tool="{label}"}} {stats.latency_sum!r}')
+                lines.append(f'pptx_tool_latency_seconds_count{{tool="{label}"}} {stats.calls}')
+
+        for name, (help_text, value) in (gauges or {}).items():
+            header(name, "gauge", help_text)
+            lines.append(f"{name} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _is_error(result: Any) -> bool:
+    """
+    Tools report most failures in their result instead of raising
+
+    Dictionaries carry an "error" key or an "error" status; tools returning
+    strings answer with a message like "Error creating presentation: ...",
+    "Presentation 'x' not found" or "Slide index 9 out of range".
+    """
+    content = getattr(result, "structured_content", None)
+    if not isinstance(content, dict):
+        return False
+    # Return values other than objects are wrapped as {"result": value}
+    for value in (content, content.get("result")):
+        if isinstance(value, dict) and ("error" in value or value.get("status") == "error"):
+            return True
+        if isinstance(value, str) and ERROR_MESSAGE.search(value):
+            return True
+    return False
+
+
+class MetricsMiddleware(Middleware):
+    """Times every tool call into a ToolMetrics registry"""
+
+    def __init__(self, metrics: ToolMetrics):
+        self.metrics = metrics
+
+    async def on_call_tool(self, context, call_next):
+        tool = context.message.name
+        self.metrics.start(tool)
+        started = time.perf_counter()
+        error = True
+        try:
+            result = await call_next(context)
+            error = _is_error(result)
+            return result
+        finally:
+            self.metrics.finish(tool, time.perf_counter() - started, error)
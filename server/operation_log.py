@@ -0,0 +1,303 @@
+"""
+Operation Log
+Append-only, per-presentation log of edits with periodic snapshots, so
+open presentations can be rebuilt after a restart by replaying the edits
+made since their last snapshot
+"""
+
+import os
+import json
+import logging
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+from pptx import Presentation
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = "ops.log"
+SNAPSHOT_PREFIX = "snapshot-"
+# Random id written when a log is started, so a log started over is told apart
+EPOCH_FILE = "epoch"
+
+
+class _LogState:
+    """Sequence counters of one presentation's log"""
+
+    def __init__(self, seq: int = 0, since_snapshot: int = 0):
+        self.seq = seq
+        self.since_snapshot = since_snapshot
+
+
+class OperationLog:
+    """Write-ahead log of presentation edits with batched fsync"""
+
+    def __init__(self, log_dir: Path, fsync_interval: float = 0.5, snapshot_every: int = 200):
+        """
+        Initialize the operation log
+
+        Args:
+            log_dir: Directory with one subdirectory per presentation
+            fsync_interval: Seconds between fsyncs of logs written to since
+                the last one (0 fsyncs every append)
+            snapshot_every: Logged edits after which a snapshot is due
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+
+        self._lock = threading.Lock()
+        self._states: Dict[str, _LogState] = {}
+        self._dirty: Set[Path] = set()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.appended = 0
+        self.snapshots = 0
+        self.fsyncs = 0
+
+    def _dir(self, name: str) -> Path:
+        return self.log_dir / quote(name, safe='')
+
+    def _snapshots(self, name: str) -> List[Tuple[int, Path]]:
+        """Snapshots of a presentation as (seq, path), oldest first"""
+        found = []
+        for path in self._dir(name).glob(f"{SNAPSHOT_PREFIX}*.pptx"):
+            try:
+                found.append((int(path.stem[len(SNAPSHOT_PREFIX):]), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def _prepare_dir(self, name: str) -> Path:
+        directory = self._dir(name)
+        if not directory.exists():
+            directory.mkdir(parents=True)
+            (directory / EPOCH_FILE).write_text(uuid.uuid4().hex)
+        return directory
+
+    def start(self):
+        """Start the background thread batching fsyncs"""
+        if self.fsync_interval > 0 and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="oplog-fsync", daemon=True)
+            self._flusher.start()
+
+    def stop(self):
+        """Stop the fsync thread and flush what is pending"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+            self._flusher = None
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.fsync_interval):
+            self.flush()
+
+    def flush(self):
+        """fsync every log appended to since the last flush"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        for path in dirty:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                with self._lock:
+                    self.fsyncs += 1
+            except FileNotFoundError:
+                pass
+
+    def append(self, name: str, records: List[Dict[str, Any]]):
+        """
+        Append records to a presentation's log
+
+        The caller must hold the presentation's lock. Records are written
+        through to the OS at once and fsynced by the background thread.
+
+        Args:
+            name: Presentation name
+            records: Records to append, each gets the next sequence number
+        """
+        if not records:
+            return
+        log_path = self._dir(name) / LOG_FILE
+        with self._lock:
+            state = self._states.setdefault(name, _LogState())
+            lines = []
+            for record in records:
+                state.seq += 1
+                lines.append(json.dumps({"seq": state.seq, **record}, default=str))
+            state.since_snapshot += len(records)
+            self.appended += len(records)
+
+        self._prepare_dir(name)
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            if self.fsync_interval <= 0:
+                os.fsync(f.fileno())
+
+        if self.fsync_interval > 0:
+            with self._lock:
+                self._dirty.add(log_path)
+
+    def reset(self, name: str, record: Dict[str, Any]):
+        """Start a presentation's log over with a single record (e.g. its creation)"""
+        self.remove(name)
+        self.append(name, [record])
+
+    def needs_snapshot(self, name: str) -> bool:
+        with self._lock:
+            state = self._states.get(name)
+            return state is not None and state.since_snapshot >= self.snapshot_every
+
+    def snapshot(self, name: str, prs: Presentation):
+        """
+        Save the presentation as a snapshot and truncate its log
+
+        The caller must hold the presentation's lock. The snapshot is named
+        after the last logged sequence number, so if the process dies
+        before the log is truncated the covered records are skipped.
+
+        Args:
+            name: Presentation name
+            prs: Presentation in its current state
+        """
+        directory = self._prepare_dir(name)
+        with self._lock:
+            state = self._states.setdefault(name, _LogState())
+            seq = state.seq
+
+        tmp_path = directory / f".{SNAPSHOT_PREFIX}{seq:012d}.tmp"
+        prs.save(tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, directory / f"{SNAPSHOT_PREFIX}{seq:012d}.pptx")
+
+        for old_seq, path in self._snapshots(name):
+            if old_seq < seq:
+                path.unlink(missing_ok=True)
+        with open(directory / LOG_FILE, "w", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+
+        with self._lock:
+            state.since_snapshot = 0
+            self.snapshots += 1
+
+    def remove(self, name: str):
+        """Delete a presentation's log and snapshots"""
+        directory = self._dir(name)
+        with self._lock:
+            self._states.pop(name, None)
+            self._dirty.discard(directory / LOG_FILE)
+        if directory.exists():
+            for path in directory.iterdir():
+                path.unlink(missing_ok=True)
+            directory.rmdir()
+
+    def exists(self, name: str) -> bool:
+        return self._dir(name).exists()
+
+    def names(self) -> List[str]:
+        """Presentations that have a log or snapshot on disk"""
+        return sorted(unquote(path.name) for path in self.log_dir.iterdir() if path.is_dir())
+
+    def _read(self, name: str, after_seq: int) -> List[Dict[str, Any]]:
+        """Records with a sequence number above after_seq, cutting off a torn tail"""
+        records = []
+        log_path = self._dir(name) / LOG_FILE
+        if not log_path.exists():
+            return records
+
+        valid_bytes = 0
+        with open(log_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write; cut it off
+                    # so later appends are not stranded behind it
+                    logger.warning(f"Truncating unreadable operation log tail for '{name}'")
+                    break
+                valid_bytes += len(line)
+                if record.get("seq", 0) > after_seq:
+                    records.append(record)
+        if valid_bytes < log_path.stat().st_size:
+            os.truncate(log_path, valid_bytes)
+        return records
+
+    def load(self, name: str) -> Tuple[Optional[Path], List[Dict[str, Any]]]:
+        """
+        Read what is needed to rebuild a presentation
+
+        Args:
+            name: Presentation name
+
+        Returns:
+            (latest snapshot or None, records logged after it in order)
+        """
+        snapshots = self._snapshots(name)
+        snapshot_seq, snapshot = snapshots[-1] if snapshots else (0, None)
+        records = self._read(name, snapshot_seq)
+
+        last_seq = records[-1]["seq"] if records else snapshot_seq
+        with self._lock:
+            self._states[name] = _LogState(last_seq, len(records))
+        return snapshot, records
+
+    def head(self, name: str) -> Tuple[Optional[str], int]:
+        """(epoch, last sequence number) of the log as this process last saw it"""
+        try:
+            epoch = (self._dir(name) / EPOCH_FILE).read_text()
+        except FileNotFoundError:
+            return None, 0
+        with self._lock:
+            state = self._states.get(name)
+            return epoch, state.seq if state else 0
+
+    def records_after(self, name: str, epoch: str, seq: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Records appended since a known point, to catch a copy up cheaply
+
+        Args:
+            name: Presentation name
+            epoch: Epoch of the log the copy was built from
+            seq: Last sequence number the copy reflects
+
+        Returns:
+            The missing records in order, or None if the log was started over
+            or compacted past seq and the copy has to be rebuilt
+        """
+        current_epoch, _ = self.head(name)
+        snapshots = self._snapshots(name)
+        snapshot_seq = snapshots[-1][0] if snapshots else 0
+        if current_epoch != epoch or snapshot_seq > seq:
+            return None
+
+        records = self._read(name, seq)
+        if records and records[0]["seq"] != seq + 1:
+            return None
+
+        with self._lock:
+            state = self._states.setdefault(name, _LogState())
+            state.seq = records[-1]["seq"] if records else seq
+            state.since_snapshot = state.seq - snapshot_seq
+        return records
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "logs": len(self._states),
+                "appended": self.appended,
+                "snapshots": self.snapshots,
+                "fsyncs": self.fsyncs,
+                "pending_fsync": len(self._dirty)
+            }
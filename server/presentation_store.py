@@ -0,0 +1,300 @@
+"""
+Presentation Store
+Keeps active presentations in memory within a budget, spilling the least
+recently used ones to disk and reloading them transparently on access
+"""
+
+import time
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+from urllib.parse import quote
+
+from lxml import etree
+from pptx import Presentation
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(prs: Presentation) -> int:
+    """Approximate footprint of a presentation: serialized XML plus binary parts"""
+    total = 0
+    for part in prs.part.package.iter_parts():
+        element = getattr(part, "_element", None)
+        if element is not None:
+            total += len(etree.tostring(element))
+        else:
+            total += len(part.blob)
+    return total
+
+
+class _Entry:
+    """An in-memory or spilled presentation"""
+
+    def __init__(self, prs: Optional[Presentation], version: int):
+        self.prs = prs
+        self.version = version
+        self.size = 0
+        self.dirty = True
+        self.last_access = time.time()
+
+
+class _LockUse:
+    """One use of a presentation's lock; the store drops a lock nobody uses"""
+
+    def __init__(self, store: "PresentationStore", name: str, lock):
+        self.store = store
+        self.name = name
+        self.lock = lock
+
+    def __enter__(self):
+        try:
+            self.lock.__enter__()
+        except BaseException:
+            self.store._release_lock(self.name)
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            return self.lock.__exit__(*exc_info)
+        finally:
+            self.store._release_lock(self.name)
+
+
+class PresentationStore:
+    """Dictionary-like store of presentations bounded by a memory budget"""
+
+    def __init__(self, spill_dir: Path, max_bytes: int = 512 * 1024 * 1024, check_interval: float = 1.0):
+        """
+        Initialize the store
+
+        Args:
+            spill_dir: Directory for presentations evicted from memory
+            max_bytes: Memory budget for presentations kept in memory
+            check_interval: Minimum seconds between budget checks triggered
+                by edits
+        """
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._locks: Dict[str, Any] = {}
+        # Callers holding or waiting for each lock
+        self._lock_users: Dict[str, int] = {}
+        self._guard = threading.RLock()
+        self._last_check = 0.0
+        # Versions are unique across presentations, so a replaced deck never reuses one
+        self._versions = itertools.count(1)
+        self.spills = 0
+        self.reloads = 0
+
+    def _spill_path(self, name: str) -> Path:
+        return self.spill_dir / f"{quote(name, safe='')}.pptx"
+
+    def _new_lock(self, name: str):
+        return threading.RLock()
+
+    def lock(self, name: str) -> _LockUse:
+        """
+        Return the lock guarding edits to a presentation, for a with statement
+
+        The lock object is shared by every caller until none of them holds or
+        waits for it, so a deleted presentation does not keep its lock.
+        """
+        return _LockUse(self, name, self._take_lock(name))
+
+    def _take_lock(self, name: str):
+        with self._guard:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = self._new_lock(name)
+            self._lock_users[name] = self._lock_users.get(name, 0) + 1
+            return lock
+
+    def _release_lock(self, name: str):
+        with self._guard:
+            self._lock_users[name] -= 1
+            if not self._lock_users[name]:
+                del self._lock_users[name]
+                if name not in self._entries:
+                    self._locks.pop(name, None)
+
+    def _discard_lock(self, name: str):
+        """Forget a removed presentation's lock, unless it is in use"""
+        with self._guard:
+            if name not in self._lock_users:
+                self._locks.pop(name, None)
+
+    def __contains__(self, name: str) -> bool:
+        with self._guard:
+            return name in self._entries
+
+    def __len__(self) -> int:
+        with self._guard:
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        with self._guard:
+            return list(self._entries.keys())
+
+    def __getitem__(self, name: str) -> Presentation:
+        with self._guard:
+            entry = self._entries[name]
+            self._entries.move_to_end(name)
+            entry.last_access = time.time()
+            if entry.prs is not None:
+                return entry.prs
+
+        # Reload outside the guard, so other presentations stay available,
+        # holding this presentation's lock so it is not spilled meanwhile
+        lock = self._take_lock(name)
+        lock.acquire()
+        try:
+            with self._guard:
+                entry = self._entries[name]
+                prs = entry.prs
+            if prs is None:
+                spill_path = self._spill_path(name)
+                prs = Presentation(spill_path)
+                with self._guard:
+                    if self._entries.get(name) is not entry:
+                        # Replaced while loading
+                        return self[name]
+                    entry.prs = prs
+                    entry.dirty = True
+                    self.reloads += 1
+                spill_path.unlink(missing_ok=True)
+                logger.info(f"Reloaded presentation '{name}' from {spill_path}")
+        finally:
+            lock.release()
+            self._release_lock(name)
+
+        self._enforce_budget(keep=name)
+        return prs
+
+    def __setitem__(self, name: str, prs: Presentation):
+        with self._guard:
+            self._spill_path(name).unlink(missing_ok=True)
+            self._entries[name] = _Entry(prs, next(self._versions))
+            self._entries.move_to_end(name)
+        self._enforce_budget(keep=name)
+
+    def __delitem__(self, name: str):
+        with self._guard:
+            del self._entries[name]
+            self._spill_path(name).unlink(missing_ok=True)
+        self._discard_lock(name)
+
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def mark_dirty(self, name: str):
+        """Record that a presentation changed, re-checking the budget now and then"""
+        with self._guard:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            entry.dirty = True
+            entry.version = next(self._versions)
+            if time.time() - self._last_check < self.check_interval:
+                return
+        self._enforce_budget(keep=name)
+
+    def version(self, name: str) -> int:
+        """Return a number that changes whenever the presentation is edited"""
+        with self._guard:
+            return self._entries[name].version
+
+    def _measure(self, entry: _Entry) -> int:
+        if entry.prs is not None and entry.dirty:
+            entry.size = estimate_size(entry.prs)
+            entry.dirty = False
+        return entry.size if entry.prs is not None else 0
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by in-memory presentations"""
+        with self._guard:
+            return sum(self._measure(entry) for entry in self._entries.values())
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """Spill least recently used presentations until the budget is met"""
+        # Candidates are picked under the guard, but saved outside it so
+        # other presentations can be used while a spill writes to disk
+        with self._guard:
+            self._last_check = time.time()
+            excess = sum(self._measure(entry) for entry in self._entries.values()) - self.max_bytes
+            if excess <= 0:
+                return
+            candidates = [
+                (name, entry) for name, entry in self._entries.items()
+                if name != keep and entry.prs is not None
+            ]
+
+        for name, entry in candidates:
+            if excess <= 0:
+                break
+            excess -= self._spill(name, entry)
+
+    def _spill(self, name: str, entry: _Entry) -> int:
+        """Save one presentation to disk and drop it from memory, returning the bytes freed"""
+        lock = self._take_lock(name)
+        try:
+            # Never spill a presentation that is being edited
+            if not lock.acquire(blocking=False):
+                return 0
+            try:
+                with self._guard:
+                    if self._entries.get(name) is not entry or entry.prs is None:
+                        return 0
+                    prs = entry.prs
+
+                spill_path = self._spill_path(name)
+                try:
+                    prs.save(spill_path)
+                except Exception as e:
+                    logger.error(f"Failed to spill presentation '{name}': {e}")
+                    return 0
+
+                with self._guard:
+                    if self._entries.get(name) is not entry:
+                        # Replaced or removed while saving
+                        spill_path.unlink(missing_ok=True)
+                        return 0
+                    entry.prs = None
+                    self.spills += 1
+                logger.info(f"Spilled presentation '{name}' to {spill_path}")
+                return entry.size
+            finally:
+                lock.release()
+        finally:
+            self._release_lock(name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Spill and reload counters"""
+        with self._guard:
+            return {"presentations": len(self._entries), "spills": self.spills, "reloads": self.reloads}
+
+    def info(self) -> List[Dict[str, Any]]:
+        """Name, state and approximate memory use of every presentation"""
+        with self._guard:
+            return [
+                {
+                    "name": name,
+                    "state": "memory" if entry.prs is not None else "spilled",
+                    "memory_bytes": self._measure(entry),
+                    "last_access": entry.last_access
+                }
+                for name, entry in self._entries.items()
+            ]
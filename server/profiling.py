@@ -0,0 +1,191 @@
+"""
+Call Profiling
+Opt-in cProfile and tracemalloc capture of selected tool calls, writing a
+.pstats file and a top-allocations report per profiled call
+"""
+
+import time
+import random
+import logging
+import cProfile
+import itertools
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by the profilers themselves are left out of the reports
+_PROFILER_FILTERS = [
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, tracemalloc.__file__)
+]
+
+
+class CallProfiler:
+    """Profile a sample of calls to selected tools"""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        tools: Iterable[str] = (),
+        sample_rate: float = 1.0,
+        memory: bool = True,
+        top_allocations: int = 25
+    ):
+        """
+        Initialize the profiler
+
+        Args:
+            output_dir: Directory receiving the profile files
+            tools: Tool names to profile, "*" for every tool
+            sample_rate: Fraction of calls of a selected tool to profile
+            memory: Also trace allocations with tracemalloc
+            top_allocations: Number of allocation sites in each memory report
+        """
+        self.output_dir = Path(output_dir)
+        self.tools = {tool.strip() for tool in tools if tool.strip()}
+        self.sample_rate = sample_rate
+        self.memory = memory
+        self.top_allocations = top_allocations
+
+        self._lock = threading.Lock()
+        # Held by the call being profiled; Python 3.12+ allows one active
+        # cProfile per process, so calls sampled meanwhile run unprofiled
+        self._active = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._tracing = 0
+        self._owns_tracing = False
+        self.profiled = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.tools) and self.sample_rate > 0
+
+    def selected(self, tool: str) -> bool:
+        """Whether this call of the tool should be profiled"""
+        if not self.enabled or ("*" not in self.tools and tool not in self.tools):
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _start_tracing(self):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            self._tracing += 1
+
+    def _stop_tracing(self):
+        with self._lock:
+            self._tracing -= 1
+            # Tracing slows every allocation, keep it on only while profiled calls run
+            if self._tracing == 0 and self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    def call(self, tool: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func, profiling it if the tool is selected
+
+        One call is profiled at a time, a selected call arriving while
+        another is profiled runs unprofiled and is counted as skipped. Only
+        work on the calling thread is seen by cProfile; allocations from
+        calls running concurrently show up in the memory report.
+
+        Args:
+            tool: Tool name used for selection and file names
+            func: Function to call
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            Whatever func returns
+        """
+        if not self.selected(tool):
+            return func(*args, **kwargs)
+
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self.skipped += 1
+            return func(*args, **kwargs)
+        try:
+            return self._profile(tool, func, args, kwargs)
+        finally:
+            self._active.release()
+
+    def _profile(self, tool: str, func: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{time.strftime('%Y%m%d_%H%M%S')}_{tool}_{next(self._sequence)}"
+        profiler = cProfile.Profile()
+        before = None
+        tracing = profiling = False
+
+        try:
+            if self.memory:
+                self._start_tracing()
+                tracing = True
+                before = tracemalloc.take_snapshot().filter_traces(_PROFILER_FILTERS)
+            try:
+                profiler.enable()
+                profiling = True
+            except ValueError as e:
+                # Another profiler is active, e.g. one attached by a debugger
+                logger.warning(f"Not profiling {tool}: {e}")
+                with self._lock:
+                    self.skipped += 1
+
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profiling:
+                    profiler.disable()
+                    elapsed = time.perf_counter() - started
+                    try:
+                        self._write(stem, tool, profiler, before, elapsed)
+                    except Exception as e:
+                        logger.error(f"Failed to write profile for {tool}: {e}")
+        finally:
+            if tracing:
+                self._stop_tracing()
+
+    def _write(
+        self,
+        stem: str,
+        tool: str,
+        profiler: cProfile.Profile,
+        before: Optional[tracemalloc.Snapshot],
+        elapsed: float
+    ):
+        profiler.dump_stats(self.output_dir / f"{stem}.pstats")
+
+        if before is not None:
+            after = tracemalloc.take_snapshot().filter_traces(_PROFILER_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+            diff = after.compare_to(before, "lineno")[:self.top_allocations]
+            lines = [
+                f"tool: {tool}",
+                f"elapsed_seconds: {elapsed:.6f}",
+                f"traced_current_bytes: {current}",
+                f"traced_peak_bytes: {peak}",
+                "",
+                f"Top {len(diff)} allocation sites by size change:"
+            ]
+            lines.extend(str(stat) for stat in diff)
+            (self.output_dir / f"{stem}.alloc.txt").write_text("\n".join(lines) + "\n")
+
+        with self._lock:
+            self.profiled += 1
+        logger.info(f"Profiled {tool} in {elapsed:.3f}s: {self.output_dir / stem}.*")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "tools": sorted(self.tools),
+            "sample_rate": self.sample_rate,
+            "memory": self.memory,
+            "output_dir": str(self.output_dir),
+            "profiled": self.profiled,
+            "skipped": self.skipped
+        }
@@ -0,0 +1,111 @@
+"""
+Render Cache
+Content-addressed on-disk cache of rendered slide images
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class RenderCache:
+    """LRU cache of rendered images on disk, bounded by total size"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the render cache
+
+        Args:
+            cache_dir: Directory holding cached images
+            max_bytes: Total size above which least recently used entries
+                are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Pick up entries from previous runs, oldest access first
+        existing = sorted(self.cache_dir.glob("*.png"), key=lambda p: p.stat().st_mtime)
+        for path in existing:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._bytes += size
+        self._evict()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached image for a key, or None"""
+        with self._lock:
+            path = self._path(key)
+            if key in self._entries and path.exists():
+                self._entries.move_to_end(key)
+                path.touch()
+                self.hits += 1
+                return path
+
+            if key in self._entries:
+                # Removed behind our back
+                self._bytes -= self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, image_path: Path) -> Path:
+        """Store a rendered image under a key and return the cached copy"""
+        with self._lock:
+            path = self._path(key)
+            # Server processes share the directory, each writes a file of its own
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f".{path.name}.", suffix=".tmp", delete=False) as tmp:
+                try:
+                    with open(image_path, "rb") as source:
+                        shutil.copyfileobj(source, tmp)
+                except BaseException:
+                    tmp.close()
+                    os.unlink(tmp.name)
+                    raise
+            os.replace(tmp.name, path)
+
+            size = path.stat().st_size
+            if key in self._entries:
+                self._bytes -= self._entries[key]
+            self._entries[key] = size
+            self._entries.move_to_end(key)
+            self._bytes += size
+            self._evict(keep=key)
+            return path
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._bytes > self.max_bytes and self._entries:
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._bytes -= size
+            self.evictions += 1
+            self._path(key).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
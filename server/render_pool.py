@@ -0,0 +1,362 @@
+"""
+Render Worker Pool
+Dispatches slide conversions to a pool of long-lived headless office workers
+"""
+
+import os
+import sys
+import json
+import signal
+import queue
+import shlex
+import shutil
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKER_CMD = (
+    f"{shlex.quote(sys.executable)} "
+    f"{shlex.quote(str(Path(__file__).parent / 'render_worker.py'))} "
+    "--profile {profile}"
+)
+
+# Seconds a worker gets beyond a job's timeout to report the conversion's own timeout
+RESPONSE_GRACE = 5
+
+
+class RenderError(Exception):
+    """Raised when a conversion cannot be completed by the pool"""
+
+
+class RenderTimeout(RenderError):
+    """Raised when a worker does not answer within the job timeout"""
+
+
+class RenderWorker:
+    """A single long-lived worker process with its own office profile"""
+
+    def __init__(self, worker_id: int, cmd_template: str, profile_dir: Path):
+        self.worker_id = worker_id
+        self.cmd_template = cmd_template
+        self.profile_dir = profile_dir
+        self.process: Optional[subprocess.Popen] = None
+        self.jobs_done = 0
+        self.restarts = 0
+        # "uno" or "cli" as reported by the worker, None until its first ping
+        self.converter: Optional[str] = None
+        self._responses: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Launch the worker process"""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        cmd = shlex.split(self.cmd_template.format(
+            profile=shlex.quote(str(self.profile_dir)),
+            worker_id=self.worker_id
+        ))
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            start_new_session=True
+        )
+        self.jobs_done = 0
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self.process, self._responses),
+            name=f"render-worker-{self.worker_id}-reader",
+            daemon=True
+        ).start()
+        logger.info(f"Started render worker {self.worker_id} (pid {self.process.pid})")
+
+    @staticmethod
+    def _read_responses(process: subprocess.Popen, responses: queue.Queue):
+        for line in process.stdout:
+            try:
+                responses.put(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring malformed worker output: {line.strip()}")
+        # Signal EOF so a waiting request fails fast instead of timing out
+        responses.put(None)
+
+    def stop(self):
+        """Terminate the worker process"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        # Take down the office processes the worker spawned as well
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+        self.process = None
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a request and wait for the matching response"""
+        if not self.alive:
+            raise RenderError(f"Render worker {self.worker_id} is not running")
+
+        self._next_id += 1
+        payload = dict(payload, id=self._next_id)
+        try:
+            self.process.stdin.write(json.dumps(payload) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RenderError(f"Render worker {self.worker_id} crashed: {e}")
+
+        while True:
+            try:
+                response = self._responses.get(timeout=timeout)
+            except queue.Empty:
+                raise RenderTimeout(f"Render worker {self.worker_id} timed out after {timeout}s")
+            if response is None:
+                # Keep the EOF marker for the next request, e.g. the health check
+                self._responses.put(None)
+                raise RenderError(f"Render worker {self.worker_id} exited unexpectedly")
+            if response.get("id") == payload["id"]:
+                return response
+
+    def ping(self, timeout: float = 5) -> bool:
+        try:
+            response = self.request({"op": "ping"}, timeout)
+        except RenderError:
+            return False
+        converter = response.get("converter")
+        if converter == "cli" and self.converter != "cli":
+            logger.warning(
+                f"Render worker {self.worker_id} has no UNO bindings and starts LibreOffice for "
+                "every render; install the office python bindings (python3-uno) to keep it resident"
+            )
+        self.converter = converter
+        return bool(response.get("ok"))
+
+    def convert(self, input_path: Path, outdir: Path, fmt: str, timeout: float) -> List[Path]:
+        # The worker kills a conversion at `timeout`; the grace lets it say so
+        # before the worker itself is considered hung
+        response = self.request({
+            "op": "convert",
+            "input": str(input_path),
+            "outdir": str(outdir),
+            "format": fmt,
+            "timeout": timeout
+        }, timeout + RESPONSE_GRACE)
+        self.jobs_done += 1
+        if not response.get("ok"):
+            raise RenderError(response.get("error", "Unknown render error"))
+        return [Path(p) for p in response.get("outputs", [])]
+
+
+class _Job:
+    """A queued conversion waiting for a worker"""
+
+    def __init__(self, input_path: Path, outdir: Path, fmt: str, timeout: float):
+        self.input_path = input_path
+        self.outdir = outdir
+        self.fmt = fmt
+        self.timeout = timeout
+        self.done = threading.Event()
+        self.outputs: List[Path] = []
+        self.error: Optional[Exception] = None
+
+
+class RenderPool:
+    """Pool of render workers fed from a bounded job queue"""
+
+    def __init__(
+        self,
+        size: int = 2,
+        queue_depth: int = 16,
+        max_jobs_per_worker: int = 50,
+        worker_cmd: str = DEFAULT_WORKER_CMD,
+        profiles_dir: Path = Path("./render_profiles"),
+        job_timeout: float = 120,
+        health_interval: float = 30
+    ):
+        """
+        Initialize the render pool
+
+        Args:
+            size: Number of worker processes
+            queue_depth: Maximum number of jobs waiting for a worker
+            max_jobs_per_worker: Recycle a worker after this many jobs
+            worker_cmd: Command template for a worker; {profile} and {worker_id}
+                are substituted
+            profiles_dir: Parent directory for per-worker office profiles, kept
+                in a subdirectory per server process
+            job_timeout: Default seconds to wait for a single conversion
+            health_interval: Seconds of idleness between health checks
+        """
+        self.size = size
+        self.queue_depth = queue_depth
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.worker_cmd = worker_cmd
+        # Server processes behind the worker router each run a pool, and
+        # office instances must not share a profile
+        self.profiles_dir = Path(profiles_dir) / str(os.getpid())
+        self.job_timeout = job_timeout
+        self.health_interval = health_interval
+
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=queue_depth)
+        self._workers: List[RenderWorker] = []
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._completed = 0
+        self._failed = 0
+
+    def start(self):
+        """Start all workers and their dispatch threads"""
+        if self._running:
+            return
+        self._running = True
+
+        for worker_id in range(self.size):
+            worker = RenderWorker(
+                worker_id,
+                self.worker_cmd,
+                self.profiles_dir / f"worker-{worker_id}"
+            )
+            worker.start()
+            thread = threading.Thread(
+                target=self._dispatch,
+                args=(worker,),
+                name=f"render-worker-{worker_id}",
+                daemon=True
+            )
+            thread.start()
+            self._workers.append(worker)
+            self._threads.append(thread)
+
+    def shutdown(self):
+        """Stop dispatching and terminate all workers"""
+        if not self._running:
+            return
+        self._running = False
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=10)
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
+        self._threads.clear()
+        shutil.rmtree(self.profiles_dir, ignore_errors=True)
+
+    def _ensure_healthy(self, worker: RenderWorker):
+        if not worker.alive or not worker.ping():
+            logger.warning(f"Render worker {worker.worker_id} unhealthy, restarting")
+            worker.restart()
+        elif worker.jobs_done >= self.max_jobs_per_worker:
+            logger.info(f"Recycling render worker {worker.worker_id} after {worker.jobs_done} jobs")
+            worker.restart()
+
+    def _dispatch(self, worker: RenderWorker):
+        while self._running:
+            try:
+                job = self._jobs.get(timeout=self.health_interval)
+            except queue.Empty:
+                self._ensure_healthy(worker)
+                continue
+
+            if job is None:
+                break
+
+            try:
+                self._ensure_healthy(worker)
+                job.outputs = worker.convert(job.input_path, job.outdir, job.fmt, job.timeout)
+            except Exception as e:
+                job.error = e
+                # A timed out or crashed worker is in an unknown state
+                if not worker.alive or isinstance(e, RenderTimeout):
+                    worker.restart()
+            finally:
+                with self._stats_lock:
+                    if job.error:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+                job.done.set()
+
+    def submit(
+        self,
+        input_path: Path,
+        outdir: Path,
+        fmt: str = "png",
+        timeout: Optional[float] = None
+    ) -> List[Path]:
+        """
+        Convert a document on the next free worker
+
+        Args:
+            input_path: Document to convert
+            outdir: Directory for the converted output
+            fmt: Target format (png, pdf)
+            timeout: Seconds to wait for the conversion
+
+        Returns:
+            List of output files
+        """
+        if not self._running:
+            raise RenderError("Render pool is not running")
+
+        timeout = timeout or self.job_timeout
+        job = _Job(Path(input_path), Path(outdir), fmt, timeout)
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            raise RenderError(f"Render queue is full ({self.queue_depth} jobs waiting)")
+
+        # Allow for queueing behind other jobs before giving up
+        if not job.done.wait(timeout=(timeout + RESPONSE_GRACE) * (self.queue_depth // max(self.size, 1) + 2)):
+            raise RenderError("Timed out waiting for a render worker")
+        if job.error:
+            raise job.error
+        return job.outputs
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, queue depth and per-worker counters"""
+        with self._stats_lock:
+            completed, failed = self._completed, self._failed
+        return {
+            "running": self._running,
+            "size": self.size,
+            "queue_depth": self._jobs.qsize(),
+            "max_queue_depth": self.queue_depth,
+            "completed": completed,
+            "failed": failed,
+            "workers": [
+                {
+                    "id": w.worker_id,
+                    "alive": w.alive,
+                    "jobs_done": w.jobs_done,
+                    "restarts": w.restarts,
+                    "converter": w.converter
+                }
+                for w in self._workers
+            ]
+        }
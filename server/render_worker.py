@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Render Worker
+Long-lived headless office worker driven by the render pool in server.py
+
+Speaks a JSON-lines protocol on stdin/stdout, one request per line:
+
+    {"id": 1, "op": "ping"}
+    {"id": 2, "op": "convert", "input": "/path/deck.pptx",
+     "outdir": "/path/out", "format": "png", "timeout": 120}
+
+and answers each request with a single line:
+
+    {"id": 1, "ok": true, "converter": "uno"}
+    {"id": 2, "ok": true, "outputs": ["/path/out/deck.png"]}
+    {"id": 2, "ok": false, "error": "..."}
+
+Any program that implements this protocol can be used as a worker (see
+RENDER_WORKER_CMD), which makes the pool testable with a stand-in script.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import argparse
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Seconds a conversion may take unless the request says otherwise
+DEFAULT_TIMEOUT = 120
+
+# Export filter names understood by Impress
+EXPORT_FILTERS = {
+    "pdf": "impress_pdf_Export",
+    "png": "impress_png_Export",
+}
+
+
+def _kill_group(process: subprocess.Popen):
+    """Kill a process started in its own session, with everything it spawned"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.wait()
+
+
+class CliConverter:
+    """Convert documents by invoking the office binary with a private profile"""
+
+    name = "cli"
+
+    def __init__(self, office: str, profile: Path, timeout: float = DEFAULT_TIMEOUT):
+        self.office = office
+        self.profile = profile
+        self.timeout = timeout
+
+    def convert(self, input_path: Path, outdir: Path, fmt: str, timeout: Optional[float] = None) -> List[Path]:
+        timeout = timeout or self.timeout
+        cmd = [
+            self.office,
+            f"-env:UserInstallation={self.profile.resolve().as_uri()}",
+            "--headless",
+            "--convert-to",
+            fmt,
+            "--outdir",
+            str(outdir),
+            str(input_path)
+        ]
+        # A session of its own, so a hung office and everything it forked can
+        # be killed together and stops holding the profile
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True
+        )
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            _kill_group(process)
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(stderr.strip() or f"exit code {process.returncode}")
+        return sorted(outdir.glob(f"{input_path.stem}*.{fmt}"))
+
+    def close(self):
+        pass
+
+
+class UnoConverter:
+    """Convert documents through a resident office process over UNO"""
+
+    name = "uno"
+
+    def __init__(self, office: str, profile: Path):
+        import uno  # noqa: F401 - only available with the office python bindings
+
+        self.pipe = f"pptx_render_{os.getpid()}"
+        self.process = subprocess.Popen(
+            [
+                office,
+                f"-env:UserInstallation={profile.resolve().as_uri()}",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--norestore",
+                f"--accept=pipe,name={self.pipe};urp;StarOffice.ComponentContext"
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        try:
+            self.desktop = self._connect()
+        except BaseException:
+            # Left running, the office would keep the profile locked for the CLI fallback
+            _kill_group(self.process)
+            raise
+
+    def _connect(self, attempts: int = 50):
+        import uno
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        url = f"uno:pipe,name={self.pipe};urp;StarOffice.ComponentContext"
+        for _ in range(attempts):
+            try:
+                ctx = resolver.resolve(url)
+                return ctx.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", ctx
+                )
+            except Exception:
+                if self.process.poll() is not None:
+                    break
+                time.sleep(0.2)
+        raise RuntimeError("Could not connect to office process")
+
+    @staticmethod
+    def _props(**kwargs):
+        from com.sun.star.beans import PropertyValue
+
+        props = []
+        for name, value in kwargs.items():
+            prop = PropertyValue()
+            prop.Name = name
+            prop.Value = value
+            props.append(prop)
+        return tuple(props)
+
+    def convert(self, input_path: Path, outdir: Path, fmt: str, timeout: Optional[float] = None) -> List[Path]:
+        # A hung conversion is bounded by the pool, which restarts this worker
+        import uno
+
+        if fmt not in EXPORT_FILTERS:
+            raise ValueError(f"Unsupported format '{fmt}'")
+
+        output = outdir / f"{input_path.stem}.{fmt}"
+        doc = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(input_path.resolve())),
+            "_blank", 0, self._props(Hidden=True)
+        )
+        try:
+            doc.storeToURL(
+                uno.systemPathToFileUrl(str(output.resolve())),
+                self._props(FilterName=EXPORT_FILTERS[fmt])
+            )
+        finally:
+            doc.close(True)
+        return [output]
+
+    def close(self):
+        try:
+            self.desktop.terminate()
+        except Exception:
+            pass
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _kill_group(self.process)
+
+
+def create_converter(office: str, profile: Path, timeout: float = DEFAULT_TIMEOUT):
+    """
+    Prefer a resident UNO-driven office, fall back to the command line
+
+    The fallback starts the office for every job, so it is reported on
+    stderr and to the pool through the ping response.
+    """
+    try:
+        return UnoConverter(office, profile)
+    except Exception as e:
+        print(f"UNO unavailable ({e}), starting {office} for every conversion", file=sys.stderr)
+        return CliConverter(office, profile, timeout)
+
+
+def handle(converter, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a single protocol request"""
+    response: Dict[str, Any] = {"id": request.get("id")}
+    op = request.get("op")
+
+    if op == "ping":
+        response.update(ok=True, converter=getattr(converter, "name", None))
+        return response
+
+    if op != "convert":
+        response.update(ok=False, error=f"Unknown op '{op}'")
+        return response
+
+    try:
+        input_path = Path(request["input"])
+        outdir = Path(request["outdir"])
+        outdir.mkdir(parents=True, exist_ok=True)
+        outputs = converter.convert(input_path, outdir, request.get("format", "png"), request.get("timeout"))
+        response.update(ok=True, outputs=[str(p) for p in outputs])
+    except Exception as e:
+        response.update(ok=False, error=str(e))
+
+    return response
+
+
+def main():
+    """Main entry point for the render worker"""
+    parser = argparse.ArgumentParser(description="Headless office render worker")
+    parser.add_argument("--profile", required=True, help="Private office user profile directory")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Seconds before a command line conversion is killed"
+    )
+    parser.add_argument(
+        "--office",
+        default=os.getenv("LIBREOFFICE_PATH", "libreoffice"),
+        help="Office binary"
+    )
+    args = parser.parse_args()
+
+    profile = Path(args.profile)
+    profile.mkdir(parents=True, exist_ok=True)
+
+    if not shutil.which(args.office):
+        print(f"Office binary not found: {args.office}", file=sys.stderr)
+        sys.exit(1)
+
+    converter = create_converter(args.office, profile, args.timeout)
+
+    try:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"id": None, "ok": False, "error": f"Invalid request: {e}"}
+            else:
+                response = handle(converter, request)
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+    finally:
+        converter.close()
+
+
+if __name__ == "__main__":
+    main()
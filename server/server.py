@@ -7,14 +7,24 @@ Enhanced with export capabilities for Claude Code Slide Agent
 
 import os
 import sys
+import time
 import json
 import base64
+import shutil
+import tempfile
+import atexit
+import asyncio
+import functools
+import threading
 import subprocess
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
@@ -22,9 +32,30 @@ from pptx.dml.color import RGBColor
 from PIL import Image
 import io
 
+from render_pool import RenderPool, RenderError, DEFAULT_WORKER_CMD
+from render_cache import RenderCache
+from tools.slide_package import extract_slides, page_ranges, slide_fingerprint
+from tools.process_runner import ProcessRunner, CircuitOpenError
+from tools.thumbnail_pyramid import FULL_LEVEL, parse_levels, select_level, build_pyramid
+from presentation_store import PresentationStore
+from incremental_save import IncrementalSaver
+from template_cache import TemplateCache
+from image_pipeline import ImagePipeline
+from download_cache import DownloadCache, SerializedDeck
+from metrics import ToolMetrics, MetricsMiddleware
+from profiling import CallProfiler
+from deck_index import DeckIndex
+from operation_log import OperationLog
+from shared_store import SharedPresentationStore
+from worker_router import WorkerRouter
+
 # Initialize FastMCP server
 mcp = FastMCP("pptx-mcp-server")
 
+# Per-tool call counts, errors and latencies
+tool_metrics = ToolMetrics()
+mcp.add_middleware(MetricsMiddleware(tool_metrics))
+
 # Configuration
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", "8000"))
@@ -32,15 +63,265 @@ PRESENTATIONS_DIR = Path(os.getenv("PRESENTATIONS_DIR", "./presentations"))
 TEMPLATES_DIR = PRESENTATIONS_DIR / "templates"
 EXPORTS_DIR = PRESENTATIONS_DIR / "exports"
 
+# Render worker pool (RENDER_POOL_SIZE=0 starts a fresh LibreOffice per render)
+RENDER_POOL_SIZE = int(os.getenv("RENDER_POOL_SIZE", "2"))
+RENDER_QUEUE_DEPTH = int(os.getenv("RENDER_QUEUE_DEPTH", "16"))
+RENDER_WORKER_MAX_JOBS = int(os.getenv("RENDER_WORKER_MAX_JOBS", "50"))
+RENDER_WORKER_CMD = os.getenv("RENDER_WORKER_CMD", DEFAULT_WORKER_CMD)
+RENDER_PROFILES_DIR = Path(os.getenv("RENDER_PROFILES_DIR", str(PRESENTATIONS_DIR / ".render_profiles")))
+
+# Converter subprocess limits; the breaker fails renders fast after repeated errors
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "120"))
+RENDER_CONCURRENCY = int(os.getenv("RENDER_CONCURRENCY", str(os.cpu_count() or 1)))
+RENDER_BREAKER_THRESHOLD = int(os.getenv("RENDER_BREAKER_THRESHOLD", "5"))
+RENDER_BREAKER_RESET = float(os.getenv("RENDER_BREAKER_RESET", "30"))
+
+# "slide" renders a one-slide package, "deck" converts the whole presentation
+RENDER_MODE = os.getenv("RENDER_MODE", "slide")
+
+# Whole-deck renders are split into this many slide ranges rendered side by
+# side; more ranges than converters would only queue up, or overflow the pool's queue
+RENDER_SHARDS = max(1, min(
+    int(os.getenv("RENDER_SHARDS", str(os.cpu_count() or 1))),
+    RENDER_POOL_SIZE if RENDER_POOL_SIZE > 0 else RENDER_CONCURRENCY
+))
+
+# Rendered slide images keyed by slide content
+RENDER_CACHE_DIR = Path(os.getenv("RENDER_CACHE_DIR", str(PRESENTATIONS_DIR / ".render_cache")))
+RENDER_CACHE_MAX_MB = int(os.getenv("RENDER_CACHE_MAX_MB", "256"))
+
+# Preview levels (name:width in pixels) scaled from each rendered slide
+RENDER_PYRAMID = parse_levels(os.getenv("RENDER_PYRAMID", "thumb:320,medium:960"))
+
+# Presentations beyond the memory budget are spilled to disk, least recently used first
+PRESENTATION_MEMORY_MB = int(os.getenv("PRESENTATION_MEMORY_MB", "512"))
+SPILL_DIR = Path(os.getenv("SPILL_DIR", str(PRESENTATIONS_DIR / ".spill")))
+
+# Images are downsampled to their display size at this DPI (0 embeds originals)
+IMAGE_DPI = int(os.getenv("IMAGE_DPI", "150"))
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "85"))
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", str(PRESENTATIONS_DIR / ".image_cache")))
+
+# In-memory downloads are streamed in chunks of this size
+DOWNLOAD_CHUNK_KB = int(os.getenv("DOWNLOAD_CHUNK_KB", "512"))
+DOWNLOAD_CACHE_MB = int(os.getenv("DOWNLOAD_CACHE_MB", "64"))
+
+# Opt-in profiling: comma-separated tool names (or "*") get cProfile and
+# tracemalloc dumps written to PROFILE_DIR for a sample of their calls
+PROFILE_TOOLS = [tool for tool in os.getenv("PROFILE_TOOLS", "").split(",") if tool.strip()]
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_MEMORY = os.getenv("PROFILE_MEMORY", "true").lower() == "true"
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(PRESENTATIONS_DIR / ".profiles")))
+
+# Write-ahead log of edits, replayed on startup to restore open presentations
+OPLOG_ENABLED = os.getenv("OPLOG_ENABLED", "true").lower() == "true"
+OPLOG_DIR = Path(os.getenv("OPLOG_DIR", str(PRESENTATIONS_DIR / ".oplog")))
+OPLOG_FSYNC_INTERVAL = float(os.getenv("OPLOG_FSYNC_INTERVAL", "0.5"))
+OPLOG_SNAPSHOT_EVERY = int(os.getenv("OPLOG_SNAPSHOT_EVERY", "200"))
+
+# Multi-process mode: SERVER_WORKERS > 1 runs that many worker processes behind
+# a router sending each presentation's calls to one worker; they share
+# presentations through the operation log, with a lease per presentation
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+LEASE_DIR = Path(os.getenv("LEASE_DIR", str(PRESENTATIONS_DIR / ".leases")))
+LEASE_TIMEOUT = float(os.getenv("LEASE_TIMEOUT", "30"))
+
+# Threads running blocking tool work off the event loop
+TOOL_THREADS = int(os.getenv("TOOL_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+
 # Ensure directories exist
 PRESENTATIONS_DIR.mkdir(parents=True, exist_ok=True)
 TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Store active presentations in memory
-presentations: Dict[str, Presentation] = {}
+# Edits are logged so a restarted server can rebuild open presentations
+oplog = OperationLog(OPLOG_DIR, OPLOG_FSYNC_INTERVAL, OPLOG_SNAPSHOT_EVERY) if OPLOG_ENABLED or SERVER_WORKERS > 1 else None
+
+# Store active presentations in memory, within a budget
+if SERVER_WORKERS > 1:
+    # Workers rebuild presentations changed by other workers from the operation log
+    presentations = SharedPresentationStore(
+        SPILL_DIR, PRESENTATION_MEMORY_MB * 1024 * 1024, oplog,
+        lambda name: load_logged_presentation(name)[0],
+        lambda name, prs, records: replay_operations(name, prs, records),
+        LEASE_DIR, LEASE_TIMEOUT
+    )
+else:
+    presentations = PresentationStore(SPILL_DIR, PRESENTATION_MEMORY_MB * 1024 * 1024)
+
+
+# Templates are parsed once and cloned for each new presentation
+template_cache = TemplateCache(TEMPLATES_DIR)
+
+# Processed images are shared by content hash across slides and decks
+image_pipeline = ImagePipeline(IMAGE_CACHE_DIR, IMAGE_DPI, IMAGE_JPEG_QUALITY) if IMAGE_DPI > 0 else None
+
+# Per-presentation record of the last incremental save
+incremental_savers: Dict[str, IncrementalSaver] = {}
+
+# Slide summaries served by get_presentation_info, kept current by the edit tools
+deck_indexes: Dict[str, DeckIndex] = {}
+
+# Serialized bytes of recently downloaded presentations, keyed by version
+download_cache = DownloadCache(DOWNLOAD_CACHE_MB * 1024 * 1024)
+
+
+def presentation_lock(name: str):
+    """Return the lock guarding edits to a presentation, so batches and single edits never interleave"""
+    return presentations.lock(name)
+
+
+class OperationError(Exception):
+    """Raised by an operation that cannot be applied to a presentation"""
+
+
+call_profiler = CallProfiler(PROFILE_DIR, PROFILE_TOOLS, PROFILE_SAMPLE_RATE, PROFILE_MEMORY)
+
+tool_executor = ThreadPoolExecutor(max_workers=TOOL_THREADS, thread_name_prefix="pptx-tool")
+
+
+def offload(func):
+    """
+    Turn a blocking tool body into an async handler running on the tool threads
+    
+    Edits to different presentations run in parallel, edits to the same
+    presentation are serialized by its lock inside the tool body.
+    """
+    @functools.wraps(func)
+    async def handler(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            tool_executor, functools.partial(call_profiler.call, func.__name__, func, *args, **kwargs)
+        )
+    return handler
+
+
+render_cache = RenderCache(RENDER_CACHE_DIR, RENDER_CACHE_MAX_MB * 1024 * 1024)
+
+process_runner = ProcessRunner(
+    max_concurrency=RENDER_CONCURRENCY,
+    default_timeout=RENDER_TIMEOUT,
+    failure_threshold=RENDER_BREAKER_THRESHOLD,
+    reset_timeout=RENDER_BREAKER_RESET
+)
+
+# Office profiles of one-off LibreOffice processes; a process needs a profile
+# of its own to run next to others
+free_office_profiles: List[Path] = []
+office_profile_count = 0
+office_profile_guard = threading.Lock()
+
+
+def acquire_office_profile() -> Path:
+    """Take an idle office profile, creating one when all are in use"""
+    global office_profile_count
+    with office_profile_guard:
+        if free_office_profiles:
+            return free_office_profiles.pop()
+        office_profile_count += 1
+        return RENDER_PROFILES_DIR / f"oneoff-{os.getpid()}-{office_profile_count}"
+
+
+def release_office_profile(profile: Path):
+    with office_profile_guard:
+        free_office_profiles.append(profile)
+
+
+def remove_office_profiles():
+    """Delete this process's one-off profiles at exit"""
+    for profile in RENDER_PROFILES_DIR.glob(f"oneoff-{os.getpid()}-*"):
+        shutil.rmtree(profile, ignore_errors=True)
+
+
+atexit.register(remove_office_profiles)
+
+# Started at boot in __main__, or lazily on the first render
+render_pool: Optional[RenderPool] = None
+render_pool_guard = threading.Lock()
+
+
+def get_render_pool() -> Optional[RenderPool]:
+    """Return the running render pool, starting it if needed"""
+    global render_pool
+    if RENDER_POOL_SIZE <= 0:
+        return None
+    with render_pool_guard:
+        if render_pool is None:
+            render_pool = RenderPool(
+                size=RENDER_POOL_SIZE,
+                queue_depth=RENDER_QUEUE_DEPTH,
+                max_jobs_per_worker=RENDER_WORKER_MAX_JOBS,
+                worker_cmd=RENDER_WORKER_CMD,
+                profiles_dir=RENDER_PROFILES_DIR,
+                job_timeout=RENDER_TIMEOUT
+            )
+            render_pool.start()
+            atexit.register(render_pool.shutdown)
+    return render_pool
+
+
+async def convert_document(input_path: Path, outdir: Path, fmt: str) -> List[Path]:
+    """
+    Convert a document with the render pool, or a one-off LibreOffice process
+
+    Both paths share the "render" circuit breaker, so a converter that keeps
+    failing is not retried on every request.
+
+    Args:
+        input_path: Document to convert
+        outdir: Directory for the converted output
+        fmt: Target format (png, pdf)
+
+    Returns:
+        List of output files
+    """
+    pool = get_render_pool()
+    if pool:
+        breaker = process_runner.breaker("render")
+        if not breaker.allow():
+            raise RenderError("Renderer is failing repeatedly, not attempting render")
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(tool_executor, functools.partial(pool.submit, input_path, outdir, fmt))
+        try:
+            outputs = await asyncio.shield(job)
+        except asyncio.CancelledError:
+            # A submitted job cannot be withdrawn: let it finish before the
+            # caller removes outdir, and keep its outcome away from the breaker
+            await asyncio.wait([job])
+            raise
+        except RenderError:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return sorted(outputs)
+
+    profile = acquire_office_profile()
+    cmd = [
+        "libreoffice",
+        f"-env:UserInstallation={profile.resolve().as_uri()}",
+        "--headless",
+        "--convert-to",
+        fmt,
+        "--outdir",
+        str(outdir),
+        str(input_path)
+    ]
+
+    try:
+        result = await process_runner.run(cmd, key="render")
+    except CircuitOpenError:
+        raise RenderError("Renderer is failing repeatedly, not attempting render")
+    except subprocess.TimeoutExpired:
+        raise RenderError(f"LibreOffice timed out after {RENDER_TIMEOUT}s")
+    finally:
+        release_office_profile(profile)
+    if result.returncode != 0:
+        raise RenderError(result.stderr)
+    return sorted(outdir.glob(f"{input_path.stem}*.{fmt}"))
+
 
 @mcp.tool()
+@offload
 def create_presentation(name: str, template: Optional[str] = None) -> str:
     """
     Create a new PowerPoint presentation
@@ -53,55 +334,50 @@ def create_presentation(name: str, template: Optional[str] = None) -> str:
         Success message
     """
     try:
-        if template and (TEMPLATES_DIR / f"{template}.pptx").exists():
-            prs = Presentation(TEMPLATES_DIR / f"{template}.pptx")
+        if template and template_cache.exists(template):
+            prs = template_cache.create(template)
         else:
-            prs = Presentation()
+            prs = template_cache.create()
         
-        presentations[name] = prs
+        with presentation_lock(name):
+            presentations[name] = prs
+            if oplog:
+                oplog.reset(name, {"type": "create", "template": template if template and template_cache.exists(template) else None})
         return f"Created presentation '{name}'"
     except Exception as e:
         return f"Error creating presentation: {str(e)}"
 
-@mcp.tool()
-def add_slide(presentation_name: str, layout: str = "title_and_content") -> str:
-    """
-    Add a new slide to the presentation
-    
-    Args:
-        presentation_name: Name of the presentation
-        layout: Slide layout type (title_slide, title_and_content, blank, etc.)
-    
-    Returns:
-        Slide index
-    """
-    if presentation_name not in presentations:
-        return f"Presentation '{presentation_name}' not found"
-    
-    prs = presentations[presentation_name]
-    
-    # Map layout names to indices
-    layout_map = {
-        "title_slide": 0,
-        "title_and_content": 1,
-        "section_header": 2,
-        "two_content": 3,
-        "comparison": 4,
-        "title_only": 5,
-        "blank": 6,
-        "content_with_caption": 7,
-        "picture_with_caption": 8
-    }
-    
-    layout_idx = layout_map.get(layout, 1)
+# Map layout names to indices
+LAYOUT_MAP = {
+    "title_slide": 0,
+    "title_and_content": 1,
+    "section_header": 2,
+    "two_content": 3,
+    "comparison": 4,
+    "title_only": 5,
+    "blank": 6,
+    "content_with_caption": 7,
+    "picture_with_caption": 8
+}
+
+
+def _slide_index(prs: Presentation, slide_index: int) -> int:
+    """Validate a slide index, resolving negative indices from the end"""
+    if not -len(prs.slides) <= slide_index < len(prs.slides):
+        raise OperationError(f"Slide index {slide_index} out of range")
+    return slide_index % len(prs.slides)
+
+
+def _add_slide(prs: Presentation, layout: str = "title_and_content") -> str:
+    layout_idx = LAYOUT_MAP.get(layout, 1)
     slide_layout = prs.slide_layouts[min(layout_idx, len(prs.slide_layouts) - 1)]
-    slide = prs.slides.add_slide(slide_layout)
+    prs.slides.add_slide(slide_layout)
     
     return f"Added slide {len(prs.slides) - 1} with layout '{layout}'"
 
-@mcp.tool()
-def add_text_to_slide(
-    presentation_name: str,
+
+def _add_text_to_slide(
+    prs: Presentation,
     slide_index: int,
     text: str,
     placeholder_index: int = 0,
@@ -110,30 +386,7 @@ def add_text_to_slide(
     italic: bool = False,
     color: Optional[str] = None
 ) -> str:
-    """
-    Add text to a slide
-    
-    Args:
-        presentation_name: Name of the presentation
-        slide_index: Index of the slide
-        text: Text to add
-        placeholder_index: Index of the placeholder (0 for title, 1 for content)
-        font_size: Optional font size in points
-        bold: Make text bold
-        italic: Make text italic
-        color: Optional hex color (e.g., "#FF0000")
-    
-    Returns:
-        Success message
-    """
-    if presentation_name not in presentations:
-        return f"Presentation '{presentation_name}' not found"
-    
-    prs = presentations[presentation_name]
-    
-    if slide_index >= len(prs.slides):
-        return f"Slide index {slide_index} out of range"
-    
+    slide_index = _slide_index(prs, slide_index)
     slide = prs.slides[slide_index]
     
     # Try to find placeholder
@@ -170,7 +423,177 @@ def add_text_to_slide(
     
     return f"Added text to slide {slide_index}"
 
+
+def _add_image_to_slide(
+    prs: Presentation,
+    slide_index: int,
+    image_path: str,
+    left: float = 1,
+    top: float = 2,
+    width: Optional[float] = None,
+    height: Optional[float] = None
+) -> str:
+    slide_index = _slide_index(prs, slide_index)
+    slide = prs.slides[slide_index]
+    
+    if not Path(image_path).exists():
+        raise OperationError(f"Image file '{image_path}' not found")
+    
+    # Embed a copy sized for display instead of the full resolution original
+    if image_pipeline:
+        image_path, width, height = image_pipeline.prepare(image_path, width, height)
+    
+    left_pos = Inches(left)
+    top_pos = Inches(top)
+    
+    if width and height:
+        slide.shapes.add_picture(image_path, left_pos, top_pos, 
+                                  width=Inches(width), height=Inches(height))
+    elif width:
+        slide.shapes.add_picture(image_path, left_pos, top_pos, width=Inches(width))
+    elif height:
+        slide.shapes.add_picture(image_path, left_pos, top_pos, height=Inches(height))
+    else:
+        slide.shapes.add_picture(image_path, left_pos, top_pos)
+    
+    return f"Added image to slide {slide_index}"
+
+
+def _add_speaker_notes(prs: Presentation, slide_index: int, notes: str) -> str:
+    slide_index = _slide_index(prs, slide_index)
+    slide = prs.slides[slide_index]
+    notes_slide = slide.notes_slide
+    notes_slide.notes_text_frame.text = notes
+    
+    return f"Added speaker notes to slide {slide_index}"
+
+
+# Operations accepted by apply_operations, named after their tools
+OPERATIONS = {
+    "add_slide": _add_slide,
+    "add_text_to_slide": _add_text_to_slide,
+    "add_image_to_slide": _add_image_to_slide,
+    "add_speaker_notes": _add_speaker_notes
+}
+
+
+def _touched_slide(prs: Presentation, op: str, kwargs: Dict[str, Any]) -> int:
+    """Index of the slide a successful operation changed or added"""
+    if op == "add_slide":
+        return len(prs.slides) - 1
+    return _slide_index(prs, kwargs["slide_index"])
+
+def _current_index(presentation_name: str) -> Optional[DeckIndex]:
+    """The presentation's deck index, if it reflects the current version"""
+    index = deck_indexes.get(presentation_name)
+    if index is not None and index.version == presentations.version(presentation_name):
+        return index
+    return None
+
+def _serialize_presentation(prs: Presentation) -> bytes:
+    """The presentation as .pptx bytes"""
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+def _log_operations(presentation_name: str, prs: Presentation, applied: List[Dict[str, Any]], partial: bool = False):
+    """
+    Append applied operations to the write-ahead log, snapshotting when due
+
+    partial marks a batch with an operation that raised after changing the
+    deck part way; replaying it need not reproduce that state, so the deck
+    is snapshotted right away.
+    """
+    if not oplog or not applied:
+        return
+    try:
+        oplog.append(presentation_name, [{"type": "op", **record} for record in applied])
+        if partial or oplog.needs_snapshot(presentation_name):
+            oplog.snapshot(presentation_name, prs)
+    except OSError as e:
+        print(f"Failed to log operations for '{presentation_name}': {e}", file=sys.stderr)
+
+def run_operation(presentation_name: str, op: str, **kwargs) -> str:
+    """Run a single operation under the presentation's lock"""
+    if presentation_name not in presentations:
+        return f"Presentation '{presentation_name}' not found"
+    
+    try:
+        with presentation_lock(presentation_name):
+            # Cleared or replaced while waiting for the lock
+            prs = presentations.get(presentation_name)
+            if prs is None:
+                return f"Presentation '{presentation_name}' not found"
+            index = _current_index(presentation_name)
+            try:
+                result = OPERATIONS[op](prs, **kwargs)
+            except OperationError:
+                raise
+            except Exception:
+                # e.g. an invalid color, raised after the text was set: record
+                # the change so caches, the index and the log see this state
+                presentations.mark_dirty(presentation_name)
+                _log_operations(presentation_name, prs, [{"op": op, "args": kwargs}], partial=True)
+                raise
+            presentations.mark_dirty(presentation_name)
+            if index is not None:
+                index.refresh(prs, [_touched_slide(prs, op, kwargs)], presentations.version(presentation_name))
+            _log_operations(presentation_name, prs, [{"op": op, "args": kwargs}])
+            return result
+    except OperationError as e:
+        return str(e)
+
 @mcp.tool()
+@offload
+def add_slide(presentation_name: str, layout: str = "title_and_content") -> str:
+    """
+    Add a new slide to the presentation
+    
+    Args:
+        presentation_name: Name of the presentation
+        layout: Slide layout type (title_slide, title_and_content, blank, etc.)
+    
+    Returns:
+        Slide index
+    """
+    return run_operation(presentation_name, "add_slide", layout=layout)
+
+@mcp.tool()
+@offload
+def add_text_to_slide(
+    presentation_name: str,
+    slide_index: int,
+    text: str,
+    placeholder_index: int = 0,
+    font_size: Optional[int] = None,
+    bold: bool = False,
+    italic: bool = False,
+    color: Optional[str] = None
+) -> str:
+    """
+    Add text to a slide
+    
+    Args:
+        presentation_name: Name of the presentation
+        slide_index: Index of the slide
+        text: Text to add
+        placeholder_index: Index of the placeholder (0 for title, 1 for content)
+        font_size: Optional font size in points
+        bold: Make text bold
+        italic: Make text italic
+        color: Optional hex color (e.g., "#FF0000")
+    
+    Returns:
+        Success message
+    """
+    return run_operation(
+        presentation_name, "add_text_to_slide",
+        slide_index=slide_index, text=text, placeholder_index=placeholder_index,
+        font_size=font_size, bold=bold, italic=italic, color=color
+    )
+
+@mcp.tool()
+@offload
 def add_image_to_slide(
     presentation_name: str,
     slide_index: int,
@@ -195,62 +618,248 @@ def add_image_to_slide(
     Returns:
         Success message
     """
-    if presentation_name not in presentations:
-        return f"Presentation '{presentation_name}' not found"
+    return run_operation(
+        presentation_name, "add_image_to_slide",
+        slide_index=slide_index, image_path=image_path,
+        left=left, top=top, width=width, height=height
+    )
+
+@mcp.tool()
+@offload
+def add_speaker_notes(presentation_name: str, slide_index: int, notes: str) -> str:
+    """
+    Add speaker notes to a slide
     
-    prs = presentations[presentation_name]
+    Args:
+        presentation_name: Name of the presentation
+        slide_index: Index of the slide
+        notes: Speaker notes text
     
-    if slide_index >= len(prs.slides):
-        return f"Slide index {slide_index} out of range"
+    Returns:
+        Success message
+    """
+    return run_operation(presentation_name, "add_speaker_notes", slide_index=slide_index, notes=notes)
+
+@mcp.tool()
+@offload
+def apply_operations(
+    presentation_name: str,
+    ops: List[Dict[str, Any]],
+    atomic: bool = False
+) -> Dict[str, Any]:
+    """
+    Apply a batch of operations to a presentation in one call
     
-    if not Path(image_path).exists():
-        return f"Image file '{image_path}' not found"
+    Each operation is a dictionary with an "op" key naming one of
+    add_slide, add_text_to_slide, add_image_to_slide or add_speaker_notes,
+    plus that tool's arguments (without presentation_name), e.g.
+    {"op": "add_text_to_slide", "slide_index": -1, "text": "Hello"}.
+    A slide_index of -1 refers to the last slide.
     
-    slide = prs.slides[slide_index]
+    Args:
+        presentation_name: Name of the presentation
+        ops: Ordered list of operations
+        atomic: Stop at the first failure and undo all operations of the batch
     
-    left_pos = Inches(left)
-    top_pos = Inches(top)
+    Returns:
+        Dictionary with per-operation results
+    """
+    if presentation_name not in presentations:
+        return {"error": f"Presentation '{presentation_name}' not found"}
     
-    if width and height:
-        slide.shapes.add_picture(image_path, left_pos, top_pos, 
-                                  width=Inches(width), height=Inches(height))
-    elif width:
-        slide.shapes.add_picture(image_path, left_pos, top_pos, width=Inches(width))
-    elif height:
-        slide.shapes.add_picture(image_path, left_pos, top_pos, height=Inches(height))
+    results = []
+    failed = 0
+    rolled_back = False
+    
+    with presentation_lock(presentation_name):
+        prs = presentations.get(presentation_name)
+        if prs is None:
+            return {"error": f"Presentation '{presentation_name}' not found"}
+        # A serialized copy, since a deep copy of the python-pptx object graph
+        # keeps cached proxies pointing into the original's XML
+        snapshot = _serialize_presentation(prs) if atomic else None
+        index = _current_index(presentation_name)
+        touched = []
+        applied = []
+        partial = False
+        
+        for i, operation in enumerate(ops):
+            kwargs = dict(operation)
+            op = kwargs.pop("op", None)
+            
+            try:
+                if op not in OPERATIONS:
+                    raise OperationError(f"Unknown operation '{op}'")
+                results.append({"index": i, "op": op, "status": "success", "result": OPERATIONS[op](prs, **kwargs)})
+                touched.append(_touched_slide(prs, op, kwargs))
+                applied.append({"op": op, "args": kwargs})
+            except Exception as e:
+                failed += 1
+                results.append({"index": i, "op": op, "status": "error", "error": str(e)})
+                if atomic:
+                    presentations[presentation_name] = Presentation(io.BytesIO(snapshot))
+                    rolled_back = True
+                    break
+                # Anything but an OperationError may have left the deck changed part way
+                if not isinstance(e, OperationError):
+                    applied.append({"op": op, "args": kwargs})
+                    partial = True
+        
+        presentations.mark_dirty(presentation_name)
+        # A rolled back or partly changed deck gets a fresh index on the next query
+        if index is not None and not rolled_back and not partial:
+            index.refresh(prs, touched, presentations.version(presentation_name))
+        if not rolled_back:
+            _log_operations(presentation_name, prs, applied, partial)
+    
+    return {
+        "status": "error" if failed else "success",
+        "applied": len(results) - failed if not rolled_back else 0,
+        "failed": failed,
+        "rolled_back": rolled_back,
+        "results": results
+    }
+
+def _fill_body(slide, bullets: List[Any]):
+    """Write bullets (strings or {"text", "level"}) into the body placeholder or a textbox"""
+    body = next(
+        (ph for ph in slide.placeholders if ph.placeholder_format.idx != 0 and ph.has_text_frame),
+        None
+    )
+    if body is not None:
+        text_frame = body.text_frame
     else:
-        slide.shapes.add_picture(image_path, left_pos, top_pos)
+        text_frame = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(4)).text_frame
+        text_frame.word_wrap = True
     
-    return f"Added image to slide {slide_index}"
+    for i, bullet in enumerate(bullets):
+        if isinstance(bullet, dict):
+            text, level = str(bullet.get("text", "")), int(bullet.get("level", 0))
+        else:
+            text, level = str(bullet), 0
+        if not 0 <= level <= 8:
+            raise OperationError(f"Bullet level {level} out of range (0-8)")
+        paragraph = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+        paragraph.text = text
+        paragraph.level = level
+
+
+def _build_slide(prs: Presentation, spec: Dict[str, Any]):
+    """Add one outline slide using the same helpers as the single-edit tools"""
+    _add_slide(prs, spec.get("layout", "title_and_content"))
+    slide = prs.slides[-1]
+    
+    if spec.get("title") is not None:
+        if slide.shapes.title is not None:
+            slide.shapes.title.text = str(spec["title"])
+        else:
+            _add_text_to_slide(prs, -1, str(spec["title"]))
+    
+    bullets = list(spec.get("bullets") or [])
+    if spec.get("subtitle") is not None:
+        bullets.insert(0, str(spec["subtitle"]))
+    if bullets:
+        _fill_body(slide, bullets)
+    
+    for image in spec.get("images") or []:
+        if isinstance(image, str):
+            image = {"image_path": image}
+        image = dict(image)
+        if "path" in image:
+            image["image_path"] = image.pop("path")
+        _add_image_to_slide(prs, -1, **image)
+    
+    if spec.get("notes"):
+        _add_speaker_notes(prs, -1, str(spec["notes"]))
 
 @mcp.tool()
-def add_speaker_notes(presentation_name: str, slide_index: int, notes: str) -> str:
+@offload
+def build_deck_from_outline(
+    presentation_name: str,
+    outline: Dict[str, Any],
+    template: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Add speaker notes to a slide
+    Build a whole presentation from a structured outline in one call
+    
+    The outline is {"slides": [...]} where each slide may have:
+    layout (as in add_slide), title, subtitle, bullets (strings or
+    {"text": ..., "level": 0-8}), notes, and images (paths or
+    {"path": ..., "left", "top", "width", "height"} in inches).
+    The deck is built privately and only replaces an existing
+    presentation of the same name once every slide succeeded.
     
     Args:
-        presentation_name: Name of the presentation
-        slide_index: Index of the slide
-        notes: Speaker notes text
+        presentation_name: Name for the presentation
+        outline: Outline of the deck
+        template: Optional template name to use
     
     Returns:
-        Success message
+        Dictionary with slide count and per-phase timings in seconds
     """
-    if presentation_name not in presentations:
-        return f"Presentation '{presentation_name}' not found"
+    slides = outline.get("slides") if isinstance(outline, dict) else None
+    if not isinstance(slides, list):
+        return {"error": "Outline must be an object with a 'slides' list"}
     
-    prs = presentations[presentation_name]
+    timings = {}
+    started = phase_started = time.perf_counter()
     
-    if slide_index >= len(prs.slides):
-        return f"Slide index {slide_index} out of range"
+    def phase(name: str):
+        nonlocal phase_started
+        now = time.perf_counter()
+        timings[name] = round(now - phase_started, 4)
+        phase_started = now
     
-    slide = prs.slides[slide_index]
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = notes
+    try:
+        prs = template_cache.create(template if template and template_cache.exists(template) else None)
+        phase("create")
+        
+        # Downsample every image up front and in parallel, adding them then hits
+        # the cache; the display size is part of the cache key, so it must be
+        # the one the slide will use
+        images = [
+            (image, None, None) if isinstance(image, str)
+            else (image.get("path") or image.get("image_path"), image.get("width"), image.get("height"))
+            for spec in slides for image in (spec.get("images") or [])
+        ]
+        images = [image for image in dict.fromkeys(images) if image[0] and Path(image[0]).exists()]
+        if image_pipeline and images:
+            with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1)) as pool:
+                list(pool.map(lambda image: image_pipeline.prepare(*image), images))
+        phase("images")
+        
+        for i, spec in enumerate(slides):
+            try:
+                _build_slide(prs, spec)
+            except (OperationError, TypeError, ValueError, AttributeError) as e:
+                return {"error": f"Slide {i}: {str(e)}", "slide": i}
+        phase("slides")
+        
+        index = DeckIndex(prs, 0)
+        phase("index")
+        
+        with presentation_lock(presentation_name):
+            presentations[presentation_name] = prs
+            index.version = presentations.version(presentation_name)
+            deck_indexes[presentation_name] = index
+            # Outlines can reference files that are gone by replay time, log the result instead
+            if oplog:
+                oplog.remove(presentation_name)
+                oplog.snapshot(presentation_name, prs)
+        phase("store")
+    except Exception as e:
+        return {"error": f"Failed to build presentation: {str(e)}"}
     
-    return f"Added speaker notes to slide {slide_index}"
+    timings["total"] = round(time.perf_counter() - started, 4)
+    return {
+        "status": "success",
+        "presentation_name": presentation_name,
+        "slide_count": len(prs.slides),
+        "timings": timings
+    }
 
 @mcp.tool()
+@offload
 def get_slide_content(presentation_name: str, slide_index: int) -> Dict[str, Any]:
     """
     Get the content of a specific slide
@@ -265,73 +874,185 @@ def get_slide_content(presentation_name: str, slide_index: int) -> Dict[str, Any
     if presentation_name not in presentations:
         return {"error": f"Presentation '{presentation_name}' not found"}
     
-    prs = presentations[presentation_name]
-    
-    if slide_index >= len(prs.slides):
-        return {"error": f"Slide index {slide_index} out of range"}
-    
-    slide = prs.slides[slide_index]
-    content = {
-        "slide_index": slide_index,
-        "layout": slide.slide_layout.name if hasattr(slide.slide_layout, 'name') else "unknown",
-        "text_content": [],
-        "shapes": [],
-        "notes": ""
-    }
-    
-    # Extract text content
-    for shape in slide.shapes:
-        if hasattr(shape, "text"):
-            content["text_content"].append(shape.text)
-        content["shapes"].append(shape.shape_type)
-    
-    # Extract speaker notes
-    if slide.has_notes_slide:
-        content["notes"] = slide.notes_slide.notes_text_frame.text
-    
-    return content
+    with presentation_lock(presentation_name):
+        prs = presentations.get(presentation_name)
+        if prs is None:
+            return {"error": f"Presentation '{presentation_name}' not found"}
+        
+        if slide_index >= len(prs.slides):
+            return {"error": f"Slide index {slide_index} out of range"}
+        
+        slide = prs.slides[slide_index]
+        content = {
+            "slide_index": slide_index,
+            "layout": slide.slide_layout.name if hasattr(slide.slide_layout, 'name') else "unknown",
+            "text_content": [],
+            "shapes": [],
+            "notes": ""
+        }
+        
+        # Extract text content
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                content["text_content"].append(shape.text)
+            content["shapes"].append(shape.shape_type)
+        
+        # Extract speaker notes
+        if slide.has_notes_slide:
+            content["notes"] = slide.notes_slide.notes_text_frame.text
+        
+        return content
+
+def _serialized(presentation_name: str) -> Optional[SerializedDeck]:
+    """Serialize the current version of a presentation, reusing cached bytes; None if it is gone"""
+    with presentation_lock(presentation_name):
+        prs = presentations.get(presentation_name)
+        if prs is None:
+            return None
+        return download_cache.get(presentation_name, presentations.version(presentation_name), prs)
 
 @mcp.tool()
-def download_presentation(presentation_name: str) -> Dict[str, str]:
+@offload
+def download_presentation(
+    presentation_name: str,
+    incremental: bool = False,
+    in_memory: bool = False,
+    if_none_match: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Save and download the presentation
     
     Args:
         presentation_name: Name of the presentation
+        incremental: Save to a stable <name>.pptx, rewriting only the parts
+            that changed since the last incremental save instead of writing
+            a new timestamped file
+        in_memory: Serialize into memory instead of writing a file; fetch
+            the bytes with read_presentation_chunk or from the
+            pptx://presentations/{name} resource
+        if_none_match: ETag of a copy the client already has; with
+            in_memory, returns "not_modified" if the deck is unchanged
     
     Returns:
-        Dictionary with file path and status
+        Dictionary with file path and status, or with the ETag, size and
+        chunk count for in-memory downloads
     """
     if presentation_name not in presentations:
         return {"error": f"Presentation '{presentation_name}' not found"}
     
-    prs = presentations[presentation_name]
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{presentation_name}_{timestamp}.pptx"
+    if in_memory:
+        try:
+            deck = _serialized(presentation_name)
+        except Exception as e:
+            return {"error": f"Failed to serialize presentation: {str(e)}"}
+        if deck is None:
+            return {"error": f"Presentation '{presentation_name}' not found"}
+        
+        chunk_size = DOWNLOAD_CHUNK_KB * 1024
+        return {
+            "status": "not_modified" if if_none_match == deck.etag else "success",
+            "etag": deck.etag,
+            "size": deck.size,
+            "chunk_size": chunk_size,
+            "chunks": deck.chunk_count(chunk_size),
+            "resource_uri": f"pptx://presentations/{presentation_name}"
+        }
+    
+    if incremental:
+        filename = f"{presentation_name}.pptx"
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{presentation_name}_{timestamp}.pptx"
     filepath = PRESENTATIONS_DIR / filename
     
     try:
-        prs.save(filepath)
+        with presentation_lock(presentation_name):
+            prs = presentations.get(presentation_name)
+            if prs is None:
+                return {"error": f"Presentation '{presentation_name}' not found"}
+            if incremental:
+                saver = incremental_savers.setdefault(presentation_name, IncrementalSaver())
+                stats = saver.save(prs, filepath)
+            else:
+                prs.save(filepath)
+                stats = {}
         return {
             "status": "success",
             "filepath": str(filepath),
             "filename": filename,
+            **stats,
             "message": f"Presentation saved to {filepath}"
         }
     except Exception as e:
         return {"error": f"Failed to save presentation: {str(e)}"}
 
 @mcp.tool()
-def list_presentations() -> List[str]:
+@offload
+def read_presentation_chunk(presentation_name: str, etag: str, index: int) -> Dict[str, Any]:
+    """
+    Read one chunk of an in-memory download
+    
+    Args:
+        presentation_name: Name of the presentation
+        etag: ETag returned by download_presentation with in_memory=True
+        index: Chunk index, from 0 to chunks - 1
+    
+    Returns:
+        Dictionary with the base64 encoded chunk
+    """
+    if presentation_name not in presentations:
+        return {"error": f"Presentation '{presentation_name}' not found"}
+    
+    try:
+        deck = _serialized(presentation_name)
+    except Exception as e:
+        return {"error": f"Failed to serialize presentation: {str(e)}"}
+    if deck is None:
+        return {"error": f"Presentation '{presentation_name}' not found"}
+    
+    if deck.etag != etag:
+        return {"error": "Presentation changed since download started, call download_presentation again", "etag": deck.etag}
+    
+    chunk_size = DOWNLOAD_CHUNK_KB * 1024
+    chunks = deck.chunk_count(chunk_size)
+    if not 0 <= index < chunks:
+        return {"error": f"Chunk index {index} out of range (0-{chunks - 1})"}
+    
+    return {
+        "etag": deck.etag,
+        "index": index,
+        "chunks": chunks,
+        "data": base64.b64encode(deck.chunk(index, chunk_size)).decode()
+    }
+
+@mcp.resource(
+    "pptx://presentations/{presentation_name}",
+    mime_type="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+async def presentation_resource(presentation_name: str) -> bytes:
+    """The current presentation as .pptx bytes"""
+    if presentation_name not in presentations:
+        raise ValueError(f"Presentation '{presentation_name}' not found")
+    loop = asyncio.get_running_loop()
+    deck = await loop.run_in_executor(tool_executor, _serialized, presentation_name)
+    if deck is None:
+        raise ValueError(f"Presentation '{presentation_name}' not found")
+    return deck.data
+
+@mcp.tool()
+@offload
+def list_presentations() -> List[Dict[str, Any]]:
     """
-    List all active presentations in memory
+    List all active presentations
     
     Returns:
-        List of presentation names
+        List of presentations with their state ("memory" or "spilled")
+        and approximate memory usage in bytes
     """
-    return list(presentations.keys())
+    return presentations.info()
 
 @mcp.tool()
+@offload
 def get_presentation_info(presentation_name: str) -> Dict[str, Any]:
     """
     Get information about a presentation
@@ -340,35 +1061,33 @@ def get_presentation_info(presentation_name: str) -> Dict[str, Any]:
         presentation_name: Name of the presentation
     
     Returns:
-        Dictionary with presentation information
+        Dictionary with presentation information, including per-slide
+        title, layout, notes flag, shape count and word count
     """
     if presentation_name not in presentations:
         return {"error": f"Presentation '{presentation_name}' not found"}
     
-    prs = presentations[presentation_name]
-    
-    info = {
-        "name": presentation_name,
-        "slide_count": len(prs.slides),
-        "slides": []
-    }
-    
-    for i, slide in enumerate(prs.slides):
-        slide_info = {
-            "index": i,
-            "layout": slide.slide_layout.name if hasattr(slide.slide_layout, 'name') else "unknown",
-            "has_notes": slide.has_notes_slide
-        }
+    with presentation_lock(presentation_name):
+        # The index is kept current by the edit tools; rebuild it only when
+        # it is missing or the deck was replaced (new or rolled back)
+        try:
+            index = _current_index(presentation_name)
+            if index is None:
+                prs = presentations[presentation_name]
+                index = DeckIndex(prs, presentations.version(presentation_name))
+                deck_indexes[presentation_name] = index
+        except KeyError:
+            # Cleared while waiting for the lock
+            return {"error": f"Presentation '{presentation_name}' not found"}
         
-        # Get title if available
-        if slide.shapes.title:
-            slide_info["title"] = slide.shapes.title.text
-        
-        info["slides"].append(slide_info)
-    
-    return info
+        return {
+            "name": presentation_name,
+            "slide_count": len(index.slides),
+            "slides": index.info()
+        }
 
 @mcp.tool()
+@offload
 def clear_presentation(presentation_name: str) -> str:
     """
     Clear/delete a presentation from memory
@@ -380,77 +1099,445 @@ def clear_presentation(presentation_name: str) -> str:
         Success message
     """
     if presentation_name in presentations:
-        del presentations[presentation_name]
+        with presentation_lock(presentation_name):
+            try:
+                del presentations[presentation_name]
+            except KeyError:
+                return f"Presentation '{presentation_name}' not found"
+            incremental_savers.pop(presentation_name, None)
+            deck_indexes.pop(presentation_name, None)
+            if oplog:
+                oplog.remove(presentation_name)
+            download_cache.discard(presentation_name)
         return f"Cleared presentation '{presentation_name}'"
     return f"Presentation '{presentation_name}' not found"
 
+def _level_key(cache_key: str, level: str) -> str:
+    """Render cache key of one pyramid level; the full image keeps the plain key"""
+    return cache_key if level == FULL_LEVEL else f"{cache_key}-{level}"
+
+def _cache_pyramid(cache_key: str, full_image: Path, work_dir: Path, full_cached: bool = False) -> Dict[str, Path]:
+    """Cache a rendered image and every preview level scaled from it"""
+    cached = {FULL_LEVEL: full_image if full_cached else render_cache.put(cache_key, full_image)}
+    levels = build_pyramid(cached[FULL_LEVEL], RENDER_PYRAMID, lambda level: work_dir / f"{level}.png")
+    for level in RENDER_PYRAMID:
+        # Levels wider than the render are served by the full image
+        path = levels.get(level, cached[FULL_LEVEL])
+        cached[level] = render_cache.put(_level_key(cache_key, level), path)
+    return cached
+
+def _prepare_render(presentation_name: str, slide_index: int, render_dir: Path, level: str = FULL_LEVEL) -> Dict[str, Any]:
+    """Look up the render cache and write the slide (or deck) to render_dir"""
+    # Only hold the lock while taking a snapshot, not during conversion
+    with presentation_lock(presentation_name):
+        prs = presentations.get(presentation_name)
+        if prs is None:
+            return {"error": f"Presentation '{presentation_name}' not found"}
+        
+        if slide_index >= len(prs.slides):
+            return {"error": f"Slide index {slide_index} out of range"}
+        
+        # Unchanged slides are served from the render cache
+        cache_key = slide_fingerprint(prs, prs.slides[slide_index], variant="png", index=slide_index % len(prs.slides))
+        cached = render_cache.get(_level_key(cache_key, level))
+        if cached:
+            return {"cache_key": cache_key, "cached": cached}
+        
+        # A preview level that was evicted is scaled again from the full image
+        if level != FULL_LEVEL:
+            full_image = render_cache.get(cache_key)
+            if full_image:
+                return {"cache_key": cache_key, "full_image": full_image}
+        
+        # Save the slide (or the whole deck) temporarily
+        if RENDER_MODE == "deck":
+            temp_path = render_dir / f"{presentation_name}.pptx"
+            prs.save(temp_path)
+            image_index = slide_index
+        else:
+            temp_path = render_dir / f"{presentation_name}_slide{slide_index}.pptx"
+            temp_path.write_bytes(extract_slides(prs, [slide_index]))
+            image_index = 0
+    
+    return {"cache_key": cache_key, "temp_path": temp_path, "image_index": image_index}
+
 @mcp.tool()
-def render_slide_to_image(presentation_name: str, slide_index: int) -> Dict[str, Any]:
+async def render_slide_to_image(
+    presentation_name: str,
+    slide_index: int,
+    max_width: Optional[int] = None,
+    level: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Render a slide to a PNG image using LibreOffice
     
+    Every render also produces smaller preview levels (by default "thumb"
+    320px and "medium" 960px wide), cached next to the full image.
+    
     Args:
         presentation_name: Name of the presentation
         slide_index: Index of the slide to render
+        max_width: Serve the smallest cached level at least this wide
+        level: Serve this level by name ("full" or a preview level)
     
     Returns:
-        Dictionary with image path or error
+        Dictionary with image path, served level and pixel size, or error
     """
     if presentation_name not in presentations:
         return {"error": f"Presentation '{presentation_name}' not found"}
     
-    prs = presentations[presentation_name]
+    if level is None:
+        level = select_level(RENDER_PYRAMID, max_width)
+    elif level != FULL_LEVEL and level not in RENDER_PYRAMID:
+        return {"error": f"Unknown level '{level}', available: {', '.join([FULL_LEVEL, *RENDER_PYRAMID])}"}
     
-    if slide_index >= len(prs.slides):
-        return {"error": f"Slide index {slide_index} out of range"}
+    # Each render works in its own directory so concurrent renders never collide
+    render_dir = Path(tempfile.mkdtemp(prefix="render_", dir=EXPORTS_DIR))
     
-    # Save presentation temporarily
-    temp_path = PRESENTATIONS_DIR / f"temp_{presentation_name}.pptx"
-    prs.save(temp_path)
+    def result(image_path: Path, cached: bool, message: str) -> Dict[str, Any]:
+        with Image.open(image_path) as image:
+            width, height = image.size
+        return {
+            "status": "success",
+            "image_path": str(image_path),
+            "level": level,
+            "width": width,
+            "height": height,
+            "cached": cached,
+            "message": message
+        }
     
-    # Use LibreOffice to convert to images
     try:
-        cmd = [
-            "libreoffice",
-            "--headless",
-            "--convert-to",
-            "png",
-            "--outdir",
-            str(EXPORTS_DIR),
-            str(temp_path)
-        ]
+        loop = asyncio.get_running_loop()
+        # Only the in-process part of a render can be profiled, conversion runs in LibreOffice
+        job = await loop.run_in_executor(
+            tool_executor, call_profiler.call, "render_slide_to_image",
+            _prepare_render, presentation_name, slide_index, render_dir, level
+        )
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        if "error" in job:
+            return job
         
-        if result.returncode == 0:
-            # Find the generated image
-            image_pattern = temp_path.stem
-            images = list(EXPORTS_DIR.glob(f"{image_pattern}*.png"))
-            
-            if images and slide_index < len(images):
-                image_path = images[slide_index]
-                return {
-                    "status": "success",
-                    "image_path": str(image_path),
-                    "message": f"Slide {slide_index} rendered to {image_path}"
-                }
+        if "cached" in job:
+            return result(job["cached"], True, f"Slide {slide_index} served from render cache: {job['cached']}")
+        
+        if "full_image" in job:
+            pyramid = await loop.run_in_executor(
+                tool_executor, _cache_pyramid, job["cache_key"], job["full_image"], render_dir, True
+            )
+            return result(pyramid[level], True, f"Slide {slide_index} {level} preview scaled from cached render")
+        
+        # Use the render pool (or LibreOffice directly) to convert to images
+        images = await convert_document(job["temp_path"], render_dir, "png")
         
-        return {"error": f"Failed to render slide: {result.stderr}"}
+        if images and job["image_index"] < len(images):
+            pyramid = await loop.run_in_executor(
+                tool_executor, _cache_pyramid, job["cache_key"], images[job["image_index"]], render_dir
+            )
+            image_path = pyramid[level]
+            return result(image_path, False, f"Slide {slide_index} rendered to {image_path}")
+        
+        return {"error": f"Failed to render slide: no image produced for slide {slide_index}"}
+    
+    except RenderError as e:
+        return {"error": f"Failed to render slide: {str(e)}"}
     
     except Exception as e:
         return {"error": f"Error rendering slide: {str(e)}"}
     
     finally:
-        # Clean up temp file
-        if temp_path.exists():
-            temp_path.unlink()
+        # Clean up temp files and raw output, the cache keeps its own copy
+        shutil.rmtree(render_dir, ignore_errors=True)
+
+def _prepare_deck_render(presentation_name: str, render_dir: Path, level: str) -> Dict[str, Any]:
+    """Look up every slide in the render cache and write the missing ones to render_dir"""
+    with presentation_lock(presentation_name):
+        prs = presentations.get(presentation_name)
+        if prs is None:
+            return {"error": f"Presentation '{presentation_name}' not found"}
+        slides = []
+        missing = []
+        for index, slide in enumerate(prs.slides):
+            cache_key = slide_fingerprint(prs, slide, variant="png", index=index)
+            item = {"cache_key": cache_key}
+            cached = render_cache.get(_level_key(cache_key, level))
+            full_image = render_cache.get(cache_key) if not cached and level != FULL_LEVEL else None
+            if cached:
+                item["cached"] = cached
+            elif full_image:
+                item["full_image"] = full_image
+            else:
+                item["temp_path"] = render_dir / f"{presentation_name}_slide{index}.pptx"
+                item["temp_path"].write_bytes(extract_slides(prs, [index]))
+                missing.append(index)
+            slides.append(item)
+    
+    # Missing slides are split into contiguous ranges, one per shard
+    shards = [[missing[i] for i in indices] for indices in page_ranges(len(missing), RENDER_SHARDS)]
+    return {"slides": slides, "shards": shards}
+
+@mcp.tool()
+async def render_presentation_to_images(
+    presentation_name: str,
+    max_width: Optional[int] = None,
+    level: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Render every slide of a presentation to PNG images
+    
+    Slides not in the render cache are split into slide ranges that are
+    rendered side by side (RENDER_SHARDS, by default one per CPU core, at
+    most one per converter),
+    each range by its own converter process.
+    
+    Args:
+        presentation_name: Name of the presentation
+        max_width: Serve the smallest cached level at least this wide
+        level: Serve this level by name ("full" or a preview level)
+    
+    Returns:
+        Dictionary with the image paths in slide order, or error
+    """
+    if presentation_name not in presentations:
+        return {"error": f"Presentation '{presentation_name}' not found"}
+    
+    if level is None:
+        level = select_level(RENDER_PYRAMID, max_width)
+    elif level != FULL_LEVEL and level not in RENDER_PYRAMID:
+        return {"error": f"Unknown level '{level}', available: {', '.join([FULL_LEVEL, *RENDER_PYRAMID])}"}
+    
+    render_dir = Path(tempfile.mkdtemp(prefix="render_", dir=EXPORTS_DIR))
+    
+    try:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        job = await loop.run_in_executor(
+            tool_executor, call_profiler.call, "render_presentation_to_images",
+            _prepare_deck_render, presentation_name, render_dir, level
+        )
+        if "error" in job:
+            return job
+        slides = job["slides"]
+        
+        async def render_item(index: int) -> Path:
+            item = slides[index]
+            if "full_image" in item:
+                pyramid = await loop.run_in_executor(
+                    tool_executor, _cache_pyramid, item["cache_key"], item["full_image"], render_dir, True
+                )
+                return pyramid[level]
+            
+            # Each slide converts into its own directory so pyramid files never collide
+            slide_dir = render_dir / f"slide{index}"
+            slide_dir.mkdir()
+            images = await convert_document(item["temp_path"], slide_dir, "png")
+            if not images:
+                raise RenderError(f"no image produced for slide {index}")
+            pyramid = await loop.run_in_executor(
+                tool_executor, _cache_pyramid, item["cache_key"], images[0], slide_dir
+            )
+            return pyramid[level]
+        
+        async def render_shard(indices: List[int]):
+            for index in indices:
+                slides[index]["cached"] = await render_item(index)
+        
+        derived = [index for index, item in enumerate(slides) if "full_image" in item]
+        tasks = [asyncio.ensure_future(render_shard(shard)) for shard in [*job["shards"], derived]]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # When a shard fails the others are stopped, and waited for, before
+            # render_dir is removed under them
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return {
+            "status": "success",
+            "level": level,
+            "images": [str(item["cached"]) for item in slides],
+            "rendered": sum(len(shard) for shard in job["shards"]),
+            "shards": len(job["shards"]),
+            "cached": len(slides) - sum(len(shard) for shard in job["shards"]),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+    
+    except RenderError as e:
+        return {"error": f"Failed to render presentation: {str(e)}"}
+    
+    except Exception as e:
+        return {"error": f"Error rendering presentation: {str(e)}"}
+    
+    finally:
+        shutil.rmtree(render_dir, ignore_errors=True)
+
+@mcp.tool()
+@offload
+def get_render_cache_stats() -> Dict[str, Any]:
+    """
+    Get render cache statistics
+    
+    Returns:
+        Dictionary with hit/miss counters, entry count and size in bytes
+    """
+    return render_cache.stats()
+
+@mcp.tool()
+@offload
+def get_render_stats() -> Dict[str, Any]:
+    """
+    Get converter subprocess and render pool counters
+    
+    Returns:
+        Dictionary with process counts, timeouts, circuit breaker states
+        and render pool status
+    """
+    pool = render_pool
+    return {
+        "processes": process_runner.stats(),
+        "pool": pool.stats() if pool else None
+    }
+
+def _server_gauges() -> Dict[str, Any]:
+    """Render queue and presentation store gauges for the metrics endpoints"""
+    pool = render_pool
+    pool_stats = pool.stats() if pool else {}
+    return {
+        "pptx_render_queue_depth": ("Renders waiting for a pool worker", pool_stats.get("queue_depth", 0)),
+        "pptx_render_processes_running": ("Converter subprocesses running", process_runner.stats()["running"]),
+        "pptx_presentations": ("Active presentations", len(presentations)),
+        "pptx_presentation_memory_bytes": ("Approximate memory held by presentations", presentations.memory_usage())
+    }
+
+@mcp.tool()
+@offload
+def get_server_metrics() -> Dict[str, Any]:
+    """
+    Get per-tool call counts, error counts and latency histograms
+    
+    Returns:
+        Dictionary with per-tool metrics, render queue depth and
+        presentation store memory usage
+    """
+    metrics = tool_metrics.snapshot()
+    metrics["gauges"] = {name.replace("pptx_", "", 1): value for name, (_, value) in _server_gauges().items()}
+    metrics["profiling"] = call_profiler.stats()
+    metrics["store"] = presentations.stats()
+    metrics["oplog"] = oplog.stats() if oplog else None
+    return metrics
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint"""
+    loop = asyncio.get_running_loop()
+    gauges = await loop.run_in_executor(tool_executor, _server_gauges)
+    return PlainTextResponse(tool_metrics.prometheus(gauges), media_type="text/plain; version=0.0.4")
+
+def replay_operations(name: str, prs: Presentation, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply logged operations to a presentation, returning the ones that failed"""
+    failures = []
+    for record in records:
+        try:
+            OPERATIONS[record["op"]](prs, **record.get("args", {}))
+        except Exception as e:
+            # e.g. an image that no longer exists, or an operation that failed
+            # when it was first applied too; keep replaying the rest
+            failures.append({"name": name, "seq": record.get("seq"), "error": str(e)})
+    
+    for failure in failures:
+        print(f"Replay failure: {failure}", file=sys.stderr)
+    return failures
+
+def load_logged_presentation(name: str) -> Tuple[Optional[Presentation], List[Dict[str, Any]]]:
+    """
+    Rebuild one presentation from the operation log
+    
+    The presentation is loaded from its latest snapshot (or recreated from
+    its template) and the operations logged since are replayed.
+    
+    Args:
+        name: Name of the presentation
+    
+    Returns:
+        (presentation or None if nothing was logged, replay failures)
+    """
+    snapshot, records = oplog.load(name)
+    prs = Presentation(snapshot) if snapshot else None
+    
+    # A log started over by create_presentation begins with its creation
+    if records and records[0].get("type") == "create":
+        prs = template_cache.create(records.pop(0).get("template"))
+    if prs is None:
+        if records:
+            raise OperationError("log does not start with a snapshot or creation")
+        return None, []
+    
+    return prs, replay_operations(name, prs, records)
+
+def recover_presentations() -> Dict[str, Any]:
+    """
+    Rebuild presentations from the operation log after a restart
+    
+    Returns:
+        Dictionary with recovered presentations and replay failures
+    """
+    recovered = []
+    failures = []
+    
+    for name in oplog.names():
+        try:
+            prs, replay_failures = load_logged_presentation(name)
+            failures.extend(replay_failures)
+            if prs is None:
+                continue
+            presentations[name] = prs
+            recovered.append({"name": name, "slides": len(prs.slides)})
+        except Exception as e:
+            failures.append({"name": name, "error": str(e)})
+    
+    return {"recovered": recovered, "failures": failures}
+
+def create_app():
+    """ASGI app of one worker process in multi-process mode"""
+    template_cache.warm()
+    oplog.start()
+    atexit.register(oplog.stop)
+    # The router picks a worker per request, so no session state is kept
+    return mcp.http_app(stateless_http=True)
 
 if __name__ == "__main__":
     print(f"Starting PPTX MCP Server on {HOST}:{PORT}")
     print(f"Presentations directory: {PRESENTATIONS_DIR}")
     print(f"Templates directory: {TEMPLATES_DIR}")
     print(f"Exports directory: {EXPORTS_DIR}")
+    print(f"Metrics: http://{HOST}:{PORT}/metrics")
+    if call_profiler.enabled:
+        print(f"Profiling {', '.join(PROFILE_TOOLS)} at rate {PROFILE_SAMPLE_RATE} into {PROFILE_DIR}")
+    
+    # Parse templates up front so creating decks only clones them
+    templates = template_cache.warm()
+    print(f"Preloaded templates: {', '.join(templates)}")
+    
+    # Restore presentations that were open when the server last stopped;
+    # in multi-process mode workers load them from the log on first use
+    if oplog and SERVER_WORKERS <= 1:
+        recovery = recover_presentations()
+        oplog.start()
+        atexit.register(oplog.stop)
+        print(f"Recovered presentations: {len(recovery['recovered'])}, replay failures: {len(recovery['failures'])}")
     
     # Run the server
     import uvicorn
-    uvicorn.run(mcp, host=HOST, port=PORT)
\ No newline at end of file
+    if SERVER_WORKERS > 1:
+        # uvicorn's own workers would spread one presentation's calls over every
+        # process, each rebuilding it from the log; route them to a single one
+        router = WorkerRouter(SERVER_WORKERS, Path(tempfile.mkdtemp(prefix="pptx_workers_")))
+        router.start()
+        print(f"Workers: {SERVER_WORKERS}, sharing presentations through {OPLOG_DIR}")
+        uvicorn.run(router.app, host=HOST, port=PORT)
+    else:
+        # Start render workers up front so the first render does not pay for it
+        if get_render_pool():
+            print(f"Render pool: {RENDER_POOL_SIZE} workers, queue depth {RENDER_QUEUE_DEPTH}")
+        uvicorn.run(mcp.http_app(), host=HOST, port=PORT)
@@ -0,0 +1,291 @@
+"""
+Shared Presentation Store
+Presentation store for running several server processes side by side.
+The operation log on disk is the shared state; a file lease per
+presentation gives one process at a time the right to use it, and a
+process rebuilds its in-memory copy from the log when another process
+changed the presentation since it last held the lease.
+"""
+
+import os
+import json
+import time
+import fcntl
+import socket
+import threading
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from urllib.parse import quote
+
+from pptx import Presentation
+
+from presentation_store import PresentationStore
+from operation_log import OperationLog
+
+
+class LeaseTimeout(RuntimeError):
+    """Raised when another process holds a presentation's lease for too long"""
+
+
+class PresentationLease:
+    """Exclusive, cross-process lease on one presentation"""
+
+    def __init__(self, path: Path, owner: str, timeout: float = 30):
+        """
+        Initialize the lease
+
+        The lease file holds the presentation's generation, bumped on every
+        change, and its current owner. The kernel drops the file lock if the
+        owning process dies, so a crashed worker never blocks the others.
+
+        Args:
+            path: Lease file
+            owner: Identifier of this process
+            timeout: Seconds to wait for another owner to release the lease
+        """
+        self.path = Path(path)
+        self.owner = owner
+        self.timeout = timeout
+        self._fd: Optional[int] = None
+        self._state: Dict[str, Any] = {}
+
+    def _read(self) -> Dict[str, Any]:
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, 4096)
+        try:
+            return json.loads(data) if data else {}
+        except ValueError:
+            return {}
+
+    def _write(self):
+        data = json.dumps(self._state).encode()
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, data, 0)
+
+    def acquire(self) -> Dict[str, Any]:
+        """
+        Wait for the lease and take ownership
+
+        Returns:
+            Lease state with the current generation and previous owner
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LeaseTimeout(f"Timed out waiting for lease {self.path.name}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+        self._fd = fd
+        previous = self._read()
+        self._state = {
+            "generation": previous.get("generation", 0),
+            "owner": self.owner,
+            "previous_owner": previous.get("owner"),
+            "acquired_at": time.time()
+        }
+        self._write()
+        return dict(self._state)
+
+    def release(self, changed: bool) -> int:
+        """
+        Give the lease up
+
+        Args:
+            changed: Whether the presentation was changed while held
+
+        Returns:
+            Generation after the release
+        """
+        if changed:
+            self._state["generation"] += 1
+            self._write()
+        generation = self._state["generation"]
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+        return generation
+
+
+class _SharedLock:
+    """Per-presentation lock: in-process RLock plus the cross-process lease"""
+
+    # acquire() and release() only take the in-process lock, which is what the
+    # store needs to keep a presentation from being spilled while in use. The
+    # with-statement also takes the lease and brings the in-memory copy up to date.
+
+    def __init__(self, store: "SharedPresentationStore", name: str):
+        self.store = store
+        self.name = name
+        self._local = threading.RLock()
+        self._lease = PresentationLease(store.lease_path(name), store.owner, store.lease_timeout)
+        self._depth = 0
+        self._version: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        return self._local.acquire(blocking)
+
+    def release(self):
+        self._local.release()
+
+    def __enter__(self):
+        self._local.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            try:
+                state = self._lease.acquire()
+                self._version = self.store._sync(self.name, state)
+            except BaseException:
+                self._depth -= 1
+                self._local.release()
+                raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if self._depth == 1:
+                changed = self.store._local_version(self.name) != self._version
+                generation = self._lease.release(changed)
+                self.store._synced(self.name, generation)
+        finally:
+            self._depth -= 1
+            self._local.release()
+
+
+class SharedPresentationStore(PresentationStore):
+    """Presentation store whose contents are shared between server processes"""
+
+    def __init__(
+        self,
+        spill_dir: Path,
+        max_bytes: int,
+        oplog: OperationLog,
+        loader: Callable[[str], Optional[Presentation]],
+        replayer: Callable[[str, Presentation, List[Dict[str, Any]]], Any],
+        lease_dir: Path,
+        lease_timeout: float = 30,
+        check_interval: float = 1.0
+    ):
+        """
+        Initialize the shared store
+
+        Args:
+            spill_dir: Directory for presentations evicted from memory
+            max_bytes: Memory budget for presentations kept in memory
+            oplog: Operation log holding the shared state of every presentation
+            loader: Rebuilds a presentation from the operation log
+            replayer: Applies logged records to an in-memory presentation
+            lease_dir: Directory with one lease file per presentation
+            lease_timeout: Seconds to wait for another process's lease
+            check_interval: Minimum seconds between budget checks
+        """
+        # Processes must not spill into, or reload from, each other's files
+        super().__init__(Path(spill_dir) / str(os.getpid()), max_bytes, check_interval)
+        self.oplog = oplog
+        self.loader = loader
+        self.replayer = replayer
+        self.lease_dir = Path(lease_dir)
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.lease_timeout = lease_timeout
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Generation of the shared state each in-memory copy reflects, and the
+        # log position it was built up to
+        self._generations: Dict[str, int] = {}
+        self._heads: Dict[str, Tuple[Optional[str], int]] = {}
+        self.syncs = 0
+        self.catchups = 0
+        self.handoffs = 0
+
+    def lease_path(self, name: str) -> Path:
+        return self.lease_dir / f"{quote(name, safe='')}.lease"
+
+    def _new_lock(self, name: str) -> _SharedLock:
+        return _SharedLock(self, name)
+
+    def _local_version(self, name: str) -> Optional[int]:
+        with self._guard:
+            entry = self._entries.get(name)
+            return entry.version if entry is not None else None
+
+    def _drop(self, name: str):
+        """Forget the in-memory copy, keeping the lock object in use"""
+        with self._guard:
+            self._entries.pop(name, None)
+            self._generations.pop(name, None)
+            self._heads.pop(name, None)
+            self._spill_path(name).unlink(missing_ok=True)
+
+    def _sync(self, name: str, state: Dict[str, Any]) -> Optional[int]:
+        """Make the in-memory copy match the shared state, under the lease"""
+        generation = state["generation"]
+        if state.get("previous_owner") not in (None, self.owner):
+            self.handoffs += 1
+
+        with self._guard:
+            if name in self._entries and self._generations.get(name) == generation:
+                return self._entries[name].version
+            head = self._heads.get(name) if name in self._entries else None
+
+        # Another process changed it: replay only what it appended if possible
+        records = self.oplog.records_after(name, *head) if head else None
+        if records is not None:
+            self.replayer(name, self[name], records)
+            self.mark_dirty(name)
+            with self._guard:
+                self.catchups += 1
+        else:
+            self._drop(name)
+            prs = self.loader(name) if self.oplog.exists(name) else None
+            if prs is not None:
+                super().__setitem__(name, prs)
+                with self._guard:
+                    self.syncs += 1
+
+        self._synced(name, generation)
+        return self._local_version(name)
+
+    def _synced(self, name: str, generation: int):
+        """Record that the in-memory copy matches the shared state"""
+        head = self.oplog.head(name)
+        with self._guard:
+            if name in self._entries:
+                self._generations[name] = generation
+                self._heads[name] = head
+
+    def __contains__(self, name: str) -> bool:
+        return self.oplog.exists(name)
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def keys(self) -> List[str]:
+        return self.oplog.names()
+
+    def __delitem__(self, name: str):
+        if name not in self._entries:
+            raise KeyError(name)
+        self._drop(name)
+        self._discard_lock(name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Local counters plus how often other processes' changes were picked up"""
+        stats = super().stats()
+        with self._guard:
+            stats.update({"owner": self.owner, "syncs": self.syncs, "catchups": self.catchups, "handoffs": self.handoffs})
+        return stats
+
+    def info(self) -> List[Dict[str, Any]]:
+        """Presentations of every process; ones held by other processes show as "shared" """
+        local = {item["name"]: item for item in super().info()}
+        return [
+            local.get(name, {"name": name, "state": "shared", "memory_bytes": 0, "last_access": None})
+            for name in self.keys()
+        ]
@@ -0,0 +1,85 @@
+"""
+Template Cache
+Reads each presentation template once and hands out independent copies of it
+"""
+
+import io
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pptx import Presentation
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """Template packages keyed by name, invalidated when the file changes"""
+
+    def __init__(self, templates_dir: Path):
+        """
+        Initialize the template cache
+
+        Args:
+            templates_dir: Directory containing <template>.pptx files
+        """
+        self.templates_dir = Path(templates_dir)
+        self._lock = threading.Lock()
+        # name -> (mtime_ns, package bytes); None is python-pptx's default template
+        self._templates: Dict[Optional[str], Tuple[int, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, name: str) -> Path:
+        return self.templates_dir / f"{name}.pptx"
+
+    def exists(self, name: Optional[str]) -> bool:
+        return name is None or self.path(name).exists()
+
+    def _load(self, name: Optional[str]) -> bytes:
+        """Return the template package, (re)reading it if missing or stale"""
+        mtime = 0 if name is None else self.path(name).stat().st_mtime_ns
+
+        with self._lock:
+            cached = self._templates.get(name)
+            if cached and cached[0] == mtime:
+                self.hits += 1
+                return cached[1]
+
+        # Parsing once up front rejects a broken template before it is cached
+        prs = Presentation() if name is None else Presentation(self.path(name))
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        blob = buffer.getvalue()
+        with self._lock:
+            self._templates[name] = (mtime, blob)
+            self.misses += 1
+        logger.info(f"Loaded template '{name or 'default'}'")
+        return blob
+
+    def create(self, name: Optional[str] = None) -> Presentation:
+        """
+        Create a new presentation from a template
+
+        Args:
+            name: Template name, or None for the default blank template
+
+        Returns:
+            An independent copy of the parsed template
+        """
+        # A deep copy of a parsed presentation shares python-pptx's cached
+        # part proxies with the original, so every copy is parsed from bytes
+        return Presentation(io.BytesIO(self._load(name)))
+
+    def warm(self) -> List[str]:
+        """Load the default template and every template in the directory"""
+        names: List[Optional[str]] = [None] + sorted(p.stem for p in self.templates_dir.glob("*.pptx"))
+        loaded = []
+        for name in names:
+            try:
+                self._load(name)
+                loaded.append(name or "default")
+            except Exception as e:
+                logger.error(f"Failed to preload template '{name}': {e}")
+        return loaded
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Deck Watcher Tool
+Reports presentations in a directory once their saves have settled,
+using inotify on Linux and polling file stats elsewhere
+"""
+
+import os
+import sys
+import time
+import errno
+import struct
+import select
+import ctypes
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# inotify event flags, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+
+# Header of each inotify event: watch descriptor, mask, cookie, name length
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_deck(name: str) -> bool:
+    """
+    Tell whether a file name is a presentation worth exporting
+
+    PowerPoint's "~$" owner files, LibreOffice's ".~lock" files and the
+    hidden temporary files of atomic saves are skipped.
+
+    Args:
+        name: File name without directory
+
+    Returns:
+        True for a regular .pptx name
+    """
+    return name.endswith(".pptx") and not name.startswith(("~$", "."))
+
+
+class PollingSource:
+    """Finds changed decks by comparing file stats between scans"""
+
+    backend = "polling"
+
+    def __init__(self, directory: Path, interval: float = 1.0):
+        self.directory = directory
+        self.interval = interval
+        self._stats = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return stats
+        for entry in entries:
+            if not is_deck(entry.name):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """
+        Sleep until the next scan and report decks that changed since the last
+
+        Args:
+            timeout: Most seconds to wait, None to wait a full interval
+
+        Returns:
+            Names of new or modified decks
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        stats = self._scan()
+        changed = {name for name, stat in stats.items() if self._stats.get(name) != stat}
+        self._stats = stats
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """Receives changed decks from the kernel through inotify"""
+
+    backend = "inotify"
+
+    def __init__(self, directory: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "libc has no inotify support")
+
+        self.directory = directory
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+
+        # MODIFY keeps the debounce going while a large deck is written,
+        # CLOSE_WRITE and MOVED_TO catch direct and atomic (rename) saves
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"Cannot watch {directory}: {os.strerror(error)}")
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """
+        Block until events arrive and report the decks they touched
+
+        Args:
+            timeout: Most seconds to wait, None to wait indefinitely
+
+        Returns:
+            Names of modified decks, every deck if the event queue overflowed
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped, so any deck may have changed
+                    changed.update(entry.name for entry in os.scandir(self.directory))
+                elif name:
+                    changed.add(name)
+        return {name for name in changed if is_deck(name)}
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class DeckWatcher:
+    """Watch a directory for presentations that were saved"""
+
+    def __init__(
+        self,
+        directory: Path,
+        debounce: float = 1.0,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True
+    ):
+        """
+        Start watching a directory
+
+        inotify is used where available, falling back to polling every
+        `poll_interval` seconds when it is not (other platforms, exhausted
+        watch limits) or when `use_inotify` is False, e.g. for network
+        filesystems that do not deliver inotify events.
+
+        Args:
+            directory: Directory holding the presentations, not searched recursively
+            debounce: Seconds a deck must stay untouched before it is reported
+            poll_interval: Seconds between scans when polling
+            use_inotify: Try inotify before falling back to polling
+        """
+        self.directory = Path(directory)
+        self.debounce = debounce
+        self.fallback_reason = None
+
+        self._source = None
+        if use_inotify:
+            try:
+                self._source = InotifySource(self.directory)
+            except OSError as e:
+                self.fallback_reason = str(e)
+        if self._source is None:
+            self._source = PollingSource(self.directory, poll_interval)
+
+    @property
+    def backend(self) -> str:
+        """Name of the change source in use"""
+        return self._source.backend
+
+    def decks(self) -> List[Path]:
+        """
+        List the presentations currently in the directory
+
+        Returns:
+            Deck paths sorted by name
+        """
+        return sorted(path for path in self.directory.glob("*.pptx") if is_deck(path.name))
+
+    def changes(self) -> Iterator[List[Path]]:
+        """
+        Yield batches of decks whose saves have settled
+
+        Every event restarts the deck's debounce timer, so a burst of saves
+        produces a single report once the deck has been quiet for
+        `debounce` seconds. Decks deleted in the meantime are dropped.
+
+        Yields:
+            Deck paths sorted by name
+        """
+        deadlines: Dict[str, float] = {}
+        while True:
+            timeout = max(0.0, min(deadlines.values()) - time.monotonic()) if deadlines else None
+            changed = self._source.wait(timeout)
+
+            now = time.monotonic()
+            for name in changed:
+                deadlines[name] = now + self.debounce
+
+            settled = sorted(name for name, deadline in deadlines.items() if deadline <= now)
+            for name in settled:
+                del deadlines[name]
+            ready = [self.directory / name for name in settled if (self.directory / name).is_file()]
+            if ready:
+                yield ready
+
+    def close(self):
+        """Stop watching and release the inotify descriptor"""
+        self._source.close()
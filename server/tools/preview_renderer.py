@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Preview Renderer Tool
+Draws an approximate image of a slide with Pillow from the shapes'
+geometry, in milliseconds rather than the seconds a LibreOffice render takes
+"""
+
+import io
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+from pptx.enum.dml import MSO_COLOR_TYPE, MSO_FILL
+from pptx.enum.shapes import MSO_SHAPE, MSO_SHAPE_TYPE, PP_PLACEHOLDER
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+
+EMU_PER_POINT = 12700
+
+# Font sizes (pt) used when neither the run nor the paragraph sets one
+DEFAULT_FONT_SIZES = {
+    PP_PLACEHOLDER.TITLE: 44,
+    PP_PLACEHOLDER.CENTER_TITLE: 44,
+    PP_PLACEHOLDER.SUBTITLE: 32,
+    PP_PLACEHOLDER.BODY: 28,
+    PP_PLACEHOLDER.OBJECT: 28,
+}
+DEFAULT_FONT_SIZE = 18
+TABLE_FONT_SIZE = 14
+
+# Placeholders whose text the default layouts center
+CENTERED_PLACEHOLDERS = {PP_PLACEHOLDER.CENTER_TITLE, PP_PLACEHOLDER.SUBTITLE}
+TITLE_PLACEHOLDERS = {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE}
+
+GRID_COLOR = "#808080"
+CHART_COLOR = "#E6E6E6"
+
+# Decoded pictures kept per renderer, keyed by image hash and drawn size
+MAX_CACHED_PICTURES = 64
+
+
+@lru_cache(maxsize=128)
+def _font(size: int, bold: bool) -> ImageFont.ImageFont:
+    """Load a font at a pixel size, falling back to Pillow's built-in font (sizable since Pillow 10.1)"""
+    try:
+        return ImageFont.truetype("DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default(size=size)
+
+
+def _color(color_format, default: Optional[str]) -> Optional[str]:
+    """Explicit RGB color as a hex string; theme colors are not resolved"""
+    try:
+        if color_format.type == MSO_COLOR_TYPE.RGB:
+            return f"#{color_format.rgb}"
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return default
+
+
+def _fill_color(fill) -> Optional[str]:
+    try:
+        if fill.type == MSO_FILL.SOLID:
+            return _color(fill.fore_color, "#C0C0C0")
+    except (AttributeError, TypeError, NotImplementedError):
+        pass
+    return None
+
+
+class _Transform:
+    """Maps slide (or group child) coordinates in EMU to image pixels"""
+
+    def __init__(self, scale_x: float, scale_y: float, offset_x: float = 0, offset_y: float = 0):
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    def box(self, left, top, width, height) -> Tuple[float, float, float, float]:
+        x0 = self.offset_x + (left or 0) * self.scale_x
+        y0 = self.offset_y + (top or 0) * self.scale_y
+        return x0, y0, x0 + (width or 0) * self.scale_x, y0 + (height or 0) * self.scale_y
+
+    def point(self, x, y) -> Tuple[float, float]:
+        return self.offset_x + x * self.scale_x, self.offset_y + y * self.scale_y
+
+    def group(self, shape) -> "_Transform":
+        """Transform for the children of a group shape"""
+        xfrm = shape._element.grpSpPr.xfrm
+        if xfrm is None or xfrm.chExt is None or not xfrm.chExt.cx or not xfrm.chExt.cy:
+            return self
+        scale_x = self.scale_x * xfrm.ext.cx / xfrm.chExt.cx
+        scale_y = self.scale_y * xfrm.ext.cy / xfrm.chExt.cy
+        x0, y0 = self.point(xfrm.off.x, xfrm.off.y)
+        return _Transform(scale_x, scale_y, x0 - xfrm.chOff.x * scale_x, y0 - xfrm.chOff.y * scale_y)
+
+
+class PreviewRenderer:
+    """Approximate slide renderer for quick quality review"""
+
+    def __init__(self, slide_width: int, slide_height: int, width: int = 1920):
+        """
+        Initialize the preview renderer
+
+        Shape boxes, fills and outlines, text with its font sizes, word
+        wrapping and alignment, pictures, table grids and chart areas are
+        drawn. Theme colors, rotation, effects and font substitution are
+        not, so the result shows layout and text density rather than the
+        final look.
+
+        Args:
+            slide_width: Slide width in EMU
+            slide_height: Slide height in EMU
+            width: Image width in pixels; the height follows the slide's aspect ratio
+        """
+        self.width = width
+        self.height = max(1, round(width * slide_height / slide_width))
+        self.scale = width / slide_width
+        self._pictures: Dict[Tuple[str, int, int], Image.Image] = {}
+
+    def render(self, slide) -> Image.Image:
+        """
+        Draw a slide
+
+        Args:
+            slide: python-pptx slide
+
+        Returns:
+            RGB image of the slide
+        """
+        background = "white"
+        try:
+            if slide.follow_master_background is False:
+                background = _fill_color(slide.background.fill) or background
+        except (AttributeError, TypeError):
+            pass
+
+        image = Image.new("RGB", (self.width, self.height), background)
+        draw = ImageDraw.Draw(image)
+        self._draw_shapes(image, draw, slide.shapes, _Transform(self.scale, self.scale))
+        return image
+
+    def _draw_shapes(self, image: Image.Image, draw: ImageDraw.ImageDraw, shapes, transform: _Transform):
+        for shape in shapes:
+            try:
+                shape_type = shape.shape_type
+            except NotImplementedError:
+                shape_type = None
+
+            if shape_type == MSO_SHAPE_TYPE.GROUP:
+                self._draw_shapes(image, draw, shape.shapes, transform.group(shape))
+                continue
+
+            if shape_type == MSO_SHAPE_TYPE.LINE or hasattr(shape, "begin_x"):
+                self._draw_connector(draw, shape, transform)
+                continue
+
+            box = transform.box(shape.left, shape.top, shape.width, shape.height)
+            if box[2] - box[0] < 1 or box[3] - box[1] < 1:
+                continue
+
+            if hasattr(shape, "image"):
+                self._draw_picture(image, shape, box)
+            elif getattr(shape, "has_table", False):
+                self._draw_table(draw, shape.table, box, transform)
+            elif getattr(shape, "has_chart", False):
+                self._draw_chart(draw, shape.chart, box, transform)
+            else:
+                self._draw_box(draw, shape, box, transform)
+                if shape.has_text_frame and shape.text_frame.text:
+                    self._draw_text(
+                        draw, shape.text_frame, box, transform, self._placeholder_type(shape),
+                        centered=shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE
+                    )
+
+    @staticmethod
+    def _placeholder_type(shape):
+        if not shape.is_placeholder:
+            return None
+        try:
+            return shape.placeholder_format.type
+        except (AttributeError, ValueError):
+            return None
+
+    def _draw_box(self, draw: ImageDraw.ImageDraw, shape, box, transform: _Transform):
+        """Fill and outline of an autoshape, text box or placeholder"""
+        fill = _fill_color(shape.fill) if hasattr(shape, "fill") else None
+        outline = None
+        line_width = 1
+        try:
+            if shape.line.fill.type == MSO_FILL.SOLID:
+                outline = _color(shape.line.color, "#404040")
+                line_width = max(1, round((shape.line.width or EMU_PER_POINT) * transform.scale_x))
+        except (AttributeError, TypeError, NotImplementedError):
+            pass
+        if fill is None and outline is None:
+            return
+
+        try:
+            preset = shape.auto_shape_type
+        except (AttributeError, ValueError, NotImplementedError):
+            preset = None
+        if preset == MSO_SHAPE.OVAL:
+            draw.ellipse(box, fill=fill, outline=outline, width=line_width)
+        elif preset == MSO_SHAPE.ROUNDED_RECTANGLE:
+            radius = min(box[2] - box[0], box[3] - box[1]) / 6
+            draw.rounded_rectangle(box, radius, fill=fill, outline=outline, width=line_width)
+        else:
+            draw.rectangle(box, fill=fill, outline=outline, width=line_width)
+
+    def _draw_connector(self, draw: ImageDraw.ImageDraw, shape, transform: _Transform):
+        try:
+            start = transform.point(shape.begin_x, shape.begin_y)
+            end = transform.point(shape.end_x, shape.end_y)
+            color = _color(shape.line.color, "#404040")
+            width = max(1, round((shape.line.width or EMU_PER_POINT) * transform.scale_x))
+        except (AttributeError, TypeError):
+            return
+        draw.line([start, end], fill=color, width=width)
+
+    def _draw_picture(self, image: Image.Image, shape, box):
+        """Paste a picture scaled to its box, honoring its crop"""
+        width = round(box[2] - box[0])
+        height = round(box[3] - box[1])
+        try:
+            key = (shape.image.sha1, width, height)
+        except (AttributeError, ValueError):
+            return
+
+        picture = self._pictures.get(key)
+        if picture is None:
+            try:
+                with Image.open(io.BytesIO(shape.image.blob)) as source:
+                    # JPEGs decode at a reduced scale when the box is small
+                    source.draft("RGB", (width, height))
+                    crop = (
+                        source.width * shape.crop_left,
+                        source.height * shape.crop_top,
+                        source.width * (1 - shape.crop_right),
+                        source.height * (1 - shape.crop_bottom)
+                    )
+                    picture = source.convert("RGBA").resize((width, height), Image.BILINEAR, box=crop)
+            except (OSError, ValueError):
+                return
+            if len(self._pictures) >= MAX_CACHED_PICTURES:
+                self._pictures.clear()
+            self._pictures[key] = picture
+
+        image.paste(picture, (round(box[0]), round(box[1])), picture)
+
+    def _draw_table(self, draw: ImageDraw.ImageDraw, table, box, transform: _Transform):
+        """Cell grid with cell fills and text"""
+        y = box[1]
+        for row in table.rows:
+            row_height = row.height * transform.scale_y
+            x = box[0]
+            for column, cell in zip(table.columns, row.cells):
+                cell_box = (x, y, x + column.width * transform.scale_x, y + row_height)
+                draw.rectangle(cell_box, fill=_fill_color(cell.fill), outline=GRID_COLOR)
+                if cell.text:
+                    self._draw_text(draw, cell.text_frame, cell_box, transform, None, TABLE_FONT_SIZE)
+                x = cell_box[2]
+            y += row_height
+
+    def _draw_chart(self, draw: ImageDraw.ImageDraw, chart, box, transform: _Transform):
+        """Chart area with its title; the plot itself is not drawn"""
+        draw.rectangle(box, fill=CHART_COLOR, outline=GRID_COLOR)
+        draw.line([box[0], box[3], box[2], box[1]], fill=GRID_COLOR)
+        try:
+            title = chart.chart_title.text_frame.text if chart.has_title else ""
+        except AttributeError:
+            title = ""
+        font = _font(max(1, round(DEFAULT_FONT_SIZE * EMU_PER_POINT * transform.scale_y)), True)
+        draw.text(((box[0] + box[2]) / 2, box[1] + 4), title or "Chart", fill="black", font=font, anchor="ma")
+
+    def _draw_text(
+        self,
+        draw: ImageDraw.ImageDraw,
+        text_frame,
+        box,
+        transform: _Transform,
+        placeholder_type=None,
+        default_size: Optional[int] = None,
+        centered: bool = False
+    ):
+        """Word-wrapped paragraphs laid out in the text frame's box; autoshapes center their text"""
+        left = box[0] + (text_frame.margin_left or 0) * transform.scale_x
+        right = box[2] - (text_frame.margin_right or 0) * transform.scale_x
+        top = box[1] + (text_frame.margin_top or 0) * transform.scale_y
+        bottom = box[3] - (text_frame.margin_bottom or 0) * transform.scale_y
+        px_per_point = EMU_PER_POINT * transform.scale_y
+        default_size = default_size or DEFAULT_FONT_SIZES.get(placeholder_type, DEFAULT_FONT_SIZE)
+        default_align = PP_ALIGN.CENTER if centered or placeholder_type in CENTERED_PLACEHOLDERS else PP_ALIGN.LEFT
+        wrap = text_frame.word_wrap is not False
+
+        # Lay out all lines first so the block can be anchored vertically
+        lines = []
+        for paragraph in text_frame.paragraphs:
+            runs = paragraph.runs
+            first = runs[0].font if runs else paragraph.font
+            size = first.size or paragraph.font.size
+            size_px = max(1, round((size.pt if size else default_size) * px_per_point))
+            font = _font(size_px, bool(first.bold or paragraph.font.bold))
+            color = _color(first.color, None) or _color(paragraph.font.color, "black")
+            align = paragraph.alignment or default_align
+            indent = paragraph.level * size_px
+            width = max(1, right - left - indent)
+
+            text = "".join(run.text for run in runs) if runs else paragraph.text
+            for line in self._wrap(text, font, width) if wrap else [text]:
+                lines.append((line, font, color, align, indent, round(size_px * 1.2)))
+
+        anchor = text_frame.vertical_anchor
+        if anchor is None and (centered or placeholder_type in TITLE_PLACEHOLDERS):
+            anchor = MSO_ANCHOR.MIDDLE
+        block_height = sum(line[5] for line in lines)
+        if anchor == MSO_ANCHOR.MIDDLE:
+            y = top + (bottom - top - block_height) / 2
+        elif anchor == MSO_ANCHOR.BOTTOM:
+            y = bottom - block_height
+        else:
+            y = top
+
+        # Text overflowing its box is drawn anyway, which is what a reviewer needs to see
+        for text, font, color, align, indent, line_height in lines:
+            if align == PP_ALIGN.CENTER:
+                x, text_anchor = (left + indent + right) / 2, "ma"
+            elif align == PP_ALIGN.RIGHT:
+                x, text_anchor = right, "ra"
+            else:
+                x, text_anchor = left + indent, "la"
+            if text:
+                draw.text((x, y), text, fill=color, font=font, anchor=text_anchor)
+            y += line_height
+
+    @staticmethod
+    def _wrap(text: str, font: ImageFont.ImageFont, width: float):
+        """Split text into lines no wider than width, breaking at spaces"""
+        lines = []
+        for part in text.split("\v"):
+            line = ""
+            for word in part.split(" "):
+                candidate = f"{line} {word}" if line else word
+                if line and font.getlength(candidate) > width:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = candidate
+            lines.append(line)
+        return lines
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Process Runner Tool
+Runs converter subprocesses (LibreOffice, pdftoppm, ImageMagick) with
+timeouts, a global concurrency limit and per-command circuit breakers
+"""
+
+import os
+import time
+import signal
+import asyncio
+import functools
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(subprocess.SubprocessError):
+    """Raised instead of starting a command whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures, probing again after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds before a single trial call is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; half-open lets one trial through"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open":
+                # Re-arm so concurrent callers keep failing fast until the trial ends
+                self.opened_at = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected
+        }
+
+
+def _kill_group(pid: int):
+    """Kill a process and everything it spawned"""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class ProcessRunner:
+    """Run subprocesses with timeouts, bounded concurrency and circuit breakers"""
+
+    def __init__(
+        self,
+        max_concurrency: int = os.cpu_count() or 1,
+        default_timeout: float = 120,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        queue_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the process runner
+
+        Args:
+            max_concurrency: Maximum number of subprocesses running at once
+            default_timeout: Seconds before a subprocess is killed
+            failure_threshold: Consecutive failures that open a command's circuit
+            reset_timeout: Seconds an open circuit waits before a trial run
+            queue_timeout: Seconds to wait for a free slot, None to wait indefinitely
+        """
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.queue_timeout = queue_timeout
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.counters = {
+            "started": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "running": 0
+        }
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        """Return the circuit breaker for a command key"""
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[key]
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self.counters[name] += delta
+
+    def _admit(self, cmd: List[str], key: Optional[str]) -> CircuitBreaker:
+        breaker = self.breaker(key or Path(cmd[0]).name)
+        if not breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(f"Circuit open for '{key or cmd[0]}', not running {cmd[0]}")
+        return breaker
+
+    def _acquire_slot(self, cmd: List[str]):
+        """Wait for a free slot, raising TimeoutExpired after queue_timeout"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count("rejected")
+            raise subprocess.TimeoutExpired(cmd, self.queue_timeout)
+
+    async def _acquire_slot_async(self, cmd: List[str]):
+        """Wait for a free slot on a helper thread, without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        waiter = loop.run_in_executor(None, functools.partial(self._slots.acquire, timeout=self.queue_timeout))
+        try:
+            acquired = await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The helper thread may still get a slot after the caller gave up
+            waiter.add_done_callback(lambda done: done.result() and self._slots.release())
+            raise
+        if not acquired:
+            self._count("rejected")
+            raise subprocess.TimeoutExpired(cmd, self.queue_timeout)
+
+    def _finish(
+        self,
+        breaker: CircuitBreaker,
+        cmd: List[str],
+        returncode: int,
+        stdout: Any,
+        stderr: Any,
+        check: bool
+    ) -> subprocess.CompletedProcess:
+        if returncode == 0:
+            breaker.record_success()
+            self._count("succeeded")
+        else:
+            breaker.record_failure()
+            self._count("failed")
+            if check:
+                raise subprocess.CalledProcessError(returncode, cmd, stdout, stderr)
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def run_sync(
+        self,
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        key: Optional[str] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command, blocking the calling thread
+
+        Args:
+            cmd: Command and arguments
+            timeout: Seconds before the whole process group is killed
+            check: Raise CalledProcessError on a non-zero exit code
+            key: Circuit breaker key (defaults to the executable name)
+
+        Returns:
+            CompletedProcess with captured text output
+        """
+        timeout = timeout or self.default_timeout
+        breaker = self._admit(cmd, key)
+
+        self._acquire_slot(cmd)
+        self._count("started")
+        self._count("running")
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                start_new_session=True
+            )
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill_group(process.pid)
+                process.communicate()
+                breaker.record_failure()
+                self._count("timed_out")
+                raise
+            except BaseException:
+                # Interrupted, e.g. KeyboardInterrupt: take the whole group down
+                _kill_group(process.pid)
+                process.wait()
+                self._count("cancelled")
+                raise
+        except OSError:
+            breaker.record_failure()
+            self._count("failed")
+            raise
+        finally:
+            self._count("running", -1)
+            self._slots.release()
+
+        return self._finish(breaker, cmd, process.returncode, stdout, stderr, check)
+
+    async def run(
+        self,
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        key: Optional[str] = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command without blocking the event loop
+
+        Args:
+            cmd: Command and arguments
+            timeout: Seconds before the whole process group is killed
+            check: Raise CalledProcessError on a non-zero exit code
+            key: Circuit breaker key (defaults to the executable name)
+
+        Returns:
+            CompletedProcess with captured text output
+        """
+        timeout = timeout or self.default_timeout
+        breaker = self._admit(cmd, key)
+
+        # The slot semaphore is shared with run_sync callers on other threads
+        await self._acquire_slot_async(cmd)
+
+        self._count("started")
+        self._count("running")
+        try:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True
+                )
+            except OSError:
+                breaker.record_failure()
+                self._count("failed")
+                raise
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                _kill_group(process.pid)
+                await process.wait()
+                breaker.record_failure()
+                self._count("timed_out")
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            except asyncio.CancelledError:
+                # The caller went away, e.g. a client disconnect: its converter
+                # and everything the converter forked must not keep running
+                _kill_group(process.pid)
+                self._count("cancelled")
+                raise
+        finally:
+            self._count("running", -1)
+            self._slots.release()
+
+        return self._finish(
+            breaker, cmd, process.returncode,
+            stdout.decode(errors="replace"), stderr.decode(errors="replace"), check
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and circuit breaker states"""
+        with self._lock:
+            counters = dict(self.counters)
+            breakers = dict(self._breakers)
+        return {
+            "max_concurrency": self.max_concurrency,
+            "default_timeout": self.default_timeout,
+            **counters,
+            "breakers": {key: breaker.stats() for key, breaker in breakers.items()}
+        }
@@ -6,6 +6,8 @@ Extracts PNG screenshots from PowerPoint presentations for quality review
 
 import os
 import sys
+import shutil
+import tempfile
 from pathlib import Path
 from typing import List, Tuple, Optional
 import logging
@@ -14,6 +16,10 @@ from PIL import Image
 import io
 import base64
 
+from preview_renderer import PreviewRenderer
+from process_runner import ProcessRunner
+from slide_package import extract_slides
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -22,17 +28,31 @@ logger = logging.getLogger(__name__)
 class ScreenshotExtractor:
     """Extract screenshots from PowerPoint presentations"""
     
-    def __init__(self, presentation_path: Path, output_dir: Path = None):
+    def __init__(
+        self,
+        presentation_path: Path,
+        output_dir: Path = None,
+        renderer: str = "preview",
+        width: int = 1920
+    ):
         """
         Initialize the screenshot extractor
         
         Args:
             presentation_path: Path to the PowerPoint file
             output_dir: Directory to save screenshots (default: ./screenshots)
+            renderer: "preview" draws an approximation with Pillow in
+                milliseconds, "libreoffice" renders each slide exactly
+                but takes seconds per slide
+            width: Screenshot width in pixels
         """
+        if renderer not in ("preview", "libreoffice"):
+            raise ValueError(f"Unknown renderer '{renderer}', expected 'preview' or 'libreoffice'")
         self.presentation_path = Path(presentation_path)
         self.output_dir = output_dir or Path('./screenshots')
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.renderer = renderer
+        self.width = width
         
         # Load presentation
         try:
@@ -41,6 +61,11 @@ class ScreenshotExtractor:
         except Exception as e:
             logger.error(f"Failed to load presentation: {e}")
             raise
+        
+        self.preview_renderer = PreviewRenderer(
+            self.presentation.slide_width, self.presentation.slide_height, width
+        )
+        self.runner = ProcessRunner(default_timeout=120, failure_threshold=3)
     
     def extract_all_slides(self) -> List[Path]:
         """
@@ -71,40 +96,52 @@ class ScreenshotExtractor:
         Returns:
             Path to the generated screenshot
         """
-        slide = self.presentation.slides[slide_index]
-        
-        # Generate image (this is a simplified version - in production, 
-        # you'd use win32com on Windows or python-pptx-interface on Linux)
-        image = self._render_slide_to_image(slide)
+        # Generate image
+        image = self._render_slide_to_image(slide_index)
         
         # Save image
         output_path = self.output_dir / f"slide_{slide_index+1:02d}.png"
-        image.save(output_path, 'PNG', optimize=True)
+        # Fast compression; zlib's default level costs more than drawing a preview
+        image.save(output_path, 'PNG', compress_level=1)
         
         return output_path
     
-    def _render_slide_to_image(self, slide) -> Image:
+    def _render_slide_to_image(self, slide_index: int) -> Image:
         """
-        Render slide to image (simplified implementation)
+        Render slide to image with the configured renderer
         
-        In production, this would use:
-        - win32com.client on Windows to control PowerPoint
-        - LibreOffice headless on Linux
-        - Or a cloud service API
+        Args:
+            slide_index: Index of the slide to render
+            
+        Returns:
+            Rendered slide image
         """
-        # For now, create a placeholder image with slide information
-        # In production, this would actually render the slide
-        
-        img = Image.new('RGB', (1920, 1080), color='white')
-        
-        # This is where you'd implement actual slide rendering
-        # Options:
-        # 1. Use win32com to control PowerPoint (Windows only)
-        # 2. Use LibreOffice in headless mode (cross-platform)
-        # 3. Use a cloud rendering service
-        # 4. Use python-pptx-interface for basic rendering
-        
-        return img
+        if self.renderer == "libreoffice":
+            return self._render_with_libreoffice(slide_index)
+        return self.preview_renderer.render(self.presentation.slides[slide_index])
+    
+    def _render_with_libreoffice(self, slide_index: int) -> Image:
+        """Render a one-slide package of the slide with LibreOffice"""
+        work_dir = Path(tempfile.mkdtemp(prefix="screenshot_"))
+        try:
+            slide_file = work_dir / f"slide_{slide_index + 1:02d}.pptx"
+            slide_file.write_bytes(extract_slides(self.presentation, [slide_index]))
+            self.runner.run_sync([
+                "libreoffice",
+                f"-env:UserInstallation={(work_dir / 'profile').as_uri()}",
+                "--headless",
+                "--convert-to",
+                "png",
+                "--outdir",
+                str(work_dir),
+                str(slide_file)
+            ], check=True)
+            
+            with Image.open(slide_file.with_suffix(".png")) as rendered:
+                height = max(1, round(self.width * rendered.height / rendered.width))
+                return rendered.convert("RGB").resize((self.width, height), Image.LANCZOS)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
     
     def extract_with_metadata(self) -> List[dict]:
         """
@@ -235,19 +272,26 @@ class ScreenshotExtractor:
 
 def main():
     """Main function for command-line usage"""
-    if len(sys.argv) < 2:
-        print("Usage: python screenshot_extractor.py <presentation.pptx> [output_dir]")
-        sys.exit(1)
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract slide screenshots for quality review")
+    parser.add_argument("presentation", help="Path to PPTX file")
+    parser.add_argument("output_dir", nargs="?", help="Directory for screenshots (default: ./screenshots)")
+    parser.add_argument("--renderer", choices=["preview", "libreoffice"], default="preview",
+                        help="Fast approximate preview, or exact LibreOffice rendering")
+    parser.add_argument("--width", type=int, default=1920, help="Screenshot width in pixels")
+    
+    args = parser.parse_args()
     
-    presentation_path = Path(sys.argv[1])
-    output_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    presentation_path = Path(args.presentation)
+    output_dir = Path(args.output_dir) if args.output_dir else None
     
     if not presentation_path.exists():
         print(f"Error: Presentation file not found: {presentation_path}")
         sys.exit(1)
     
     # Extract screenshots
-    extractor = ScreenshotExtractor(presentation_path, output_dir)
+    extractor = ScreenshotExtractor(presentation_path, output_dir, renderer=args.renderer, width=args.width)
     
     # Extract with metadata
     metadata = extractor.extract_with_metadata()
@@ -6,41 +6,139 @@ Uses LibreOffice for slide rendering
 """
 
 import os
+import re
 import sys
 import json
+import signal
 import subprocess
+import time
 import shutil
+import tempfile
 from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 from pptx import Presentation
 
+from deck_watcher import DeckWatcher
+from process_runner import ProcessRunner
+from slide_package import extract_slides, page_ranges, contiguous_runs, shows_slide_number, slide_fingerprint
+from thumbnail_pyramid import DEFAULT_LEVELS, parse_levels, build_pyramid
+
+# Every LibreOffice start costs seconds, so a shard gets at least this many slides
+MIN_SLIDES_PER_SHARD = 5
+
+# pdftoppm and ImageMagick start fast, but each one parses the whole PDF
+MIN_PAGES_PER_RASTERIZER = 4
+
+# Name of a slide image, slide-<number>.png
+SLIDE_IMAGE = re.compile(r"slide-(\d+)\.png")
+
+# Slide hashes and images of an incremental export, kept in its directory
+MANIFEST_FILE = "manifest.json"
+# PDF pages of an incremental export's slides, named by slide hash
+PAGES_DIR = ".pages"
+
+
+def slide_images(directory: Path) -> List[Path]:
+    """slide-<number>.png images in a directory, in page order"""
+    # Names sort by number only while they share a width
+    numbered = []
+    for image in directory.glob("slide-*.png"):
+        match = SLIDE_IMAGE.fullmatch(image.name)
+        if match:
+            numbered.append((int(match.group(1)), image))
+    return [image for _, image in sorted(numbered)]
+
+
+@dataclass
+class SlideRecord:
+    """What the markdown overview shows of one slide"""
+    number: int
+    title: Optional[str]
+    heading: str
+    anchor: str
+    lines: List[str]
+    notes: Optional[str]
+    image: Optional[str]
+
 
 class SlideExporter:
     """Export PowerPoint presentations to various formats"""
     
-    def __init__(self, presentations_dir: str = "./presentations"):
+    def __init__(
+        self,
+        presentations_dir: str = "./presentations",
+        timeout: float = 300,
+        pyramid_levels: Optional[Dict[str, int]] = None,
+        workers: Optional[int] = None
+    ):
         self.presentations_dir = Path(presentations_dir)
         self.exports_dir = self.presentations_dir / "exports"
         self.exports_dir.mkdir(parents=True, exist_ok=True)
+        # Slide ranges rendered side by side, one converter process each
+        self.workers = workers or os.cpu_count() or 1
+        # Converter calls are killed after `timeout` seconds, and skipped
+        # altogether once a converter has failed repeatedly
+        self.runner = ProcessRunner(max_concurrency=self.workers, default_timeout=timeout, failure_threshold=3)
+        # Preview sizes scaled from each slide image into images/<level>/
+        self.pyramid_levels = DEFAULT_LEVELS if pyramid_levels is None else pyramid_levels
     
-    def export_to_markdown(self, pptx_file: Path) -> Path:
+    def export_to_markdown(self, pptx_file: Path, incremental: bool = False) -> Path:
         """
         Export a PowerPoint presentation to markdown with PNG images
         
         Args:
             pptx_file: Path to the PPTX file
+            incremental: Update the presentation's previous export in place
         
         Returns:
             Path to the generated markdown file
         """
+        return self.export(pptx_file, incremental)["markdown"]
+    
+    def export(self, pptx_file: Path, incremental: bool = False) -> Dict[str, Any]:
+        """
+        Export a PowerPoint presentation to markdown, PNG images and PDF
+        
+        The export runs in stages that share their intermediate files: the
+        deck is converted to PDF once, the PDF is rasterized into the slide
+        images, and the same PDF is published with the export rather than
+        converted a second time.
+        
+        An incremental export goes to exports/<name>/ instead of a new
+        timestamped directory and keeps a manifest of slide hashes there.
+        Images of unchanged slides are reused, even if the slides moved, and
+        only the changed slides are converted and rasterized.
+        
+        Args:
+            pptx_file: Path to the PPTX file
+            incremental: Update the presentation's previous export in place
+        
+        Returns:
+            Dictionary with the export directory, markdown file, PDF (None if
+            it could not be generated), slide images, number of slides
+            rendered and seconds per stage
+        """
         if not pptx_file.exists():
             raise FileNotFoundError(f"Presentation file not found: {pptx_file}")
         
+        timings: Dict[str, float] = {}
+        
+        @contextmanager
+        def stage(name: str):
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                timings[name] = round(time.perf_counter() - started, 3)
+        
         # Create export directory for this presentation
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        export_name = f"{pptx_file.stem}_{timestamp}"
+        export_name = pptx_file.stem if incremental else f"{pptx_file.stem}_{timestamp}"
         export_dir = self.exports_dir / export_name
         export_dir.mkdir(parents=True, exist_ok=True)
         
@@ -48,110 +146,498 @@ class SlideExporter:
         export_pptx = export_dir / pptx_file.name
         shutil.copy2(pptx_file, export_pptx)
         
-        # Load presentation
-        prs = Presentation(pptx_file)
-        
-        # Generate PNG images using LibreOffice
         images_dir = export_dir / "images"
         images_dir.mkdir(exist_ok=True)
-        self._generate_slide_images(export_pptx, images_dir)
-        
-        # Create markdown content
-        markdown_content = self._create_markdown(prs, export_name, images_dir)
-        
-        # Save markdown file
-        markdown_file = export_dir / f"{export_name}_overview.md"
-        markdown_file.write_text(markdown_content, encoding='utf-8')
+        work_dir = Path(tempfile.mkdtemp(prefix=".work_", dir=export_dir))
         
-        # Generate PDF if requested
-        self._generate_pdf(export_pptx, export_dir)
+        try:
+            with stage("load"):
+                prs = Presentation(export_pptx)
+            
+            # Slides without a reusable image are converted
+            changed = list(range(len(prs.slides)))
+            if incremental:
+                with stage("diff"):
+                    hashes = self._slide_hashes(prs)
+                    changed = self._reuse_images(hashes, export_dir, images_dir, work_dir)
+                print(f"♻️  Reusing {len(hashes) - len(changed)} slide images, {len(changed)} changed")
+            
+            with stage("convert"):
+                parts = self._convert(export_pptx, prs, work_dir, changed)
+            
+            with stage("rasterize"):
+                self._rasterize(parts, images_dir)
+            images = slide_images(images_dir)
+            
+            with stage("previews"):
+                missing = [
+                    image for image in images
+                    if not all((images_dir / level / image.name).exists() for level in self.pyramid_levels)
+                ]
+                if missing:
+                    self._generate_pyramid(missing, images_dir)
+            
+            with stage("extract"):
+                records = self._extract_slides(prs, images_dir)
+            
+            with stage("markdown"):
+                markdown_file = export_dir / f"{export_name}_overview.md"
+                self._write_markdown(records, export_name, markdown_file)
+            
+            with stage("publish_pdf"):
+                if incremental:
+                    pdf_file = self._publish_pages(parts, hashes, export_pptx, export_dir)
+                else:
+                    pdf_file = self._publish_pdf(parts, export_pptx, export_dir)
+            
+            if incremental:
+                self._save_manifest(hashes, export_dir, images_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
         
         print(f"✅ Export completed: {export_dir}")
         print(f"📄 Markdown: {markdown_file}")
+        print("⏱️  " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+        
+        return {
+            "export_dir": export_dir,
+            "markdown": markdown_file,
+            "pdf": pdf_file,
+            "images": images,
+            "rendered": len(changed),
+            "timings": timings
+        }
+    
+    def watch(self, debounce: float = 1.0, poll_interval: float = 1.0, use_inotify: bool = True):
+        """
+        Export presentations incrementally whenever they are saved
         
-        return markdown_file
+        Runs until interrupted. Decks saved since their last incremental
+        export are brought up to date first, then every deck is re-exported
+        once a burst of saves to it has settled. The exporter stays loaded
+        between exports, so each one only pays for the slides that changed.
+        
+        Args:
+            debounce: Seconds a deck must stay untouched before it is exported
+            poll_interval: Seconds between directory scans when polling
+            use_inotify: Use inotify where available instead of polling
+        """
+        watcher = DeckWatcher(self.presentations_dir, debounce, poll_interval, use_inotify)
+        if watcher.fallback_reason:
+            print(f"⚠️  inotify unavailable ({watcher.fallback_reason}), polling every {poll_interval:g}s")
+        print(f"👀 Watching {self.presentations_dir} ({watcher.backend}), press Ctrl+C to stop")
+        
+        # Stats of each deck as last exported, so saves that left the file
+        # unchanged (or events for the export's own copy) do not re-export
+        exported: Dict[Path, Any] = {}
+        
+        def export(deck: Path):
+            try:
+                stat = deck.stat()
+                if exported.get(deck) == (stat.st_mtime_ns, stat.st_size):
+                    return
+                print(f"📊 Exporting {deck.name}")
+                self.export(deck, incremental=True)
+                exported[deck] = (stat.st_mtime_ns, stat.st_size)
+            except Exception as e:
+                # A half-written deck fails to open; its next save retries it
+                print(f"❌ Export of {deck.name} failed: {e}")
+        
+        try:
+            for deck in watcher.decks():
+                manifest_file = self.exports_dir / deck.stem / MANIFEST_FILE
+                if not manifest_file.exists() or manifest_file.stat().st_mtime < deck.stat().st_mtime:
+                    export(deck)
+            for decks in watcher.changes():
+                for deck in decks:
+                    export(deck)
+        except KeyboardInterrupt:
+            print("👋 Stopped watching")
+        finally:
+            watcher.close()
     
-    def _generate_slide_images(self, pptx_file: Path, output_dir: Path) -> List[Path]:
+    def _convert(
+        self,
+        pptx_file: Path,
+        prs: Presentation,
+        work_dir: Path,
+        slides: List[int]
+    ) -> List[Dict[str, Any]]:
         """
-        Generate PNG images from PowerPoint slides using LibreOffice
+        Convert slides to PDF, in parallel slide ranges for larger decks
+        
+        Each range is written to a package of its own and converted by a
+        separate LibreOffice process with a private profile, since LibreOffice
+        instances sharing a profile cannot run side by side. Ranges holding
+        slides that are not consecutive in the deck are split further when
+        the slides show their numbers.
         
         Args:
             pptx_file: Path to PPTX file
-            output_dir: Directory to save images
+            prs: The loaded presentation
+            work_dir: Directory for intermediate files
+            slides: Indices of the slides to convert, in order
+        
+        Returns:
+            One part per slide range with its slides, package, working
+            directory, office profile and PDF (None if conversion failed)
+        """
+        shards = [[slides[i] for i in indices] for indices in page_ranges(len(slides), self.workers, MIN_SLIDES_PER_SHARD)]
+        # A package numbers its slides on from its first one, so slides after
+        # a gap in the selection would show the wrong slide numbers
+        if any(shows_slide_number(prs.slides[i]) for i in slides):
+            shards = [run for shard in shards for run in contiguous_runs(shard)]
+        
+        if len(shards) == 1 and len(slides) == len(prs.slides):
+            parts = [{"slides": slides, "pptx": pptx_file, "dir": work_dir, "profile": None}]
+        else:
+            if len(shards) > 1:
+                print(f"   Converting {len(shards)} slide ranges in parallel")
+            parts = []
+            for shard_id, shard in enumerate(shards):
+                shard_dir = work_dir / f"shard-{shard_id:03d}"
+                shard_dir.mkdir()
+                shard_file = shard_dir / pptx_file.name
+                shard_file.write_bytes(extract_slides(prs, shard))
+                parts.append({"slides": shard, "pptx": shard_file, "dir": shard_dir, "profile": shard_dir / "profile"})
+        
+        pdfs = self._map(lambda part: self._convert_to_pdf(part["pptx"], part["dir"], part["profile"]), parts)
+        for part, pdf in zip(parts, pdfs):
+            part["pdf"] = pdf
+        return parts
+    
+    def _rasterize(self, parts: List[Dict[str, Any]], images_dir: Path) -> List[Path]:
+        """
+        Rasterize the converted PDFs and collect the images in slide order
+        
+        Args:
+            parts: Converted slide ranges from _convert
+            images_dir: Directory to save images
         
         Returns:
             List of generated image paths
         """
+        if not parts:
+            return []
         print(f"🖼️  Generating slide images...")
         
-        # First convert to PDF
-        pdf_cmd = [
-            "libreoffice",
+        def rasterize(part: Dict[str, Any]) -> List[Path]:
+            output_dir = part["dir"] / "images"
+            output_dir.mkdir()
+            try:
+                # Convert PDF to PNG images using ImageMagick or pdftoppm
+                if part["pdf"] and shutil.which("pdftoppm"):
+                    self._pdf_to_png_pdftoppm(part["pdf"], output_dir, len(part["slides"]))
+                elif part["pdf"] and shutil.which("convert"):
+                    self._pdf_to_png_imagemagick(part["pdf"], output_dir, len(part["slides"]))
+                else:
+                    # Fallback: Direct PPTX to PNG conversion
+                    self._pptx_to_png_direct(part["pptx"], output_dir, part["profile"])
+            except (subprocess.SubprocessError, OSError) as e:
+                print(f"⚠️  Warning: Could not rasterize PDF: {e}")
+                self._pptx_to_png_direct(part["pptx"], output_dir, part["profile"])
+            return slide_images(output_dir)
+        
+        written = []
+        for part, images in zip(parts, self._map(rasterize, parts)):
+            slides = part["slides"]
+            if images and len(images) != len(slides):
+                print(f"⚠️  Warning: {len(slides)} slides produced {len(images)} images")
+            for index, image in zip(slides, images):
+                written.append((index, image.rename(images_dir / f"slide-{index + 1:03d}.png")))
+        
+        print(f"✅ Generated {len(written)} slide images")
+        return [image for _, image in sorted(written)]
+    
+    def _publish_pdf(self, parts: List[Dict[str, Any]], pptx_file: Path, export_dir: Path) -> Optional[Path]:
+        """Move the converted PDF into the export, joining slide ranges if needed"""
+        pdf_file = export_dir / f"{pptx_file.stem}.pdf"
+        pdfs = [part["pdf"] for part in parts]
+        if not all(pdfs):
+            print("⚠️  Could not generate PDF (LibreOffice may not be installed)")
+            return None
+        
+        if len(pdfs) == 1:
+            shutil.move(pdfs[0], pdf_file)
+        elif shutil.which("pdfunite"):
+            try:
+                self.runner.run_sync(["pdfunite", *map(str, pdfs), str(pdf_file)], check=True)
+            except (subprocess.SubprocessError, OSError) as e:
+                print(f"⚠️  Warning: Could not join PDF parts: {e}")
+        
+        if not pdf_file.exists():
+            # Ranges that cannot be joined are converted again as a whole
+            return self._generate_pdf(pptx_file, export_dir)
+        
+        print(f"📑 Generated PDF: {pdf_file}")
+        return pdf_file
+    
+    def _slide_hashes(self, prs: Presentation) -> List[str]:
+        """Fingerprint of each slide's rendered appearance"""
+        # A slide number field renders differently once the slide moves
+        return [slide_fingerprint(prs, slide, index=index) for index, slide in enumerate(prs.slides)]
+    
+    def _reuse_images(self, hashes: List[str], export_dir: Path, images_dir: Path, work_dir: Path) -> List[int]:
+        """
+        Put the previous export's images of unchanged slides in place
+        
+        Images and previews of slides whose hash is still in the deck are
+        moved aside, everything else in the images directory is removed, and
+        the kept images are copied to their slides' current positions.
+        
+        Args:
+            hashes: Hash of each slide, in order
+            export_dir: Directory of the previous export
+            images_dir: Directory with the previous export's images
+            work_dir: Directory for intermediate files
+        
+        Returns:
+            Indices of the slides that need to be rendered
+        """
+        manifest = self._load_manifest(export_dir)
+        
+        levels = list(self.pyramid_levels)
+        if manifest.get("levels") != self.pyramid_levels:
+            # Previews of other sizes cannot be reused
+            for level_dir in images_dir.iterdir():
+                if level_dir.is_dir():
+                    shutil.rmtree(level_dir)
+        
+        kept_dir = work_dir / "kept"
+        for level in [""] + levels:
+            (kept_dir / level).mkdir(parents=True, exist_ok=True)
+        
+        wanted = set(hashes)
+        for entry in manifest.get("slides", []):
+            image = entry.get("image")
+            if entry.get("hash") not in wanted or not image or not (images_dir / image).exists():
+                continue
+            for level in [""] + levels:
+                source = images_dir / level / image
+                if source.exists():
+                    source.rename(kept_dir / level / f"{entry['hash']}.png")
+        
+        for stale in images_dir.glob("**/slide-*.png"):
+            stale.unlink()
+        
+        changed = []
+        for index, slide_hash in enumerate(hashes):
+            name = f"slide-{index + 1:03d}.png"
+            if not (kept_dir / f"{slide_hash}.png").exists():
+                changed.append(index)
+                continue
+            for level in [""] + levels:
+                kept = kept_dir / level / f"{slide_hash}.png"
+                if kept.exists():
+                    (images_dir / level).mkdir(exist_ok=True)
+                    shutil.copy2(kept, images_dir / level / name)
+        return changed
+    
+    def _load_manifest(self, export_dir: Path) -> Dict[str, Any]:
+        """Manifest of the previous incremental export, empty if there is none"""
+        try:
+            return json.loads((export_dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self, hashes: List[str], export_dir: Path, images_dir: Path):
+        """Record which slide each image shows, for the next incremental export"""
+        slides = []
+        for index, slide_hash in enumerate(hashes):
+            name = f"slide-{index + 1:03d}.png"
+            slides.append({"hash": slide_hash, "image": name if (images_dir / name).exists() else None})
+        
+        manifest_file = export_dir / MANIFEST_FILE
+        tmp_file = manifest_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps({"levels": self.pyramid_levels, "slides": slides}, indent=2), encoding="utf-8")
+        tmp_file.replace(manifest_file)
+    
+    def _publish_pages(
+        self,
+        parts: List[Dict[str, Any]],
+        hashes: List[str],
+        pptx_file: Path,
+        export_dir: Path
+    ) -> Optional[Path]:
+        """
+        Assemble an incremental export's PDF from per-slide pages
+        
+        The pages of newly converted slides are split off with pdfseparate
+        and kept by slide hash, so the whole PDF is joined with pdfunite
+        without converting unchanged slides again.
+        
+        Args:
+            parts: Converted slide ranges from _convert
+            hashes: Hash of each slide, in order
+            pptx_file: Path to the exported PPTX file
+            export_dir: Export directory
+        
+        Returns:
+            Path to the PDF, or None if it could not be brought up to date
+        """
+        pdf_file = export_dir / f"{pptx_file.stem}.pdf"
+        converted = sum(len(part["slides"]) for part in parts)
+        if not (shutil.which("pdfseparate") and shutil.which("pdfunite")):
+            if converted == len(hashes):
+                return self._publish_pdf(parts, pptx_file, export_dir)
+            # Same slides in the same order: the previous PDF is still current
+            previous = [entry.get("hash") for entry in self._load_manifest(export_dir).get("slides", [])]
+            if converted == 0 and previous == hashes and pdf_file.exists():
+                return pdf_file
+            print("⚠️  PDF not updated: incremental exports need pdfseparate and pdfunite")
+            pdf_file.unlink(missing_ok=True)
+            return None
+        
+        pages_dir = export_dir / PAGES_DIR
+        pages_dir.mkdir(exist_ok=True)
+        pages = [pages_dir / f"{slide_hash}.pdf" for slide_hash in hashes]
+        
+        try:
+            for part in parts:
+                if part["pdf"] is None:
+                    continue
+                split_dir = part["dir"] / "pages"
+                split_dir.mkdir()
+                self.runner.run_sync(["pdfseparate", str(part["pdf"]), str(split_dir / "page-%d.pdf")], check=True)
+                for number, index in enumerate(part["slides"], 1):
+                    page = split_dir / f"page-{number}.pdf"
+                    if page.exists():
+                        page.replace(pages_dir / f"{hashes[index]}.pdf")
+            
+            for page in pages_dir.glob("*.pdf"):
+                if page not in pages:
+                    page.unlink()
+            
+            if not all(page.exists() for page in pages):
+                print("⚠️  Could not generate PDF (LibreOffice may not be installed)")
+                pdf_file.unlink(missing_ok=True)
+                return None
+            
+            self.runner.run_sync(["pdfunite", *map(str, pages), str(pdf_file)], check=True)
+        except (subprocess.SubprocessError, OSError) as e:
+            print(f"⚠️  Warning: Could not assemble PDF pages: {e}")
+            pdf_file.unlink(missing_ok=True)
+            return None
+        
+        print(f"📑 Generated PDF: {pdf_file}")
+        return pdf_file
+    
+    def _map(self, func, parts: List[Any]) -> List[Any]:
+        """Apply func to every part, concurrently when there are several"""
+        if len(parts) <= 1:
+            return [func(part) for part in parts]
+        with ThreadPoolExecutor(max_workers=len(parts)) as pool:
+            return list(pool.map(func, parts))
+    
+    def _office_cmd(self, profile: Optional[Path] = None) -> List[str]:
+        """LibreOffice command prefix, with a private profile if given"""
+        cmd = ["libreoffice"]
+        if profile:
+            cmd.append(f"-env:UserInstallation={profile.resolve().as_uri()}")
+        return cmd
+    
+    def _convert_to_pdf(self, pptx_file: Path, output_dir: Path, profile: Optional[Path] = None) -> Optional[Path]:
+        """Convert a PPTX file to PDF with LibreOffice, None on failure"""
+        cmd = self._office_cmd(profile) + [
             "--headless",
             "--convert-to",
             "pdf",
             "--outdir",
-            str(output_dir.parent),
+            str(output_dir),
             str(pptx_file)
         ]
         
         try:
-            result = subprocess.run(pdf_cmd, capture_output=True, text=True, check=True)
-            pdf_file = output_dir.parent / f"{pptx_file.stem}.pdf"
-            
-            if pdf_file.exists():
-                # Convert PDF to PNG images using ImageMagick or pdftoppm
-                if shutil.which("pdftoppm"):
-                    self._pdf_to_png_pdftoppm(pdf_file, output_dir)
-                elif shutil.which("convert"):
-                    self._pdf_to_png_imagemagick(pdf_file, output_dir)
-                else:
-                    # Fallback: Direct PPTX to PNG conversion
-                    self._pptx_to_png_direct(pptx_file, output_dir)
-                
-                # Clean up PDF
-                pdf_file.unlink()
-            
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️  Warning: Could not generate images via LibreOffice: {e}")
-            # Try direct conversion
-            self._pptx_to_png_direct(pptx_file, output_dir)
-        
-        # Return list of generated images
-        images = sorted(output_dir.glob("*.png"))
-        print(f"✅ Generated {len(images)} slide images")
-        return images
-    
-    def _pdf_to_png_pdftoppm(self, pdf_file: Path, output_dir: Path):
-        """Convert PDF to PNG using pdftoppm"""
-        cmd = [
-            "pdftoppm",
-            "-png",
-            "-r", "150",  # DPI
-            str(pdf_file),
-            str(output_dir / "slide")
-        ]
-        subprocess.run(cmd, check=True)
-        
-        # Rename files to have consistent naming
-        for i, img in enumerate(sorted(output_dir.glob("slide-*.png")), 1):
-            img.rename(output_dir / f"slide-{i:03d}.png")
-    
-    def _pdf_to_png_imagemagick(self, pdf_file: Path, output_dir: Path):
-        """Convert PDF to PNG using ImageMagick"""
-        cmd = [
-            "convert",
-            "-density", "150",
-            str(pdf_file),
-            "-quality", "90",
-            str(output_dir / "slide-%03d.png")
-        ]
-        subprocess.run(cmd, check=True)
+            self.runner.run_sync(cmd, check=True)
+        except (subprocess.SubprocessError, OSError) as e:
+            print(f"⚠️  Warning: Could not convert to PDF via LibreOffice: {e}")
+            return None
+        
+        pdf_file = output_dir / f"{pptx_file.stem}.pdf"
+        return pdf_file if pdf_file.exists() else None
+    
+    def _generate_pyramid(self, images: List[Path], output_dir: Path):
+        """Scale every slide image into the preview level directories"""
+        for level in self.pyramid_levels:
+            (output_dir / level).mkdir(exist_ok=True)
+        for image in images:
+            try:
+                build_pyramid(image, self.pyramid_levels, lambda level: output_dir / level / image.name)
+            except OSError as e:
+                print(f"⚠️  Warning: Could not scale {image.name}: {e}")
+        print(f"✅ Generated previews: {', '.join(self.pyramid_levels)}")
     
-    def _pptx_to_png_direct(self, pptx_file: Path, output_dir: Path):
+    def _pdf_page_count(self, pdf_file: Path) -> Optional[int]:
+        """Number of pages according to pdfinfo, None if it is not available"""
+        if not shutil.which("pdfinfo"):
+            return None
+        try:
+            result = self.runner.run_sync(["pdfinfo", str(pdf_file)], check=True)
+        except (subprocess.SubprocessError, OSError):
+            return None
+        for line in result.stdout.splitlines():
+            if line.startswith("Pages:"):
+                return int(line.split()[1])
+        return None
+    
+    def _raster_ranges(self, pdf_file: Path, page_count: Optional[int]) -> List[Optional[range]]:
+        """Page ranges rasterized side by side; [None] rasterizes the whole PDF at once"""
+        page_count = page_count or self._pdf_page_count(pdf_file)
+        if not page_count:
+            return [None]
+        return page_ranges(page_count, self.workers, MIN_PAGES_PER_RASTERIZER)
+    
+    def _pdf_to_png_pdftoppm(self, pdf_file: Path, output_dir: Path, page_count: Optional[int] = None):
+        """
+        Convert PDF to PNG using pdftoppm, in parallel page ranges
+        
+        Args:
+            pdf_file: PDF to rasterize
+            output_dir: Directory for the slide-NNN.png images
+            page_count: Pages in the PDF if known, otherwise asked from pdfinfo
+        """
+        def rasterize(pages: Optional[range]):
+            cmd = ["pdftoppm", "-png", "-r", "150"]  # DPI
+            if pages:
+                cmd += ["-f", str(pages.start + 1), "-l", str(pages.stop)]
+            self.runner.run_sync(cmd + [str(pdf_file), str(output_dir / "slide")], check=True)
+        
+        self._map(rasterize, self._raster_ranges(pdf_file, page_count))
+        
+        # pdftoppm pads page numbers to the width of the page count, so only
+        # PDFs of fewer than 100 or more than 999 pages need renaming
+        for image in output_dir.glob("slide-*.png"):
+            target = output_dir / f"slide-{int(image.stem[len('slide-'):]):03d}.png"
+            if image != target:
+                image.rename(target)
+    
+    def _pdf_to_png_imagemagick(self, pdf_file: Path, output_dir: Path, page_count: Optional[int] = None):
+        """
+        Convert PDF to PNG using ImageMagick, in parallel page ranges
+        
+        Args:
+            pdf_file: PDF to rasterize
+            output_dir: Directory for the slide-NNN.png images
+            page_count: Pages in the PDF if known, otherwise asked from pdfinfo
+        """
+        def rasterize(pages: Optional[range]):
+            # Page selectors count from zero, -scene numbers the output from the first page
+            source = f"{pdf_file}[{pages.start}-{pages.stop - 1}]" if pages else str(pdf_file)
+            cmd = [
+                "convert",
+                "-density", "150",
+                source,
+                "-quality", "90",
+                "-scene", str(pages.start + 1 if pages else 1),
+                str(output_dir / "slide-%03d.png")
+            ]
+            self.runner.run_sync(cmd, check=True)
+        
+        self._map(rasterize, self._raster_ranges(pdf_file, page_count))
+    
+    def _pptx_to_png_direct(self, pptx_file: Path, output_dir: Path, profile: Optional[Path] = None):
         """Direct PPTX to PNG conversion using LibreOffice"""
-        cmd = [
-            "libreoffice",
+        cmd = self._office_cmd(profile) + [
             "--headless",
             "--convert-to",
             "png",
@@ -161,36 +647,104 @@ class SlideExporter:
         ]
         
         try:
-            subprocess.run(cmd, check=True)
+            self.runner.run_sync(cmd, check=True)
             # Rename the single image if only one was created
             single_image = output_dir / f"{pptx_file.stem}.png"
             if single_image.exists():
                 single_image.rename(output_dir / "slide-001.png")
-        except subprocess.CalledProcessError:
+        except (subprocess.SubprocessError, OSError):
             print("⚠️  Could not generate images. LibreOffice may not be installed.")
     
-    def _create_markdown(self, prs: Presentation, export_name: str, images_dir: Path) -> str:
+    def _extract_slides(self, prs: Presentation, images_dir: Path) -> List[SlideRecord]:
         """
-        Create markdown documentation for the presentation
+        Extract what the markdown needs from every slide, in one pass
         
         Args:
             prs: PowerPoint presentation object
-            export_name: Name of the export
             images_dir: Directory containing slide images
         
         Returns:
-            Markdown content as string
+            One record per slide, in order
         """
-        images = sorted(images_dir.glob("*.png"))
+        # Images are named after their slide; a slide that failed to render
+        # has none, and must not shift the later slides' images onto it
+        images = {}
+        for image in images_dir.glob("slide-*.png"):
+            match = SLIDE_IMAGE.fullmatch(image.name)
+            if match:
+                images[int(match.group(1))] = f"images/{image.name}"
+        return [self._extract_slide(number, slide, images.get(number)) for number, slide in enumerate(prs.slides, 1)]
+    
+    def _extract_slide(self, number: int, slide, image: Optional[str]) -> SlideRecord:
+        """Title, text lines and notes of a slide from a single walk over its shapes"""
+        title_shape = None
+        title = None
+        first_text = None
+        lines = []
         
-        # Start markdown content
-        md_lines = [
+        for shape in slide.shapes:
+            # The title placeholder is the one with index 0, as in slide.shapes.title
+            if title_shape is None and shape.is_placeholder and shape.placeholder_format.idx == 0:
+                title_shape = shape
+                title = shape.text_frame.text.strip() if shape.has_text_frame else ""
+                continue
+            if not shape.has_text_frame:
+                continue
+            
+            text = shape.text_frame.text.strip()
+            if not text:
+                continue
+            if first_text is None:
+                first_text = text
+            for line in text.split('\n'):
+                if line.strip():
+                    lines.append(line.strip())
+        
+        # Without a title placeholder, a short first text stands in for the title
+        if title_shape is None and first_text is not None and len(first_text) < 100:
+            title = first_text
+        
+        notes = None
+        if slide.has_notes_slide:
+            notes = slide.notes_slide.notes_text_frame.text.strip() or None
+        
+        heading = title or f"Slide {number}"
+        return SlideRecord(
+            number=number,
+            title=title,
+            heading=heading,
+            anchor=f"slide-{number}-{self._slugify(heading)}",
+            lines=lines,
+            notes=notes,
+            image=image
+        )
+    
+    def _write_markdown(self, records: List[SlideRecord], export_name: str, markdown_file: Path):
+        """Write the markdown overview line by line, without building it in memory"""
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            for index, line in enumerate(self._markdown_lines(records, export_name)):
+                if index:
+                    f.write("\n")
+                f.write(line)
+    
+    def _markdown_lines(self, records: List[SlideRecord], export_name: str) -> Iterator[str]:
+        """
+        Lines of the markdown overview
+        
+        Args:
+            records: Extracted slides
+            export_name: Name of the export
+        
+        Yields:
+            Markdown lines, without line endings
+        """
+        yield from [
             f"# {export_name.replace('_', ' ').title()}",
             "",
             "## Metadata",
             f"- **Created**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"- **Total Slides**: {len(prs.slides)}",
-            f"- **Estimated Duration**: {len(prs.slides) * 2} minutes",
+            f"- **Total Slides**: {len(records)}",
+            f"- **Estimated Duration**: {len(records) * 2} minutes",
             f"- **Generated By**: Claude Code Slide Agent",
             "",
             "## Table of Contents",
@@ -198,67 +752,47 @@ class SlideExporter:
         ]
         
         # Add TOC
-        for i, slide in enumerate(prs.slides, 1):
-            title = self._get_slide_title(slide) or f"Slide {i}"
-            md_lines.append(f"{i}. [{title}](#slide-{i}-{self._slugify(title)})")
+        for record in records:
+            yield f"{record.number}. [{record.heading}](#{record.anchor})"
         
-        md_lines.extend(["", "---", "", "## Executive Summary", ""])
+        yield from ["", "---", "", "## Executive Summary", ""]
         
         # Add executive summary
-        summary = self._generate_summary(prs)
-        md_lines.append(summary)
+        yield self._generate_summary(records)
         
-        md_lines.extend(["", "---", "", "## Slides", ""])
+        yield from ["", "---", "", "## Slides", ""]
         
         # Add each slide
-        for i, slide in enumerate(prs.slides, 1):
-            title = self._get_slide_title(slide) or f"Slide {i}"
-            slug = self._slugify(title)
-            
-            md_lines.extend([
-                f"### Slide {i}: {title}",
-                f'<a name="slide-{i}-{slug}"></a>',
+        for record in records:
+            yield from [
+                f"### Slide {record.number}: {record.heading}",
+                f'<a name="{record.anchor}"></a>',
                 ""
-            ])
+            ]
             
             # Add image if available
-            if i <= len(images):
-                image_path = images[i - 1]
-                relative_path = f"images/{image_path.name}"
-                md_lines.extend([
-                    f"![Slide {i}]({relative_path})",
-                    ""
-                ])
+            if record.image:
+                yield from [f"![Slide {record.number}]({record.image})", ""]
             
             # Add content
-            md_lines.extend([
-                "**Content:**",
-                ""
-            ])
+            yield from ["**Content:**", ""]
             
-            content = self._get_slide_content(slide)
-            if content:
-                for line in content:
-                    md_lines.append(f"- {line}")
+            if record.lines:
+                for line in record.lines:
+                    yield f"- {line}"
             else:
-                md_lines.append("*[No text content]*")
+                yield "*[No text content]*"
             
-            md_lines.append("")
+            yield ""
             
             # Add speaker notes
-            notes = self._get_speaker_notes(slide)
-            if notes:
-                md_lines.extend([
-                    "**Speaker Notes:**",
-                    "",
-                    f"> {notes}",
-                    ""
-                ])
+            if record.notes:
+                yield from ["**Speaker Notes:**", "", f"> {record.notes}", ""]
             
-            md_lines.extend(["", "---", ""])
+            yield from ["", "---", ""]
         
         # Add appendix
-        md_lines.extend([
+        yield from [
             "## Appendix",
             "",
             "### Export Information",
@@ -274,62 +808,17 @@ class SlideExporter:
             "Generated by Claude Code Slide Agent",
             "For issues or questions: https://github.com/schlessera/ppt-slide-agent",
             ""
-        ])
-        
-        return "\n".join(md_lines)
-    
-    def _get_slide_title(self, slide) -> Optional[str]:
-        """Extract title from a slide"""
-        if slide.shapes.title:
-            return slide.shapes.title.text.strip()
-        
-        # Look for the first text box
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                text = shape.text.strip()
-                if len(text) < 100:  # Likely a title
-                    return text
-                break
-        
-        return None
-    
-    def _get_slide_content(self, slide) -> List[str]:
-        """Extract all text content from a slide"""
-        content = []
-        
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                # Skip title if already extracted
-                if shape == slide.shapes.title:
-                    continue
-                
-                text = shape.text.strip()
-                # Split by newlines and add each line
-                for line in text.split('\n'):
-                    if line.strip():
-                        content.append(line.strip())
-        
-        return content
-    
-    def _get_speaker_notes(self, slide) -> Optional[str]:
-        """Extract speaker notes from a slide"""
-        if slide.has_notes_slide:
-            notes = slide.notes_slide.notes_text_frame.text.strip()
-            return notes if notes else None
-        return None
+        ]
     
-    def _generate_summary(self, prs: Presentation) -> str:
+    def _generate_summary(self, records: List[SlideRecord]) -> str:
         """Generate an executive summary of the presentation"""
-        titles = []
-        for slide in prs.slides[:10]:  # Look at first 10 slides
-            title = self._get_slide_title(slide)
-            if title:
-                titles.append(title)
+        # Look at first 10 slides
+        titles = [record.title for record in records[:10] if record.title]
         
         if not titles:
             return "This presentation contains visual content with minimal text."
         
-        summary = f"This presentation consists of {len(prs.slides)} slides covering "
+        summary = f"This presentation consists of {len(records)} slides covering "
         
         if len(titles) > 3:
             summary += f"topics including {', '.join(titles[:3])}, and more."
@@ -346,23 +835,14 @@ class SlideExporter:
         text = re.sub(r'[-\s]+', '-', text)
         return text.strip('-')[:50]
     
-    def _generate_pdf(self, pptx_file: Path, output_dir: Path):
+    def _generate_pdf(self, pptx_file: Path, output_dir: Path) -> Optional[Path]:
         """Generate PDF version of the presentation"""
-        try:
-            cmd = [
-                "libreoffice",
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                str(output_dir),
-                str(pptx_file)
-            ]
-            
-            subprocess.run(cmd, check=True)
-            print(f"📑 Generated PDF: {output_dir / f'{pptx_file.stem}.pdf'}")
-        except subprocess.CalledProcessError:
+        pdf_file = self._convert_to_pdf(pptx_file, output_dir)
+        if pdf_file:
+            print(f"📑 Generated PDF: {pdf_file}")
+        else:
             print("⚠️  Could not generate PDF (LibreOffice may not be installed)")
+        return pdf_file
 
 
 def main():
@@ -371,14 +851,41 @@ def main():
     
     parser = argparse.ArgumentParser(description="Export PowerPoint presentations to markdown")
     parser.add_argument("presentation", nargs="?", help="Path to PPTX file")
-    parser.add_argument("--dir", default="./presentations", help="Presentations directory")
+    parser.add_argument("--dir", default=os.getenv("PRESENTATIONS_DIR", "./presentations"),
+                        help="Presentations directory (default: $PRESENTATIONS_DIR or ./presentations)")
     parser.add_argument("--latest", action="store_true", help="Export the latest presentation")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and incrementally export decks in --dir as they are saved")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before a converter process is killed")
+    parser.add_argument("--pyramid", default="thumb:320,medium:960",
+                        help="Preview levels as name:width pairs, empty to skip previews")
+    
+    parser.add_argument("--incremental", action="store_true",
+                        help="Update exports/<name>/ in place, rendering only changed slides")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Slide ranges rendered in parallel (default: number of CPU cores)")
+    parser.add_argument("--debounce", type=float, default=1.0,
+                        help="With --watch, seconds a deck must stay untouched before it is exported")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="With --watch, seconds between directory scans when polling")
+    parser.add_argument("--poll", action="store_true",
+                        help="With --watch, poll instead of using inotify (e.g. on network filesystems)")
     
     args = parser.parse_args()
     
-    exporter = SlideExporter(args.dir)
+    try:
+        pyramid_levels = parse_levels(args.pyramid)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    exporter = SlideExporter(args.dir, timeout=args.timeout, pyramid_levels=pyramid_levels, workers=args.workers)
+    
+    if args.watch:
+        # Stop cleanly when a service manager sends SIGTERM
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        exporter.watch(args.debounce, args.poll_interval, use_inotify=not args.poll)
     
-    if args.latest:
+    elif args.latest:
         # Find the latest PPTX file
         pptx_files = list(Path(args.dir).glob("*.pptx"))
         if not pptx_files:
@@ -387,7 +894,7 @@ def main():
         
         latest = max(pptx_files, key=lambda p: p.stat().st_mtime)
         print(f"📊 Exporting latest presentation: {latest}")
-        exporter.export_to_markdown(latest)
+        exporter.export_to_markdown(latest, incremental=args.incremental)
     
     elif args.presentation:
         pptx_file = Path(args.presentation)
@@ -395,10 +902,10 @@ def main():
             print(f"❌ File not found: {pptx_file}")
             sys.exit(1)
         
-        exporter.export_to_markdown(pptx_file)
+        exporter.export_to_markdown(pptx_file, incremental=args.incremental)
     
     else:
-        print("❌ Please specify a presentation file or use --latest")
+        print("❌ Please specify a presentation file, --latest or --watch")
         sys.exit(1)
 
 
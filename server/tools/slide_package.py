@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Slide Package Tool
+Builds minimal PowerPoint packages containing a subset of a deck's slides,
+and fingerprints slides by everything that affects how they render
+"""
+
+import io
+import copy
+import hashlib
+import zipfile
+from typing import Iterable, List, Optional, Set
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+# Presentation-level parts that only matter for other slides or other views
+_DROPPED_PRESENTATION_RELS = {RT.SLIDE, RT.SLIDE_MASTER, RT.NOTES_MASTER, RT.HANDOUT_MASTER}
+
+# Relationships that do not affect how a slide looks
+_SKIPPED_RELTYPES = {RT.NOTES_SLIDE, RT.SLIDE}
+
+
+def _rels_xml(rels: List) -> bytes:
+    """Serialize a list of relationships to a .rels part"""
+    lines = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>",
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    ]
+    for rel in rels:
+        mode = ' TargetMode="External"' if rel.is_external else ""
+        lines.append(
+            f"<Relationship Id={quoteattr(rel.rId)} Type={quoteattr(rel.reltype)} "
+            f"Target={quoteattr(rel.target_ref)}{mode}/>"
+        )
+    lines.append("</Relationships>")
+    return "\n".join(lines).encode("utf-8")
+
+
+def _content_types_xml(parts: List) -> bytes:
+    lines = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>",
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">',
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>',
+        '<Default Extension="xml" ContentType="application/xml"/>'
+    ]
+    for part in parts:
+        lines.append(
+            f"<Override PartName={quoteattr(str(part.partname))} "
+            f"ContentType={quoteattr(part.content_type)}/>"
+        )
+    lines.append("</Types>")
+    return "\n".join(lines).encode("utf-8")
+
+
+def _filter_id_list(element, tag: str, keep_rids: Set[str]):
+    """Drop entries of an id list (sldIdLst, sldLayoutIdLst, ...) not in keep_rids"""
+    id_list = element.find(f"{_P_NS}{tag}")
+    if id_list is None:
+        return
+    for entry in list(id_list):
+        if entry.get(_R_ID) not in keep_rids:
+            id_list.remove(entry)
+
+
+def _serialize(element) -> bytes:
+    return etree.tostring(element, encoding="UTF-8", standalone=True)
+
+
+def first_slide_number(prs: Presentation) -> int:
+    """Number shown on the deck's first slide"""
+    return int(prs.part._element.get("firstSlideNum", "1"))
+
+
+def shows_slide_number(slide) -> bool:
+    """Whether a slide has a slide number field, whose text depends on its position"""
+    return b'type="slidenum"' in slide.part.blob
+
+
+def extract_slides(prs: Presentation, slide_indices: Iterable[int]) -> bytes:
+    """
+    Build a package holding only the given slides and the parts they use
+
+    The result contains the selected slides with their layouts, masters,
+    themes and media, but none of the other slides, notes or unused
+    layouts, so converting it costs time proportional to the selection
+    rather than to the whole deck.
+
+    The package numbers its slides on from the first one's number in the
+    deck, so slide number fields render as in the deck as long as the
+    selection is contiguous.
+
+    Args:
+        prs: Source presentation (left unmodified)
+        slide_indices: Zero-based indices of the slides to keep, in order
+
+    Returns:
+        The .pptx package as bytes
+    """
+    prs_part = prs.part
+    slide_indices = list(slide_indices)
+    slides = [prs.slides[i] for i in slide_indices]
+    slide_parts = {slide.part for slide in slides}
+    layout_parts = {slide.slide_layout.part for slide in slides}
+    master_parts = {slide.slide_layout.slide_master.part for slide in slides}
+
+    # Relationships to keep from the presentation part, in slide order
+    prs_rels = [
+        rel for rel in prs_part.rels.values()
+        if rel.reltype not in _DROPPED_PRESENTATION_RELS
+        or (not rel.is_external and rel.target_part in master_parts)
+    ]
+    slide_rids = [
+        rel.rId
+        for slide in slides
+        for rel in prs_part.rels.values()
+        if rel.reltype == RT.SLIDE and rel.target_part is slide.part
+    ]
+    prs_rels += [prs_part.rels[rId] for rId in slide_rids]
+    kept_prs_rids = {rel.rId for rel in prs_rels}
+
+    prs_element = copy.deepcopy(prs_part._element)
+    _filter_id_list(prs_element, "sldMasterIdLst", kept_prs_rids)
+    _filter_id_list(prs_element, "sldIdLst", kept_prs_rids)
+    sld_id_lst = prs_element.find(f"{_P_NS}sldIdLst")
+    if sld_id_lst is not None:
+        order = {rId: i for i, rId in enumerate(slide_rids)}
+        entries = sorted(sld_id_lst, key=lambda e: order.get(e.get(_R_ID), 0))
+        for entry in entries:
+            sld_id_lst.append(entry)
+    for tag in ("notesMasterIdLst", "handoutMasterIdLst"):
+        node = prs_element.find(f"{_P_NS}{tag}")
+        if node is not None:
+            prs_element.remove(node)
+    if slide_indices and slide_indices[0] % len(prs.slides):
+        prs_element.set("firstSlideNum", str(first_slide_number(prs) + slide_indices[0] % len(prs.slides)))
+
+    def part_rels(part) -> List:
+        rels = []
+        for rel in part.rels.values():
+            if rel.reltype == RT.NOTES_SLIDE:
+                continue
+            if not rel.is_external:
+                target = rel.target_part
+                if rel.reltype == RT.SLIDE and target not in slide_parts:
+                    continue
+                if rel.reltype == RT.SLIDE_LAYOUT and part in master_parts and target not in layout_parts:
+                    continue
+            rels.append(rel)
+        return rels
+
+    package = prs_part.package
+    root_rels = list(package._rels.values())
+    members = []
+    written = []
+    seen = set()
+    pending = [rel.target_part for rel in root_rels if not rel.is_external]
+
+    while pending:
+        part = pending.pop()
+        if part in seen:
+            continue
+        seen.add(part)
+        written.append(part)
+
+        if part is prs_part:
+            blob, rels = _serialize(prs_element), prs_rels
+        elif part in master_parts:
+            rels = part_rels(part)
+            element = copy.deepcopy(part._element)
+            _filter_id_list(element, "sldLayoutIdLst", {rel.rId for rel in rels})
+            blob = _serialize(element)
+        else:
+            blob, rels = part.blob, part_rels(part)
+
+        members.append((part.partname.membername, blob))
+        if rels:
+            members.append((part.partname.rels_uri.membername, _rels_xml(rels)))
+        pending.extend(rel.target_part for rel in rels if not rel.is_external)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _content_types_xml(written))
+        zf.writestr("_rels/.rels", _rels_xml(root_rels))
+        for membername, blob in members:
+            # Media is already compressed, store it as-is
+            compression = zipfile.ZIP_DEFLATED if membername.endswith((".xml", ".rels")) else zipfile.ZIP_STORED
+            zf.writestr(membername, blob, compress_type=compression)
+
+    return buffer.getvalue()
+
+
+def page_ranges(slide_count: int, shards: int, min_size: int = 1) -> List[range]:
+    """
+    Split a deck into contiguous, evenly sized slide ranges
+
+    Args:
+        slide_count: Number of slides in the deck
+        shards: Maximum number of ranges
+        min_size: Minimum slides per range; fewer ranges are made for small decks
+
+    Returns:
+        Ranges of zero-based slide indices, in slide order
+    """
+    shards = max(1, min(shards, slide_count // max(min_size, 1)))
+    if slide_count <= 0:
+        return []
+    size, extra = divmod(slide_count, shards)
+    ranges = []
+    start = 0
+    for shard in range(shards):
+        end = start + size + (1 if shard < extra else 0)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+def contiguous_runs(indices: Iterable[int]) -> List[List[int]]:
+    """Split ordered slide indices into runs of consecutive slides"""
+    runs: List[List[int]] = []
+    for index in indices:
+        if runs and index == runs[-1][-1] + 1:
+            runs[-1].append(index)
+        else:
+            runs.append([index])
+    return runs
+
+
+def slide_fingerprint(prs, slide, variant: str = "", index: Optional[int] = None) -> str:
+    """
+    Hash everything that determines a slide's rendered appearance
+
+    Covers the slide XML, the slide size, and every part reachable from the
+    slide (layout, master, theme, media), without following the master's
+    links to its other layouts.
+
+    Args:
+        prs: Presentation the slide belongs to
+        slide: Slide to fingerprint
+        variant: Extra key material, e.g. output format or resolution
+        index: Zero-based position of the slide; a slide showing its number
+            renders differently once it moves, so the number is hashed too
+
+    Returns:
+        Hex digest identifying the rendered slide
+    """
+    digest = hashlib.sha256()
+    digest.update(variant.encode())
+    digest.update(f"{prs.slide_width}x{prs.slide_height}".encode())
+    if index is not None and shows_slide_number(slide):
+        digest.update(f"slide-{first_slide_number(prs) + index}".encode())
+
+    seen = set()
+    pending = [slide.part]
+    while pending:
+        part = pending.pop()
+        if part.partname in seen:
+            continue
+        seen.add(part.partname)
+
+        digest.update(part.blob)
+
+        from_master = part.content_type.endswith("slideMaster+xml")
+        for rel in part.rels.values():
+            if rel.reltype in _SKIPPED_RELTYPES:
+                continue
+            if from_master and rel.reltype == RT.SLIDE_LAYOUT:
+                continue
+            if rel.is_external:
+                digest.update(rel.target_ref.encode())
+            else:
+                pending.append(rel.target_part)
+
+    return digest.hexdigest()
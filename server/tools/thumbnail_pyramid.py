@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Pyramid Tool
+Downscales one rendered slide image into smaller preview levels, so
+previews never need a second rasterization
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from PIL import Image
+
+# Name of the level holding the rendered image itself
+FULL_LEVEL = "full"
+
+# Preview levels by pixel width
+DEFAULT_LEVELS = {"thumb": 320, "medium": 960}
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse a level specification like "thumb:320,medium:960"
+
+    Args:
+        spec: Comma-separated name:width pairs; empty for no levels
+
+    Returns:
+        Dictionary of level name to pixel width
+    """
+    levels = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, width = item.partition(":")
+        name = name.strip()
+        if not name or name == FULL_LEVEL or not width.strip().isdigit() or int(width) <= 0:
+            raise ValueError(f"Invalid pyramid level '{item.strip()}', expected name:width")
+        levels[name] = int(width)
+    return levels
+
+
+def select_level(levels: Dict[str, int], max_width: Optional[int]) -> str:
+    """
+    Pick the smallest level at least max_width wide
+
+    Args:
+        levels: Available preview levels
+        max_width: Requested width in pixels, None for the full image
+
+    Returns:
+        Level name, FULL_LEVEL when no preview is wide enough
+    """
+    if not max_width:
+        return FULL_LEVEL
+    wide_enough = [(width, name) for name, width in levels.items() if width >= max_width]
+    return min(wide_enough)[1] if wide_enough else FULL_LEVEL
+
+
+def build_pyramid(
+    image_path: Path,
+    levels: Dict[str, int],
+    output_for: Callable[[str], Path]
+) -> Dict[str, Path]:
+    """
+    Write every preview level of a rendered image
+
+    The image is decoded once and each level is scaled from the next
+    larger one. Levels at least as wide as the image are skipped, the full
+    image serves them.
+
+    Args:
+        image_path: Rendered full-size image
+        levels: Preview levels to produce
+        output_for: Returns the output path for a level name
+
+    Returns:
+        Dictionary of level name to written image
+    """
+    written = {}
+    with Image.open(image_path) as image:
+        image.load()
+        full_width, full_height = image.size
+        current = image
+        for name, width in sorted(levels.items(), key=lambda item: -item[1]):
+            if width >= full_width:
+                continue
+            height = max(1, round(full_height * width / full_width))
+            current = current.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+            path = Path(output_for(name))
+            current.save(path, format="PNG")
+            written[name] = path
+    return written
@@ -0,0 +1,294 @@
+"""
+Worker Router
+Front process of multi-process mode. It starts the worker processes and
+forwards each MCP request to the worker owning the presentation the
+request names, so a presentation stays in one worker's memory instead of
+being rebuilt from the operation log whenever consecutive calls of a
+client land on different workers
+"""
+
+import sys
+import json
+import asyncio
+import contextlib
+import time
+import zlib
+import socket
+import itertools
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+import httpx
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+# Tool arguments naming the presentation a call works on
+NAME_ARGUMENTS = ("presentation_name", "name")
+RESOURCE_PREFIX = "pptx://presentations/"
+
+# Headers describing one hop, set again by whoever sends the next one
+HOP_HEADERS = {"host", "connection", "keep-alive", "transfer-encoding", "content-length", "upgrade"}
+
+# Each worker counts only its own calls, so these ask every worker
+METRICS_PATH = "/metrics"
+METRICS_TOOL = "get_server_metrics"
+
+
+def presentation_name(body: bytes) -> Optional[str]:
+    """Presentation a JSON-RPC request works on, if it names one"""
+    try:
+        message = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or not isinstance(message.get("params"), dict):
+        return None
+
+    params = message["params"]
+    if message.get("method") == "tools/call":
+        arguments = params.get("arguments") or {}
+        for key in NAME_ARGUMENTS:
+            if isinstance(arguments.get(key), str):
+                return arguments[key]
+    elif message.get("method") == "resources/read":
+        uri = params.get("uri")
+        if isinstance(uri, str) and uri.startswith(RESOURCE_PREFIX):
+            return unquote(uri[len(RESOURCE_PREFIX):])
+    return None
+
+
+def tool_name(body: bytes) -> Optional[str]:
+    """Tool a JSON-RPC tools/call request calls"""
+    try:
+        message = json.loads(body)
+    except ValueError:
+        return None
+    if isinstance(message, dict) and message.get("method") == "tools/call" and isinstance(message.get("params"), dict):
+        return message["params"].get("name")
+    return None
+
+
+def label_samples(text: str, worker: int, families: Dict[str, Tuple[List[str], List[str]]]):
+    """
+    Add a worker label to the samples of a Prometheus exposition
+
+    Args:
+        text: Exposition of one worker
+        worker: Index of the worker
+        families: Metric name -> (HELP/TYPE lines, samples), gathering every worker's families
+    """
+    headers, samples = [], []
+    for line in text.splitlines():
+        parts = line.split()
+        if line.startswith("#"):
+            if len(parts) > 2 and parts[1] in ("HELP", "TYPE"):
+                headers, samples = families.setdefault(parts[2], ([], []))
+                if line not in headers:
+                    headers.append(line)
+            continue
+        if not parts:
+            continue
+        name, brace, labels = line.partition("{")
+        if brace:
+            separator = "" if labels.startswith("}") else ","
+            samples.append(f'{name}{{worker="{worker}"{separator}{labels}')
+        else:
+            name, _, value = line.partition(" ")
+            samples.append(f'{name}{{worker="{worker}"}} {value}')
+
+
+def _rpc_messages(response: httpx.Response) -> List[Dict[str, Any]]:
+    """JSON-RPC messages of a worker response, sent as JSON or as server-sent events"""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        return [json.loads(line[5:]) for line in response.text.splitlines() if line.startswith("data:")]
+    return [response.json()]
+
+
+def worker_for(name: str, workers: int) -> int:
+    """Worker owning a presentation, the same in every process and run"""
+    return zlib.crc32(name.encode("utf-8")) % workers
+
+
+class WorkerRouter:
+    """Starts worker processes and routes requests to them by presentation"""
+
+    def __init__(
+        self,
+        workers: int,
+        socket_dir: Path,
+        app: str = "server:create_app",
+        app_dir: Optional[Path] = None,
+        start_timeout: float = 60
+    ):
+        """
+        Initialize the router
+
+        Args:
+            workers: Number of worker processes
+            socket_dir: Directory for the workers' Unix sockets
+            app: ASGI app factory each worker serves, as module:attribute
+            app_dir: Directory the app module is imported from
+            start_timeout: Seconds to wait for a worker to accept connections
+        """
+        self.workers = workers
+        self.socket_dir = Path(socket_dir)
+        self.app_name = app
+        self.app_dir = Path(app_dir) if app_dir else Path(__file__).parent
+        self.start_timeout = start_timeout
+
+        self._processes: List[Optional[subprocess.Popen]] = [None] * workers
+        self._clients: List[httpx.AsyncClient] = []
+        self._restart_lock = threading.Lock()
+        self._round_robin = itertools.cycle(range(workers))
+
+        self.app = Starlette(
+            routes=[Route("/{path:path}", self.forward, methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])],
+            lifespan=self._lifespan
+        )
+
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app):
+        # uvicorn ends with the signal it was stopped by, so atexit handlers
+        # would not run; stop the workers as part of its shutdown instead
+        try:
+            yield
+        finally:
+            for client in self._clients:
+                await client.aclose()
+            await run_in_threadpool(self.stop)
+
+    def socket_path(self, index: int) -> Path:
+        return self.socket_dir / f"worker-{index}.sock"
+
+    def _spawn(self, index: int):
+        path = self.socket_path(index)
+        path.unlink(missing_ok=True)
+        process = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", self.app_name, "--factory",
+            "--uds", str(path), "--app-dir", str(self.app_dir), "--log-level", "warning"
+        ])
+        self._processes[index] = process
+
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Worker {index} exited with code {process.returncode}")
+            with socket.socket(socket.AF_UNIX) as sock:
+                if sock.connect_ex(str(path)) == 0:
+                    return
+            time.sleep(0.1)
+        process.kill()
+        raise RuntimeError(f"Worker {index} did not start within {self.start_timeout}s")
+
+    def start(self):
+        """Start every worker and wait until they accept connections"""
+        self.socket_dir.mkdir(parents=True, exist_ok=True)
+        for index in range(self.workers):
+            self._spawn(index)
+        self._clients = [
+            httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=str(self.socket_path(index))),
+                base_url="http://worker", timeout=None
+            )
+            for index in range(self.workers)
+        ]
+
+    def stop(self):
+        """Terminate the workers"""
+        for process in self._processes:
+            if process is not None and process.poll() is None:
+                process.terminate()
+        for process in self._processes:
+            if process is not None:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    def _ensure_running(self, index: int):
+        """Restart a worker that died; its presentations reload from the operation log"""
+        with self._restart_lock:
+            process = self._processes[index]
+            if process is not None and process.poll() is None:
+                return
+            print(f"Worker {index} exited, restarting", file=sys.stderr)
+            self._spawn(index)
+
+    async def _ask_all(self, request: Request, body: bytes) -> List[Optional[httpx.Response]]:
+        """Send a request to every worker, None for the ones that did not answer"""
+        async def ask(index: int) -> Optional[httpx.Response]:
+            try:
+                await self._running(index)
+                return await self._clients[index].request(
+                    request.method, request.url.path, params=request.query_params,
+                    headers=self._headers(request), content=body
+                )
+            except (httpx.HTTPError, RuntimeError) as e:
+                print(f"Worker {index} did not answer {request.url.path}: {e}", file=sys.stderr)
+                return None
+        return list(await asyncio.gather(*(ask(index) for index in range(self.workers))))
+
+    async def metrics(self, request: Request) -> Response:
+        """Prometheus exposition of every worker, each sample labelled with its worker"""
+        families: Dict[str, Tuple[List[str], List[str]]] = {}
+        for index, response in enumerate(await self._ask_all(request, b"")):
+            if response is not None and response.status_code == 200:
+                label_samples(response.text, index, families)
+        text = "".join(line + "\n" for headers, samples in families.values() for line in headers + samples)
+        return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+    async def tool_metrics(self, request: Request, body: bytes) -> Response:
+        """get_server_metrics answered with the metrics of every worker, by worker index"""
+        message = json.loads(body)
+        workers: Dict[str, Any] = {}
+        for index, response in enumerate(await self._ask_all(request, body)):
+            try:
+                replies = _rpc_messages(response) if response is not None else []
+                result = next(reply for reply in replies if reply.get("id") == message.get("id"))["result"]
+                workers[str(index)] = result.get("structuredContent") or json.loads(result["content"][0]["text"])
+            except (StopIteration, KeyError, IndexError, TypeError, ValueError):
+                workers[str(index)] = {"error": f"Worker {index} did not report metrics"}
+        metrics = {"workers": workers}
+        return JSONResponse({
+            "jsonrpc": "2.0",
+            "id": message.get("id"),
+            "result": {"content": [{"type": "text", "text": json.dumps(metrics)}], "structuredContent": metrics, "isError": False}
+        })
+
+    def _headers(self, request: Request) -> List[Tuple[str, str]]:
+        return [(key, value) for key, value in request.headers.items() if key not in HOP_HEADERS]
+
+    async def _running(self, index: int):
+        process = self._processes[index]
+        if process is None or process.poll() is not None:
+            await run_in_threadpool(self._ensure_running, index)
+
+    async def forward(self, request: Request) -> Response:
+        """Send a request to the owning worker and stream its response back"""
+        if request.method == "GET" and request.url.path == METRICS_PATH:
+            return await self.metrics(request)
+        body = await request.body()
+        if tool_name(body) == METRICS_TOOL:
+            return await self.tool_metrics(request, body)
+        name = presentation_name(body)
+        # Initialization, listings and the like can go to any worker
+        index = worker_for(name, self.workers) if name is not None else next(self._round_robin)
+
+        await self._running(index)
+        client = self._clients[index]
+        upstream = client.build_request(
+            request.method, request.url.path, params=request.query_params,
+            headers=self._headers(request), content=body
+        )
+        response = await client.send(upstream, stream=True)
+        return StreamingResponse(
+            response.aiter_raw(), status_code=response.status_code,
+            headers={key: value for key, value in response.headers.items() if key not in HOP_HEADERS},
+            background=BackgroundTask(response.aclose)
+        )
@@ -0,0 +1,25 @@
+"""
+Test configuration
+Server modules import each other by bare name, so both server/ and
+server/tools/ go on the path, the way server.py and the tools run
+"""
+
+import os
+import sys
+import importlib
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "server" / "tools"))
+sys.path.insert(0, str(ROOT / "server"))
+
+
+@pytest.fixture(scope="session")
+def server(tmp_path_factory):
+    """server.py, configured from the environment to work in a temporary directory"""
+    os.environ["PRESENTATIONS_DIR"] = str(tmp_path_factory.mktemp("presentations"))
+    os.environ["OPLOG_ENABLED"] = "false"
+    os.environ["RENDER_POOL_SIZE"] = "0"
+    return importlib.import_module("server")
@@ -0,0 +1,62 @@
+"""apply_operations tests"""
+
+import asyncio
+
+from pptx import Presentation
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def saved_slide_count(server, name: str) -> int:
+    result = run(server.download_presentation(name))
+    return len(Presentation(result["filepath"]).slides)
+
+
+def test_batch_applies_in_order(server):
+    run(server.create_presentation("batch"))
+
+    result = run(server.apply_operations("batch", [
+        {"op": "add_slide", "layout": "title_only"},
+        {"op": "add_text_to_slide", "slide_index": -1, "text": "Hello"},
+        {"op": "add_speaker_notes", "slide_index": -1, "notes": "Notes"}
+    ]))
+
+    assert result["status"] == "success" and result["applied"] == 3
+    slide = run(server.get_slide_content("batch", 0))
+    assert slide["text_content"] == ["Hello"] and slide["notes"] == "Notes"
+
+
+def test_non_atomic_batch_keeps_successful_operations(server):
+    run(server.create_presentation("partial"))
+
+    result = run(server.apply_operations("partial", [
+        {"op": "add_slide"},
+        {"op": "add_text_to_slide", "slide_index": 5, "text": "Missing"},
+        {"op": "add_slide"}
+    ]))
+
+    assert result["applied"] == 2 and result["failed"] == 1 and not result["rolled_back"]
+    assert saved_slide_count(server, "partial") == 2
+
+
+def test_rollback_leaves_a_working_presentation(server):
+    run(server.create_presentation("atomic"))
+    run(server.add_slide("atomic"))
+    run(server.add_slide("atomic"))
+
+    result = run(server.apply_operations("atomic", [
+        {"op": "add_slide"},
+        {"op": "add_text_to_slide", "slide_index": 9, "text": "Missing"}
+    ], atomic=True))
+    assert result["rolled_back"] and result["applied"] == 0
+
+    # Edits after the rollback must reach the presentation that is saved
+    run(server.add_slide("atomic"))
+    run(server.add_text_to_slide("atomic", -1, "After rollback"))
+
+    assert run(server.get_presentation_info("atomic"))["slide_count"] == 3
+    saved = Presentation(run(server.download_presentation("atomic"))["filepath"])
+    assert len(saved.slides) == 3
+    assert saved.slides[2].shapes.title.text == "After rollback"
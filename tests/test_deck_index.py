@@ -0,0 +1,65 @@
+"""Deck index tests"""
+
+import asyncio
+
+from pptx import Presentation
+
+from deck_index import DeckIndex
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_refresh_updates_changed_and_appended_slides():
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[0]).shapes.title.text = "First"
+    index = DeckIndex(prs, 1)
+
+    prs.slides[0].shapes.title.text = "First slide, edited"
+    prs.slides.add_slide(prs.slide_layouts[5]).shapes.title.text = "Second"
+    index.refresh(prs, [0, 1], 2)
+
+    assert index.version == 2
+    assert [(slide["title"], slide["word_count"]) for slide in index.info()] == [("First slide, edited", 3), ("Second", 1)]
+    assert [slide["index"] for slide in index.info()] == [0, 1]
+
+
+def test_index_follows_edits(server):
+    run(server.create_presentation("indexed"))
+    run(server.add_slide("indexed"))
+    assert run(server.get_presentation_info("indexed"))["slides"][0]["word_count"] == 0
+    index = server.deck_indexes["indexed"]
+
+    run(server.add_text_to_slide("indexed", 0, "Quarterly results"))
+    run(server.add_speaker_notes("indexed", 0, "Keep it short"))
+    run(server.add_slide("indexed", layout="title_only"))
+    info = run(server.get_presentation_info("indexed"))
+
+    assert info["slide_count"] == 2
+    assert info["slides"][0]["title"] == "Quarterly results" and info["slides"][0]["has_notes"]
+    assert info["slides"][1]["word_count"] == 0
+    # Edits refresh the index in place instead of rebuilding it
+    assert server.deck_indexes["indexed"] is index and index.version == server.presentations.version("indexed")
+
+
+def test_index_of_a_removed_or_replaced_deck_is_rebuilt(server):
+    run(server.create_presentation("replaced"))
+    run(server.add_slide("replaced"))
+    run(server.add_text_to_slide("replaced", 0, "Old deck"))
+    assert run(server.get_presentation_info("replaced"))["slide_count"] == 1
+
+    run(server.clear_presentation("replaced"))
+    assert "replaced" not in server.deck_indexes
+    assert run(server.get_presentation_info("replaced")) == {"error": "Presentation 'replaced' not found"}
+
+    run(server.create_presentation("replaced"))
+    assert run(server.get_presentation_info("replaced"))["slide_count"] == 0
+
+    # A deck swapped in without the edit tools, e.g. rolled back
+    other = Presentation()
+    for title in ("One", "Two", "Three"):
+        other.slides.add_slide(other.slide_layouts[5]).shapes.title.text = title
+    server.presentations["replaced"] = other
+    info = run(server.get_presentation_info("replaced"))
+    assert [slide["title"] for slide in info["slides"]] == ["One", "Two", "Three"]
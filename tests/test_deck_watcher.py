@@ -0,0 +1,69 @@
+"""Deck watcher tests"""
+
+import time
+import threading
+
+import pytest
+
+from deck_watcher import DeckWatcher, is_deck
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("deck.pptx", True),
+    ("~$deck.pptx", False),
+    (".~lock.deck.pptx#", False),
+    (".deck.pptx.tmp", False),
+    ("notes.txt", False)
+])
+def test_is_deck(name, expected):
+    assert is_deck(name) == expected
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request, tmp_path):
+    watcher = DeckWatcher(tmp_path, debounce=0.3, poll_interval=0.05, use_inotify=request.param)
+    if request.param and watcher.backend != "inotify":
+        pytest.skip(f"inotify unavailable: {watcher.fallback_reason}")
+    yield watcher
+    watcher.close()
+
+
+def save_repeatedly(path, times: int = 3, pause: float = 0.1) -> threading.Thread:
+    def save():
+        for i in range(times):
+            path.write_bytes(b"deck %d" % i)
+            time.sleep(pause)
+
+    thread = threading.Thread(target=save)
+    thread.start()
+    return thread
+
+
+def last_modified(path) -> float:
+    """Monotonic time of the file's last modification"""
+    return time.monotonic() - (time.time() - path.stat().st_mtime)
+
+
+def test_burst_of_saves_is_reported_once_settled(watcher, tmp_path):
+    changes = watcher.changes()
+    saving = save_repeatedly(tmp_path / "deck.pptx")
+    (tmp_path / "~$deck.pptx").write_bytes(b"owner")
+
+    batch = next(changes)
+    settled_at = time.monotonic()
+    saving.join()
+
+    assert batch == [tmp_path / "deck.pptx"]
+    # The last save restarted the debounce
+    assert settled_at - last_modified(tmp_path / "deck.pptx") >= 0.25
+
+
+def test_deck_deleted_before_settling_is_dropped(watcher, tmp_path):
+    changes = watcher.changes()
+    (tmp_path / "gone.pptx").write_bytes(b"deck")
+    time.sleep(0.1)
+    (tmp_path / "gone.pptx").unlink()
+    time.sleep(0.5)
+    (tmp_path / "kept.pptx").write_bytes(b"deck")
+
+    assert next(changes) == [tmp_path / "kept.pptx"]
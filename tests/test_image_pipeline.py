@@ -0,0 +1,59 @@
+"""Image pipeline tests"""
+
+import os
+import threading
+
+from PIL import Image
+
+from image_pipeline import ImagePipeline
+
+
+def photo(path, size=(2000, 1000)):
+    # Noise has too many colors for PNG, so it is re-encoded as JPEG
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(path)
+    return str(path)
+
+
+def test_downsamples_to_display_size_and_caches(tmp_path):
+    pipeline = ImagePipeline(tmp_path / "cache", dpi=100)
+    source = photo(tmp_path / "photo.png")
+
+    path, width, height = pipeline.prepare(source, width=4)
+    again, _, _ = pipeline.prepare(source, width=4)
+
+    assert (width, height) == (4, 2)
+    with Image.open(path) as image:
+        assert image.size == (400, 200) and image.format == "JPEG"
+    assert again == path
+    assert pipeline.stats()["misses"] == 1 and pipeline.stats()["hits"] == 1
+
+
+def test_small_images_are_embedded_unchanged(tmp_path):
+    pipeline = ImagePipeline(tmp_path / "cache", dpi=100)
+    source = photo(tmp_path / "small.png", (100, 50))
+
+    assert pipeline.prepare(source, width=4) == (source, 4, 2)
+    assert pipeline.stats()["passthrough"] == 1
+
+
+def test_concurrent_prepares_publish_complete_files(tmp_path):
+    pipeline = ImagePipeline(tmp_path / "cache", dpi=150)
+    source = photo(tmp_path / "photo.png", (2400, 1200))
+    start = threading.Barrier(8)
+    results = []
+
+    def prepare():
+        start.wait()
+        results.append(pipeline.prepare(source, width=6)[0])
+
+    threads = [threading.Thread(target=prepare) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and len(set(results)) == 1
+    with Image.open(results[0]) as image:
+        image.load()
+        assert image.size == (900, 450)
+    assert not list((tmp_path / "cache").glob(".*.tmp"))
@@ -0,0 +1,51 @@
+"""Incremental save tests"""
+
+import os
+import zipfile
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from incremental_save import IncrementalSaver
+
+
+def deck(tmp_path) -> Presentation:
+    image_path = tmp_path / "photo.png"
+    Image.frombytes("RGB", (200, 100), os.urandom(200 * 100 * 3)).save(image_path)
+    prs = Presentation()
+    for title in ("One", "Two"):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = title
+        slide.shapes.add_picture(str(image_path), Inches(1), Inches(2))
+    return prs
+
+
+def test_unchanged_parts_are_copied(tmp_path):
+    prs = deck(tmp_path)
+    saver = IncrementalSaver()
+    path = tmp_path / "deck.pptx"
+
+    first = saver.save(prs, path)
+    prs.slides[1].shapes.title.text = "Changed"
+    second = saver.save(prs, path)
+
+    assert first["parts_copied"] == 0
+    # Only the edited slide is written again; everything else, media included, is copied
+    assert second["parts_written"] == 1
+    assert second["parts_copied"] == first["parts_written"] - 1
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+    assert [slide.shapes.title.text for slide in Presentation(path).slides] == ["One", "Changed"]
+
+
+def test_output_changed_elsewhere_is_written_in_full(tmp_path):
+    prs = deck(tmp_path)
+    saver = IncrementalSaver()
+    path = tmp_path / "deck.pptx"
+    saver.save(prs, path)
+
+    Presentation(path).save(path)
+
+    assert saver.save(prs, path)["parts_copied"] == 0
+    assert saver.save(prs, tmp_path / "other.pptx")["parts_copied"] == 0
@@ -0,0 +1,86 @@
+"""Tool metrics tests"""
+
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from fastmcp import FastMCP, Client
+from fastmcp.exceptions import ToolError
+
+from metrics import ToolMetrics, MetricsMiddleware
+
+
+@pytest.fixture
+def metrics():
+    metrics = ToolMetrics()
+    mcp = FastMCP("metrics-test")
+    mcp.add_middleware(MetricsMiddleware(metrics))
+
+    @mcp.tool()
+    def answer(value: str) -> str:
+        return value
+
+    @mcp.tool()
+    def report(result: Dict[str, Any]) -> Dict[str, Any]:
+        return result
+
+    @mcp.tool()
+    def fail() -> str:
+        raise RuntimeError("boom")
+
+    async def call(tool: str, **arguments):
+        async with Client(mcp) as client:
+            try:
+                await client.call_tool(tool, arguments)
+            except ToolError:
+                pass
+
+    metrics.call = lambda tool, **arguments: asyncio.run(call(tool, **arguments))
+    return metrics
+
+
+def errors(metrics: ToolMetrics, tool: str) -> int:
+    return metrics.snapshot()["tools"][tool]["errors"]
+
+
+@pytest.mark.parametrize("value", [
+    "Error creating presentation: template is broken",
+    "Failed to render slide",
+    "Presentation 'deck' not found",
+    "Image file 'logo.png' not found",
+    "Slide index 9 out of range"
+])
+def test_error_strings_count_as_errors(metrics, value):
+    metrics.call("answer", value=value)
+    assert errors(metrics, "answer") == 1
+
+
+@pytest.mark.parametrize("value", ["Added slide 3 with layout 'blank'", "Created presentation 'Errors found'"])
+def test_success_strings_do_not(metrics, value):
+    metrics.call("answer", value=value)
+    assert errors(metrics, "answer") == 0
+
+
+@pytest.mark.parametrize("result, failed", [
+    ({"error": "Presentation 'deck' not found"}, True),
+    ({"status": "error", "failed": 1, "results": []}, True),
+    ({"status": "success", "image_path": "/tmp/slide.png"}, False)
+])
+def test_error_dicts_count_as_errors(metrics, result, failed):
+    metrics.call("report", result=result)
+    assert errors(metrics, "report") == int(failed)
+
+
+def test_raised_exceptions_count_as_errors(metrics):
+    metrics.call("fail")
+    snapshot = metrics.snapshot()["tools"]["fail"]
+    assert snapshot["calls"] == 1 and snapshot["errors"] == 1 and snapshot["in_flight"] == 0
+
+
+def test_prometheus_exposition(metrics):
+    metrics.call("answer", value="ok")
+    text = metrics.prometheus({"pptx_presentations": ("Active presentations", 2)})
+
+    assert 'pptx_tool_calls_total{tool="answer"} 1' in text
+    assert 'pptx_tool_latency_seconds_bucket{tool="answer",le="+Inf"} 1' in text
+    assert "pptx_presentations 2" in text
@@ -0,0 +1,62 @@
+"""Operation log tests"""
+
+from pptx import Presentation
+
+from operation_log import OperationLog, LOG_FILE
+
+
+def op(text: str):
+    return {"type": "op", "op": "add_text_to_slide", "args": {"slide_index": 0, "text": text}}
+
+
+def test_load_returns_records_after_the_latest_snapshot(tmp_path):
+    oplog = OperationLog(tmp_path, fsync_interval=0)
+    oplog.append("deck", [op("one"), op("two")])
+    oplog.snapshot("deck", Presentation())
+    oplog.append("deck", [op("three")])
+
+    snapshot, records = OperationLog(tmp_path).load("deck")
+
+    assert snapshot is not None and snapshot.name == "snapshot-000000000002.pptx"
+    assert [record["seq"] for record in records] == [3]
+    assert records[0]["args"]["text"] == "three"
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    oplog = OperationLog(tmp_path, fsync_interval=0)
+    oplog.append("deck", [op("one")])
+    log_path = oplog._dir("deck") / LOG_FILE
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "type": "op", "op": "add_')
+
+    reopened = OperationLog(tmp_path, fsync_interval=0)
+    _, records = reopened.load("deck")
+    reopened.append("deck", [op("two")])
+
+    assert [record["seq"] for record in records] == [1]
+    assert [record["seq"] for record in reopened.load("deck")[1]] == [1, 2]
+
+
+def test_records_after_catches_up_until_the_log_is_compacted(tmp_path):
+    writer = OperationLog(tmp_path, fsync_interval=0)
+    writer.append("deck", [op("one")])
+    epoch, seq = writer.head("deck")
+    writer.append("deck", [op("two"), op("three")])
+
+    reader = OperationLog(tmp_path, fsync_interval=0)
+    assert [record["seq"] for record in reader.records_after("deck", epoch, seq)] == [2, 3]
+
+    writer.snapshot("deck", Presentation())
+    assert reader.records_after("deck", epoch, seq) is None
+    # A log started over is a different epoch
+    writer.reset("deck", {"type": "create", "template": None})
+    assert reader.records_after("deck", epoch, 3) is None
+
+
+def test_remove(tmp_path):
+    oplog = OperationLog(tmp_path, fsync_interval=0)
+    oplog.reset("a deck/with slashes", {"type": "create", "template": None})
+
+    assert oplog.names() == ["a deck/with slashes"]
+    oplog.remove("a deck/with slashes")
+    assert oplog.names() == [] and not oplog.exists("a deck/with slashes")
@@ -0,0 +1,128 @@
+"""Presentation store tests"""
+
+import threading
+
+import pytest
+from pptx import Presentation
+
+from presentation_store import PresentationStore, estimate_size
+
+
+def deck(slides: int = 1) -> Presentation:
+    prs = Presentation()
+    for number in range(slides):
+        prs.slides.add_slide(prs.slide_layouts[5]).shapes.title.text = f"Slide {number}"
+    return prs
+
+
+@pytest.fixture
+def store(tmp_path):
+    # Room for about two small decks
+    return PresentationStore(tmp_path / "spill", max_bytes=int(estimate_size(deck()) * 2.5), check_interval=0)
+
+
+def test_spills_least_recently_used_and_reloads(store):
+    store["a"] = deck()
+    store["b"] = deck()
+    store["c"] = deck()
+
+    states = {item["name"]: item["state"] for item in store.info()}
+    assert states == {"a": "spilled", "b": "memory", "c": "memory"}
+    assert (store.spill_dir / "a.pptx").exists()
+
+    assert store["a"].slides[0].shapes.title.text == "Slide 0"
+    assert not (store.spill_dir / "a.pptx").exists()
+    assert store.stats()["reloads"] == 1
+    # Reloading a went over budget again, b is now the least recently used
+    assert {item["name"]: item["state"] for item in store.info()}["b"] == "spilled"
+
+
+def test_presentation_locked_by_another_thread_is_not_spilled(store):
+    store["a"] = deck()
+    entered = threading.Event()
+    leave = threading.Event()
+
+    def edit():
+        with store.lock("a"):
+            entered.set()
+            leave.wait(5)
+
+    editor = threading.Thread(target=edit)
+    editor.start()
+    try:
+        assert entered.wait(5)
+        store["b"] = deck()
+        store["c"] = deck()
+        states = {item["name"]: item["state"] for item in store.info()}
+        assert states == {"a": "memory", "b": "spilled", "c": "memory"}
+    finally:
+        leave.set()
+        editor.join(5)
+
+
+def test_spill_does_not_block_other_presentations(store):
+    store["a"] = deck()
+    store["b"] = deck()
+    saving = threading.Event()
+    finish = threading.Event()
+    prs = store["a"]
+    save = prs.save
+
+    def slow_save(path):
+        saving.set()
+        finish.wait(10)
+        save(path)
+
+    prs.save = slow_save
+    store["a"]  # noqa: B018 - a is now the most recently used
+    store["b"]  # noqa: B018 - and b again, so a is spilled first
+
+    spiller = threading.Thread(target=store.__setitem__, args=("c", deck()))
+    spiller.start()
+    try:
+        assert saving.wait(5)
+        # The store stays usable while a is written to disk
+        lookup = threading.Thread(target=lambda: (store["b"], store.info(), len(store)))
+        lookup.start()
+        lookup.join(2)
+        assert not lookup.is_alive()
+    finally:
+        finish.set()
+        spiller.join(5)
+    assert {item["name"]: item["state"] for item in store.info()}["a"] == "spilled"
+
+
+def test_deleted_presentation_keeps_its_lock_while_in_use(store):
+    store["a"] = deck()
+    entered = threading.Event()
+    leave = threading.Event()
+
+    def hold():
+        with store.lock("a"):
+            entered.set()
+            leave.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert entered.wait(5)
+
+    del store["a"]
+    # A caller arriving now must wait for the same lock, not get a new one
+    use = store.lock("a")
+    assert not use.lock.acquire(blocking=False)
+
+    leave.set()
+    holder.join(5)
+    with use:
+        pass
+    assert "a" not in store._locks
+
+
+def test_version_changes_on_edit_and_replace(store):
+    store["a"] = deck()
+    first = store.version("a")
+    store.mark_dirty("a")
+    edited = store.version("a")
+    store["a"] = deck()
+
+    assert first < edited < store.version("a")
@@ -0,0 +1,57 @@
+"""Preview renderer tests"""
+
+import io
+
+import pytest
+from PIL import Image, ImageFont
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.util import Inches, Pt
+
+import preview_renderer
+from preview_renderer import PreviewRenderer
+
+
+def slide_with_text_shape_and_picture():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+
+    text = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(4), Inches(1)).text_frame
+    text.text = "Quarterly results"
+    text.paragraphs[0].runs[0].font.size = Pt(40)
+
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(5), Inches(0.5), Inches(4), Inches(2))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = RGBColor(0x00, 0x00, 0xFF)
+    shape.line.fill.background()
+
+    picture = io.BytesIO()
+    Image.new("RGB", (40, 20), "red").save(picture, format="PNG")
+    picture.seek(0)
+    slide.shapes.add_picture(picture, Inches(1), Inches(4), Inches(4), Inches(2))
+    return prs, slide
+
+
+@pytest.mark.parametrize("truetype", [True, False], ids=["truetype", "builtin"])
+def test_render_draws_text_shape_and_picture(monkeypatch, truetype):
+    if not truetype:
+        load = ImageFont.truetype
+
+        def missing(font=None, *args, **kwargs):
+            if isinstance(font, str) and font.startswith("DejaVu"):
+                raise OSError("cannot open resource")
+            return load(font, *args, **kwargs)
+        monkeypatch.setattr(ImageFont, "truetype", missing)
+    preview_renderer._font.cache_clear()
+    prs, slide = slide_with_text_shape_and_picture()
+
+    image = PreviewRenderer(prs.slide_width, prs.slide_height, width=1000).render(slide)
+    preview_renderer._font.cache_clear()
+
+    assert image.size == (1000, 750)
+    # 100 px per inch
+    assert image.getpixel((700, 150)) == (0, 0, 255)
+    assert image.getpixel((300, 500)) == (255, 0, 0)
+    assert image.crop((50, 50, 450, 150)).convert("L").getextrema()[0] < 100
+    assert image.getpixel((950, 700)) == (255, 255, 255)
@@ -0,0 +1,123 @@
+"""Process runner tests"""
+
+import time
+import asyncio
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from process_runner import ProcessRunner, CircuitOpenError
+
+
+def spawning(tmp_path: Path, seconds: int = 60):
+    """Command that forks a child, records its pid, then sleeps"""
+    pid_file = tmp_path / "child.pid"
+    return ["sh", "-c", f"sleep {seconds} & echo $! > {pid_file}; sleep {seconds}"], pid_file
+
+
+def assert_exited(pid_file: Path):
+    """Wait for the recorded child to be killed (a zombie counts, its parent is gone)"""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if pid_file.exists() and pid_file.read_text().strip():
+            stat = Path(f"/proc/{int(pid_file.read_text())}/stat")
+            if not stat.exists() or stat.read_text().split(")")[-1].split()[0] == "Z":
+                return
+        time.sleep(0.05)
+    pytest.fail("child process survived")
+
+
+def test_sync_timeout_kills_process_group(tmp_path):
+    runner = ProcessRunner(default_timeout=0.5)
+    cmd, pid_file = spawning(tmp_path)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run_sync(cmd)
+
+    assert_exited(pid_file)
+    assert runner.stats()["timed_out"] == 1 and runner.stats()["running"] == 0
+
+
+def test_async_timeout_kills_process_group(tmp_path):
+    runner = ProcessRunner(default_timeout=0.5)
+    cmd, pid_file = spawning(tmp_path)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(runner.run(cmd))
+
+    assert_exited(pid_file)
+
+
+def test_cancellation_kills_process_group(tmp_path):
+    runner = ProcessRunner(default_timeout=60)
+    cmd, pid_file = spawning(tmp_path)
+
+    async def cancel():
+        task = asyncio.create_task(runner.run(cmd))
+        while not pid_file.exists():
+            await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+
+    assert_exited(pid_file)
+    stats = runner.stats()
+    assert stats["cancelled"] == 1 and stats["running"] == 0
+    assert stats["breakers"]["sh"]["consecutive_failures"] == 0
+
+
+def test_concurrency_limit_queues_calls():
+    runner = ProcessRunner(max_concurrency=1)
+
+    async def both():
+        started = time.monotonic()
+        await asyncio.gather(runner.run(["sleep", "0.3"]), asyncio.to_thread(runner.run_sync, ["sleep", "0.3"]))
+        return time.monotonic() - started
+
+    assert asyncio.run(both()) >= 0.6
+    assert runner.stats()["succeeded"] == 2
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    runner = ProcessRunner(max_concurrency=1)
+
+    async def scenario():
+        running = asyncio.create_task(runner.run(["sleep", "0.3"]))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(runner.run(["true"]))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await running
+        # The slot the cancelled call would have taken is free again
+        await asyncio.wait_for(runner.run(["true"]), 5)
+
+    asyncio.run(scenario())
+    assert runner.stats()["started"] == 2
+
+
+def test_queue_timeout():
+    runner = ProcessRunner(max_concurrency=1, queue_timeout=0.1)
+
+    async def scenario():
+        busy = asyncio.create_task(runner.run(["sleep", "0.5"]))
+        await asyncio.sleep(0.05)
+        with pytest.raises(subprocess.TimeoutExpired):
+            await runner.run(["true"])
+        await busy
+
+    asyncio.run(scenario())
+    assert runner.stats()["rejected"] == 1
+
+
+def test_circuit_opens_after_repeated_failures():
+    runner = ProcessRunner(failure_threshold=2, reset_timeout=60)
+
+    for _ in range(2):
+        assert runner.run_sync(["false"]).returncode != 0
+    with pytest.raises(CircuitOpenError):
+        runner.run_sync(["false"])
+
+    assert runner.stats()["breakers"]["false"]["state"] == "open"
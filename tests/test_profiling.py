@@ -0,0 +1,82 @@
+"""Call profiler tests"""
+
+import cProfile
+import threading
+import tracemalloc
+
+import pytest
+
+import profiling
+from profiling import CallProfiler
+
+
+def allocate(size: int = 100_000):
+    return [str(i) for i in range(size)]
+
+
+def test_profiles_selected_tools_only(tmp_path):
+    profiler = CallProfiler(tmp_path, ["slow_tool"], memory=False)
+
+    assert profiler.call("fast_tool", lambda: "fast") == "fast"
+    assert profiler.call("slow_tool", allocate, 10) == allocate(10)
+
+    assert [path.suffix for path in tmp_path.iterdir()] == [".pstats"]
+    assert profiler.stats()["profiled"] == 1
+
+
+def test_memory_report_and_tracing_stopped(tmp_path):
+    assert not tracemalloc.is_tracing()
+    profiler = CallProfiler(tmp_path, ["*"])
+
+    profiler.call("tool", allocate)
+
+    report = next(tmp_path.glob("*.alloc.txt")).read_text()
+    assert report.startswith("tool: tool\n") and "allocation sites" in report
+    assert not tracemalloc.is_tracing()
+
+
+def test_failing_call_stops_tracing(tmp_path):
+    profiler = CallProfiler(tmp_path, ["*"])
+
+    with pytest.raises(ZeroDivisionError):
+        profiler.call("tool", lambda: 1 / 0)
+
+    assert not tracemalloc.is_tracing() and profiler._tracing == 0
+    assert len(list(tmp_path.glob("*.pstats"))) == 1
+
+
+def test_concurrent_calls_run_unprofiled(tmp_path):
+    profiler = CallProfiler(tmp_path, ["*"])
+    inside = threading.Event()
+    leave = threading.Event()
+    results = []
+
+    def first():
+        inside.set()
+        leave.wait(5)
+        return "first"
+
+    thread = threading.Thread(target=lambda: results.append(profiler.call("tool", first)))
+    thread.start()
+    assert inside.wait(5)
+    results.append(profiler.call("tool", lambda: "second"))
+    leave.set()
+    thread.join(5)
+
+    assert sorted(results) == ["first", "second"]
+    assert profiler.stats()["profiled"] == 1 and profiler.stats()["skipped"] == 1
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiler_already_active_elsewhere(tmp_path, monkeypatch):
+    class Busy(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            # What Python 3.12+ raises when another profiler is active
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", Busy)
+    profiler = CallProfiler(tmp_path, ["*"])
+
+    assert profiler.call("tool", lambda: "done") == "done"
+    assert profiler.stats()["skipped"] == 1 and not list(tmp_path.iterdir())
+    assert not tracemalloc.is_tracing()
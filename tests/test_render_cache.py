@@ -0,0 +1,82 @@
+"""Render cache tests"""
+
+import os
+import threading
+
+from render_cache import RenderCache
+
+
+def image(tmp_path, name: str, size: int = 100):
+    path = tmp_path / f"{name}.png"
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def test_put_and_get(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    source = image(tmp_path, "rendered")
+
+    cached = cache.put("key", source)
+
+    assert cache.get("key") == cached and cached.read_bytes() == source.read_bytes()
+    assert cache.get("other") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=250)
+    cache.put("a", image(tmp_path, "a"))
+    cache.put("b", image(tmp_path, "b"))
+    cache.get("a")
+    cache.put("c", image(tmp_path, "c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 200
+
+
+def test_entries_survive_a_restart(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    old = cache.put("old", image(tmp_path, "old"))
+    new = cache.put("new", image(tmp_path, "new"))
+    os.utime(old, (1, 1))
+
+    # Reopened with room for one entry, the least recently used one goes
+    reopened = RenderCache(tmp_path / "cache", max_bytes=150)
+
+    assert reopened.get("new") == new
+    assert reopened.get("old") is None and not old.exists()
+
+
+def test_file_removed_behind_the_cache_is_a_miss(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    cache.put("key", image(tmp_path, "rendered")).unlink()
+
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_concurrent_puts_from_several_processes(tmp_path):
+    # One cache per server process, all on the same directory
+    caches = [RenderCache(tmp_path / "cache") for _ in range(8)]
+    sources = [image(tmp_path, f"rendered{i}", 64 * 1024) for i in range(len(caches))]
+    start = threading.Barrier(len(caches))
+    errors = []
+
+    def put(cache, source):
+        start.wait()
+        try:
+            for _ in range(20):
+                cache.put("key", source)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=pair) for pair in zip(caches, sources)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert (tmp_path / "cache" / "key.png").read_bytes() in {source.read_bytes() for source in sources}
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == ["key.png"]
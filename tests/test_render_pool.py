@@ -0,0 +1,129 @@
+"""Render pool and worker tests, with stand-in workers instead of LibreOffice"""
+
+import os
+import sys
+import time
+import shlex
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from render_pool import RenderPool, RenderError, RenderTimeout
+from render_worker import CliConverter
+
+# Speaks the worker protocol; inputs named crash-* kill it, hang-* never answer
+STUB_WORKER = textwrap.dedent("""
+    import os, sys, json, time
+    from pathlib import Path
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        response = {"id": request["id"], "ok": True}
+        if request["op"] == "ping":
+            response["converter"] = "stub"
+        else:
+            name = Path(request["input"]).stem
+            if name.startswith("crash"):
+                os._exit(1)
+            if name.startswith("hang"):
+                time.sleep(60)
+            Path(request["outdir"]).mkdir(parents=True, exist_ok=True)
+            output = Path(request["outdir"]) / f"{name}.{request['format']}"
+            output.write_text(str(os.getpid()))
+            response["outputs"] = [str(output)]
+        sys.stdout.write(json.dumps(response) + "\\n")
+        sys.stdout.flush()
+""")
+
+
+def _process_state(pid: int) -> str:
+    """State letter from /proc, "gone" once the process was reaped"""
+    try:
+        return Path(f"/proc/{pid}/stat").read_text().split(")")[-1].split()[0]
+    except FileNotFoundError:
+        return "gone"
+
+
+@pytest.fixture
+def pool(tmp_path):
+    script = tmp_path / "stub_worker.py"
+    script.write_text(STUB_WORKER)
+    pool = RenderPool(
+        size=1,
+        worker_cmd=f"{shlex.quote(sys.executable)} {shlex.quote(str(script))}",
+        profiles_dir=tmp_path / "profiles",
+        job_timeout=2
+    )
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_converts_on_worker(pool, tmp_path):
+    outputs = pool.submit(tmp_path / "deck.pptx", tmp_path / "out", "png")
+
+    assert [output.name for output in outputs] == ["deck.png"]
+    assert pool.stats()["workers"][0]["converter"] == "stub"
+
+
+def test_crashed_worker_is_restarted(pool, tmp_path):
+    first = pool.submit(tmp_path / "before.pptx", tmp_path, "png")[0].read_text()
+
+    with pytest.raises(RenderError, match="exited unexpectedly"):
+        pool.submit(tmp_path / "crash.pptx", tmp_path, "png")
+
+    after = pool.submit(tmp_path / "after.pptx", tmp_path, "png")[0].read_text()
+    stats = pool.stats()
+    assert after != first
+    assert stats["workers"][0]["restarts"] == 1
+    assert stats["completed"] == 2 and stats["failed"] == 1
+
+
+def test_hung_worker_times_out_and_is_restarted(pool, tmp_path, monkeypatch):
+    monkeypatch.setattr("render_pool.RESPONSE_GRACE", 0)
+
+    started = time.monotonic()
+    with pytest.raises(RenderTimeout):
+        pool.submit(tmp_path / "hang.pptx", tmp_path, "png", timeout=0.5)
+    assert time.monotonic() - started < 10
+
+    assert pool.submit(tmp_path / "after.pptx", tmp_path, "png")
+    assert pool.stats()["workers"][0]["restarts"] == 1
+
+
+def test_cli_converter_kills_hung_office_and_its_children(tmp_path):
+    # Forks a child that would keep the profile busy, then hangs
+    office = tmp_path / "office"
+    office.write_text(f"#!/bin/sh\nsleep 60 &\necho $! > {tmp_path / 'child.pid'}\nsleep 60\n")
+    office.chmod(0o755)
+    converter = CliConverter(str(office), tmp_path / "profile", timeout=0.5)
+
+    started = time.monotonic()
+    with pytest.raises(Exception, match="timed out"):
+        converter.convert(tmp_path / "deck.pptx", tmp_path, "png")
+    assert time.monotonic() - started < 10
+
+    child = int((tmp_path / "child.pid").read_text())
+    deadline = time.monotonic() + 5
+    while _process_state(child) not in ("gone", "Z") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _process_state(child) in ("gone", "Z")
+
+
+def test_cli_converter_reports_failures(tmp_path):
+    office = tmp_path / "office"
+    office.write_text("#!/bin/sh\necho 'cannot load' >&2\nexit 3\n")
+    office.chmod(0o755)
+
+    with pytest.raises(RuntimeError, match="cannot load"):
+        CliConverter(str(office), tmp_path / "profile").convert(tmp_path / "deck.pptx", tmp_path, "pdf")
+
+
+def test_profiles_are_private_to_the_server_process(pool, tmp_path):
+    profile = pool._workers[0].profile_dir
+
+    assert profile == tmp_path / "profiles" / str(os.getpid()) / "worker-0"
+    assert profile.is_dir()
+    pool.shutdown()
+    assert not (tmp_path / "profiles" / str(os.getpid())).exists()
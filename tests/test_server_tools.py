@@ -0,0 +1,248 @@
+"""Tool handler tests"""
+
+import os
+import time
+import asyncio
+import threading
+
+import pytest
+from pptx import Presentation
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.mark.parametrize("call, expected", [
+    (lambda server: server.add_slide("racy"), "Presentation 'racy' not found"),
+    (lambda server: server.get_presentation_info("racy"), {"error": "Presentation 'racy' not found"}),
+    (lambda server: server.get_slide_content("racy", 0), {"error": "Presentation 'racy' not found"}),
+    (lambda server: server.download_presentation("racy", in_memory=True), {"error": "Presentation 'racy' not found"}),
+    (lambda server: server.clear_presentation("racy"), "Presentation 'racy' not found"),
+], ids=["add_slide", "get_presentation_info", "get_slide_content", "download_presentation", "clear_presentation"])
+def test_presentation_cleared_while_waiting_for_lock(server, call, expected):
+    run(server.create_presentation("racy"))
+    run(server.add_slide("racy"))
+    locked = threading.Event()
+    clear = threading.Event()
+
+    def hold_and_clear():
+        with server.presentation_lock("racy"):
+            locked.set()
+            clear.wait(5)
+            del server.presentations["racy"]
+
+    holder = threading.Thread(target=hold_and_clear)
+    holder.start()
+    assert locked.wait(5)
+
+    results = []
+    caller = threading.Thread(target=lambda: results.append(run(call(server))))
+    caller.start()
+    # The tool passes its existence check, then waits for the lock
+    time.sleep(0.2)
+    clear.set()
+    holder.join(5)
+    caller.join(5)
+
+    assert results == [expected]
+
+
+def test_outline_images_are_prepared_once(server, tmp_path):
+    from PIL import Image
+
+    image_path = tmp_path / "wide.png"
+    Image.frombytes("RGB", (3000, 1500), os.urandom(3000 * 1500 * 3)).save(image_path)
+    before = server.image_pipeline.stats()
+
+    result = run(server.build_deck_from_outline("outline", {"slides": [
+        {"title": "Sized", "images": [{"path": str(image_path), "width": 4}]},
+        {"title": "Sized again", "images": [{"path": str(image_path), "width": 4}]}
+    ]}))
+
+    after = server.image_pipeline.stats()
+    assert result["status"] == "success" and result["slide_count"] == 2
+    # Downsampled once by the prefetch, then served from the cache for each slide
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+
+@pytest.fixture
+def logged(server, tmp_path, monkeypatch):
+    from operation_log import OperationLog
+
+    monkeypatch.setattr(server, "oplog", OperationLog(tmp_path / "oplog", fsync_interval=0))
+    return server
+
+
+def test_failed_operation_records_its_partial_change(logged):
+    server = logged
+    run(server.create_presentation("partial-op"))
+    run(server.add_slide("partial-op", "title_only"))
+    version = server.presentations.version("partial-op")
+
+    # The title is set before the invalid color is parsed
+    with pytest.raises(ValueError):
+        run(server.add_text_to_slide("partial-op", 0, "Half done", color="zz0000"))
+
+    assert server.presentations.version("partial-op") > version
+    assert run(server.get_slide_content("partial-op", 0))["text_content"] == ["Half done"]
+    recovered, _ = server.load_logged_presentation("partial-op")
+    assert recovered.slides[0].shapes.title.text == "Half done"
+
+
+def test_failed_batch_operation_records_its_partial_change(logged):
+    server = logged
+    run(server.create_presentation("partial-batch"))
+
+    result = run(server.apply_operations("partial-batch", [
+        {"op": "add_slide", "layout": "title_only"},
+        {"op": "add_text_to_slide", "slide_index": 0, "text": "Half done", "color": "zz0000"},
+        {"op": "add_slide"}
+    ]))
+
+    assert result["failed"] == 1 and result["applied"] == 2
+    info = run(server.get_presentation_info("partial-batch"))
+    assert info["slide_count"] == 2
+    recovered, _ = server.load_logged_presentation("partial-batch")
+    assert len(recovered.slides) == 2
+    assert recovered.slides[0].shapes.title.text == "Half done"
+
+
+def test_rendered_slides_keep_their_numbers(server, tmp_path):
+    from test_slide_package import add_number_field
+    from slide_package import first_slide_number
+
+    run(server.create_presentation("numbered"))
+    for _ in range(3):
+        run(server.add_slide("numbered", "blank"))
+    for slide in server.presentations["numbered"].slides:
+        add_number_field(slide)
+
+    single = server._prepare_render("numbered", 2, tmp_path)
+    deck = server._prepare_deck_render("numbered", tmp_path, server.FULL_LEVEL)
+
+    assert first_slide_number(Presentation(single["temp_path"])) == 3
+    assert [first_slide_number(Presentation(item["temp_path"])) for item in deck["slides"]] == [1, 2, 3]
+    # The slides differ only in the number they show
+    assert len({item["cache_key"] for item in deck["slides"]}) == 3
+    assert single["cache_key"] == deck["slides"][2]["cache_key"]
+
+
+def test_failed_shard_stops_the_others_before_cleanup(server, monkeypatch):
+    run(server.create_presentation("shards"))
+    for _ in range(3):
+        run(server.add_slide("shards", "blank"))
+    running = set()
+    stopped = []
+
+    async def convert(input_path, outdir, fmt):
+        if input_path.name.endswith("slide0.pptx"):
+            await asyncio.sleep(0.1)
+            raise server.RenderError("converter crashed")
+        running.add(input_path.name)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Still converting into a directory that is about to go
+            stopped.append(outdir.exists())
+            running.discard(input_path.name)
+
+    monkeypatch.setattr(server, "convert_document", convert)
+    monkeypatch.setattr(server, "RENDER_SHARDS", 3)
+
+    started = time.monotonic()
+    result = run(server.render_presentation_to_images("shards"))
+
+    assert result == {"error": "Failed to render presentation: converter crashed"}
+    assert time.monotonic() - started < 5
+    assert not running and stopped == [True, True]
+
+
+def test_cancelled_pool_render_waits_for_its_job(server, monkeypatch, tmp_path):
+    finished = threading.Event()
+
+    class SlowPool:
+        def submit(self, input_path, outdir, fmt):
+            time.sleep(0.3)
+            finished.set()
+            raise server.RenderError("failed after the caller left")
+
+    monkeypatch.setattr(server, "get_render_pool", lambda: SlowPool())
+    breaker = server.process_runner.breaker("render")
+    failures = breaker.stats()["consecutive_failures"]
+
+    async def cancel():
+        task = asyncio.ensure_future(server.convert_document(tmp_path / "deck.pptx", tmp_path, "png"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return finished.is_set()
+
+    assert run(cancel())
+    assert breaker.stats()["consecutive_failures"] == failures
+
+
+def test_in_memory_download_answers_not_modified_until_the_deck_changes(server):
+    run(server.create_presentation("etag"))
+    run(server.add_slide("etag"))
+    first = run(server.download_presentation("etag", in_memory=True))
+    misses = server.download_cache.misses
+
+    again = run(server.download_presentation("etag", in_memory=True, if_none_match=first["etag"]))
+    assert again["status"] == "not_modified" and again["etag"] == first["etag"]
+    assert server.download_cache.misses == misses
+
+    # Serialization is deterministic, so a dropped cache entry yields the same ETag
+    server.download_cache.discard("etag")
+    assert run(server.download_presentation("etag", in_memory=True))["etag"] == first["etag"]
+
+    run(server.add_slide("etag"))
+    changed = run(server.download_presentation("etag", in_memory=True, if_none_match=first["etag"]))
+    assert changed["status"] == "success" and changed["etag"] != first["etag"]
+    assert run(server.read_presentation_chunk("etag", first["etag"], 0)) == {
+        "error": "Presentation changed since download started, call download_presentation again",
+        "etag": changed["etag"]
+    }
+
+
+def test_chunks_join_into_the_deck(server, monkeypatch):
+    import base64
+    import io
+
+    monkeypatch.setattr(server, "DOWNLOAD_CHUNK_KB", 1)
+    run(server.create_presentation("chunks"))
+    for _ in range(3):
+        run(server.add_slide("chunks"))
+    download = run(server.download_presentation("chunks", in_memory=True))
+    etag, size, chunks = download["etag"], download["size"], download["chunks"]
+
+    assert download["chunk_size"] == 1024 and chunks == -(-size // 1024) > 1
+    data = [base64.b64decode(run(server.read_presentation_chunk("chunks", etag, index))["data"]) for index in range(chunks)]
+    assert [len(chunk) for chunk in data] == [1024] * (chunks - 1) + [size - 1024 * (chunks - 1)]
+    assert b"".join(data) == run(server.presentation_resource("chunks"))
+    assert len(Presentation(io.BytesIO(b"".join(data))).slides) == 3
+    for index in (-1, chunks):
+        assert run(server.read_presentation_chunk("chunks", etag, index)) == {"error": f"Chunk index {index} out of range (0-{chunks - 1})"}
+
+
+def test_download_cache_keeps_recent_decks_within_its_budget():
+    from download_cache import DownloadCache, SerializedDeck
+
+    assert SerializedDeck(1, b"x" * 2048).chunk_count(1024) == 2
+    assert SerializedDeck(1, b"").chunk_count(1024) == 1
+
+    prs = Presentation()
+    size = len(DownloadCache().get("probe", 1, prs).data)
+    cache = DownloadCache(max_bytes=2 * size)
+    for name in ("a", "b"):
+        cache.get(name, 1, prs)
+    cache.get("a", 1, prs)
+    stale = cache.get("c", 1, prs)
+
+    assert (cache.hits, cache.misses) == (1, 3)
+    # b was used least recently
+    assert cache.discard("b") is None and cache.discard("a") is not None
+    # A new version of the deck is serialized again
+    assert cache.get("c", 2, prs) is not stale and cache.misses == 4
@@ -0,0 +1,204 @@
+"""Slide exporter tests"""
+
+import os
+import sys
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+
+from slide_exporter import SlideExporter, slide_images
+from slide_package import first_slide_number
+from test_slide_package import deck
+
+
+def converted_packages(tmp_path, prs, slides):
+    """(slides, first slide number) of each package _convert hands to LibreOffice"""
+    pptx_file = tmp_path / "deck.pptx"
+    prs.save(pptx_file)
+    exporter = SlideExporter(str(tmp_path), workers=1)
+    exporter._convert_to_pdf = lambda pptx, output_dir, profile=None: None
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+
+    parts = exporter._convert(pptx_file, Presentation(pptx_file), work_dir, slides)
+    return [(part["slides"], first_slide_number(Presentation(part["pptx"]))) for part in parts]
+
+
+def stub_exporter(tmp_path, slides: int = 3) -> SlideExporter:
+    """Exporter whose converter writes page-count PDFs and whose rasterizer draws blank slides"""
+    deck(slides).save(tmp_path / "deck.pptx")
+    exporter = SlideExporter(str(tmp_path), workers=1, pyramid_levels={"thumb": 40})
+
+    def convert(pptx_file, output_dir, profile=None):
+        pdf = output_dir / f"{pptx_file.stem}.pdf"
+        pdf.write_text(str(len(Presentation(pptx_file).slides)))
+        return pdf
+
+    def rasterize(parts, images_dir):
+        for part in parts:
+            for index in part["slides"]:
+                Image.new("RGB", (160, 90), "white").save(images_dir / f"slide-{index + 1:03d}.png")
+
+    exporter._convert_to_pdf = convert
+    exporter._rasterize = rasterize
+    return exporter
+
+
+def test_export_reports_every_stage(tmp_path):
+    exporter = stub_exporter(tmp_path)
+
+    result = exporter.export(tmp_path / "deck.pptx")
+
+    assert list(result["timings"]) == ["load", "convert", "rasterize", "previews", "extract", "markdown", "publish_pdf"]
+    assert all(seconds >= 0 for seconds in result["timings"].values())
+    assert [image.name for image in result["images"]] == ["slide-001.png", "slide-002.png", "slide-003.png"]
+    assert (result["export_dir"] / "images" / "thumb" / "slide-003.png").exists()
+    assert result["pdf"].read_text() == "3" and result["rendered"] == 3
+    assert "images/slide-002.png" in result["markdown"].read_text(encoding="utf-8")
+
+
+def test_incremental_export_reports_the_diff_stage(tmp_path):
+    exporter = stub_exporter(tmp_path)
+    exporter.export(tmp_path / "deck.pptx", incremental=True)
+
+    result = exporter.export(tmp_path / "deck.pptx", incremental=True)
+
+    assert list(result["timings"]) == ["load", "diff", "convert", "rasterize", "previews", "extract", "markdown", "publish_pdf"]
+    assert result["rendered"] == 0 and len(result["images"]) == 3
+
+
+def test_incremental_export_keeps_a_current_pdf_without_poppler(tmp_path, monkeypatch):
+    monkeypatch.setattr("slide_exporter.shutil.which", lambda name: None)
+    exporter = stub_exporter(tmp_path)
+    pdf = exporter.export(tmp_path / "deck.pptx", incremental=True)["pdf"]
+
+    unchanged = exporter.export(tmp_path / "deck.pptx", incremental=True)
+    assert unchanged["rendered"] == 0 and unchanged["pdf"] == pdf and pdf.read_text() == "3"
+
+    # Dropping a slide converts nothing, but the PDF has a page too many
+    prs = Presentation(tmp_path / "deck.pptx")
+    prs.slides._sldIdLst.remove(prs.slides._sldIdLst[-1])
+    prs.save(tmp_path / "deck.pptx")
+    shorter = exporter.export(tmp_path / "deck.pptx", incremental=True)
+    assert shorter["rendered"] == 0 and shorter["pdf"] is None and not pdf.exists()
+
+
+def test_failed_stage_propagates_and_cleans_up(tmp_path):
+    exporter = stub_exporter(tmp_path)
+
+    def fail(prs, images_dir):
+        raise RuntimeError("extract failed")
+    exporter._extract_slides = fail
+
+    with pytest.raises(RuntimeError, match="extract failed"):
+        exporter.export(tmp_path / "deck.pptx")
+    export_dir, = (tmp_path / "exports").iterdir()
+    assert not list(export_dir.glob(".work_*"))
+
+
+def test_failed_conversion_exports_without_pdf(tmp_path):
+    exporter = stub_exporter(tmp_path)
+    exporter._convert_to_pdf = lambda pptx_file, output_dir, profile=None: None
+    exporter._rasterize = lambda parts, images_dir: None
+
+    result = exporter.export(tmp_path / "deck.pptx")
+
+    assert result["pdf"] is None and result["images"] == []
+    assert "publish_pdf" in result["timings"]
+
+
+FAKE_PDFTOPPM = """#!{python}
+import sys
+from pathlib import Path
+
+args = sys.argv[1:]
+pdf, root = Path(args[-2]), args[-1]
+pages = int(pdf.read_text())
+first = int(args[args.index("-f") + 1]) if "-f" in args else 1
+last = int(args[args.index("-l") + 1]) if "-l" in args else pages
+with open(pdf.with_suffix(".log"), "a") as log:
+    log.write(f"{{first}}-{{last}}\\n")
+# Like pdftoppm, pad page numbers to the width of the page count
+for page in range(first, last + 1):
+    Path(f"{{root}}-{{page:0{{len(str(pages))}}d}}.png").write_text(str(page))
+"""
+
+
+@pytest.fixture
+def fake_pdftoppm(tmp_path, monkeypatch):
+    """pdftoppm on the PATH that writes each page's number into its image"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pdftoppm"
+    script.write_text(FAKE_PDFTOPPM.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def rasterized(tmp_path, pages: int, workers: int):
+    """Page ranges pdftoppm was run on, and the page shown by each slide image"""
+    exporter = SlideExporter(str(tmp_path), workers=workers)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    pdf = work_dir / "deck.pdf"
+    pdf.write_text(str(pages))
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+
+    part = {"slides": list(range(pages)), "pdf": pdf, "pptx": None, "dir": work_dir, "profile": None}
+    images = exporter._rasterize([part], images_dir)
+    ranges = sorted(pdf.with_suffix(".log").read_text().split(), key=lambda pages: int(pages.split("-")[0]))
+    return ranges, [(image.name, image.read_text()) for image in images]
+
+
+def test_page_ranges_rasterize_to_contiguous_slides(tmp_path, fake_pdftoppm):
+    ranges, images = rasterized(tmp_path, 12, workers=3)
+
+    assert ranges == ["1-4", "5-8", "9-12"]
+    assert images == [(f"slide-{page:03d}.png", str(page)) for page in range(1, 13)]
+
+
+def test_images_past_three_digits_keep_their_page_order(tmp_path, fake_pdftoppm):
+    ranges, images = rasterized(tmp_path, 1005, workers=2)
+
+    assert ranges == ["1-503", "504-1005"]
+    assert [shown for _, shown in images] == [str(page) for page in range(1, 1006)]
+    assert images[-1] == ("slide-1005.png", "1005")
+
+
+def test_slide_images_sort_by_page_number(tmp_path):
+    for name in ["slide-10.png", "slide-2.png", "slide-1000.png", "slide-100.png", "thumb.png"]:
+        (tmp_path / name).write_bytes(b"")
+
+    assert [image.name for image in slide_images(tmp_path)] == ["slide-2.png", "slide-10.png", "slide-100.png", "slide-1000.png"]
+
+
+def test_changed_numbered_slides_are_converted_in_consecutive_runs(tmp_path):
+    assert converted_packages(tmp_path, deck(12), [1, 2, 6, 10, 11]) == [([1, 2], 2), ([6], 7), ([10, 11], 11)]
+
+
+def test_changed_slides_without_numbers_share_a_package(tmp_path):
+    assert converted_packages(tmp_path, deck(12, numbered=False), [1, 2, 6, 10, 11]) == [([1, 2, 6, 10, 11], 2)]
+
+
+def test_moving_a_numbered_slide_changes_its_hash(tmp_path):
+    exporter = SlideExporter(str(tmp_path), workers=1)
+    numbered = deck(3)
+    plain = deck(3, numbered=False)
+
+    assert len(set(exporter._slide_hashes(numbered))) == 3
+    assert len(set(exporter._slide_hashes(plain))) == 1
+
+
+def test_images_are_matched_to_slides_by_number(tmp_path):
+    exporter = SlideExporter(str(tmp_path), workers=1)
+    images_dir = tmp_path / "images"
+    (images_dir / "thumb").mkdir(parents=True)
+    # Slide 2 failed to render
+    for name in ["slide-001.png", "slide-003.png", "thumb/slide-002.png"]:
+        (images_dir / name).write_bytes(b"")
+
+    records = exporter._extract_slides(deck(3), images_dir)
+
+    assert [record.image for record in records] == ["images/slide-001.png", None, "images/slide-003.png"]
@@ -0,0 +1,88 @@
+"""Slide package tests"""
+
+import io
+import zipfile
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+from slide_package import extract_slides, first_slide_number, page_ranges, slide_fingerprint
+
+_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+
+def add_number_field(slide):
+    """Add a textbox showing the slide's number"""
+    paragraph = slide.shapes.add_textbox(Inches(1), Inches(6), Inches(1), Inches(0.5)).text_frame.paragraphs[0]
+    field = etree.SubElement(paragraph._p, f"{{{_A}}}fld", id="{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}", type="slidenum")
+    etree.SubElement(field, f"{{{_A}}}t").text = "<#>"
+
+
+def deck(slides: int = 8, numbered: bool = True) -> Presentation:
+    prs = Presentation()
+    for _ in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        if numbered:
+            add_number_field(slide)
+    return prs
+
+
+def package(prs: Presentation, indices) -> Presentation:
+    return Presentation(io.BytesIO(extract_slides(prs, indices)))
+
+
+def test_extracted_slides_keep_their_numbers():
+    prs = deck()
+
+    assert first_slide_number(package(prs, [6])) == 7
+    assert first_slide_number(package(prs, range(3, 6))) == 4
+    assert first_slide_number(package(prs, [-1])) == 8
+    assert first_slide_number(package(prs, [0])) == 1
+
+
+def test_extracted_slides_count_from_the_decks_first_number():
+    prs = deck()
+    prs.part._element.set("firstSlideNum", "0")
+
+    assert first_slide_number(package(prs, [6])) == 6
+    assert first_slide_number(package(prs, [0])) == 0
+
+
+def test_fingerprint_of_numbered_slides_depends_on_position():
+    numbered = deck(2)
+    plain = deck(2, numbered=False)
+
+    def keys(prs):
+        return [slide_fingerprint(prs, slide, "png", index) for index, slide in enumerate(prs.slides)]
+
+    assert len(set(keys(numbered))) == 2
+    assert len(set(keys(plain))) == 1
+    # Without a position the slides look the same
+    assert len({slide_fingerprint(numbered, slide, "png") for slide in numbered.slides}) == 1
+
+
+def test_package_holds_only_the_selected_slides():
+    prs = Presentation()
+    for number, layout in enumerate([1, 5, 6]):
+        slide = prs.slides.add_slide(prs.slide_layouts[layout])
+        slide.notes_slide.notes_text_frame.text = f"Notes {number}"
+        if slide.shapes.title is not None:
+            slide.shapes.title.text = f"Slide {number}"
+
+    blob = extract_slides(prs, [1])
+    extracted = Presentation(io.BytesIO(blob))
+
+    assert len(extracted.slides) == 1
+    assert extracted.slides[0].shapes.title.text == "Slide 1"
+    assert [layout.name for layout in extracted.slide_layouts] == [prs.slide_layouts[5].name]
+    with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        assert not [name for name in zf.namelist() if "notesSlide" in name]
+    # The source deck is left alone
+    assert len(prs.slides) == 3 and len(prs.slide_layouts) == 11
+
+
+def test_page_ranges():
+    assert page_ranges(10, 3) == [range(0, 4), range(4, 7), range(7, 10)]
+    assert page_ranges(7, 4, min_size=5) == [range(0, 7)]
+    assert page_ranges(0, 4) == []
@@ -0,0 +1,71 @@
+"""Template cache tests"""
+
+import io
+import os
+
+from pptx import Presentation
+
+from template_cache import TemplateCache
+
+
+def template(tmp_path, name: str = "brand", title: str = "Template title"):
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[0]).shapes.title.text = title
+    prs.save(tmp_path / f"{name}.pptx")
+
+
+def reopen(prs: Presentation) -> Presentation:
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return Presentation(io.BytesIO(buffer.getvalue()))
+
+
+def test_clones_are_independent(tmp_path):
+    template(tmp_path)
+    cache = TemplateCache(tmp_path)
+
+    first = cache.create("brand")
+    first.slides[0].shapes.title.text = "Changed"
+    first.slides.add_slide(first.slide_layouts[1])
+    second = cache.create("brand")
+
+    assert len(second.slides) == 1 and second.slides[0].shapes.title.text == "Template title"
+    assert len(first.slides) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_clone_saves_after_the_template_was_used(tmp_path):
+    template(tmp_path)
+    cache = TemplateCache(tmp_path)
+    used = cache.create("brand")
+    used.slides.add_slide(used.slide_layouts[5]).shapes.title.text = "Used"
+    reopen(used)
+    # Reading the cached template fills python-pptx's lazy part proxies
+    cached = Presentation(io.BytesIO(cache._load("brand")))
+    assert cached.slides[0].shapes.title.text == "Template title"
+
+    clone = cache.create("brand")
+    clone.slides[0].shapes.title.text = "Clone title"
+    clone.slides.add_slide(clone.slide_layouts[1]).shapes.title.text = "Clone"
+    saved = reopen(clone)
+    # The first copy still saves on its own after the second one was made
+    used_saved = reopen(used)
+
+    assert [slide.shapes.title.text for slide in saved.slides] == ["Clone title", "Clone"]
+    assert [slide.shapes.title.text for slide in used_saved.slides] == ["Template title", "Used"]
+
+
+def test_default_template_and_changed_files(tmp_path):
+    cache = TemplateCache(tmp_path)
+    blank = cache.create()
+    blank.slides.add_slide(blank.slide_layouts[6])
+    assert len(cache.create().slides) == 0 and len(reopen(blank).slides) == 1
+
+    template(tmp_path)
+    assert cache.create("brand").slides[0].shapes.title.text == "Template title"
+    template(tmp_path, title="New title")
+    stat = (tmp_path / "brand.pptx").stat()
+    os.utime(tmp_path / "brand.pptx", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.create("brand").slides[0].shapes.title.text == "New title"
+    assert cache.warm() == ["default", "brand"]
@@ -0,0 +1,47 @@
+"""Thumbnail pyramid tests"""
+
+import pytest
+from PIL import Image
+
+from thumbnail_pyramid import DEFAULT_LEVELS, FULL_LEVEL, build_pyramid, parse_levels, select_level
+
+
+def test_parse_levels():
+    assert parse_levels("thumb:320, medium:960") == DEFAULT_LEVELS
+    assert parse_levels("") == {}
+    for spec in ("thumb", "thumb:0", "thumb:-5", "full:100", ":100"):
+        with pytest.raises(ValueError):
+            parse_levels(spec)
+
+
+@pytest.mark.parametrize("max_width, expected", [
+    (None, FULL_LEVEL),
+    (0, FULL_LEVEL),
+    (1, "thumb"),
+    (320, "thumb"),
+    (321, "medium"),
+    (960, "medium"),
+    (961, FULL_LEVEL)
+])
+def test_select_level_takes_the_smallest_wide_enough(max_width, expected):
+    assert select_level(DEFAULT_LEVELS, max_width) == expected
+
+
+def test_select_level_without_levels():
+    assert select_level({}, 100) == FULL_LEVEL
+
+
+def test_pyramid_scales_every_narrower_level(tmp_path):
+    image_path = tmp_path / "slide.png"
+    Image.new("RGB", (1600, 900), "white").save(image_path)
+    levels = {"thumb": 320, "medium": 960, "huge": 1600, "tiny": 1}
+
+    written = build_pyramid(image_path, levels, lambda level: tmp_path / f"{level}.png")
+
+    # A level as wide as the image is served by the image itself
+    assert sorted(written) == ["medium", "thumb", "tiny"]
+    sizes = {}
+    for name, path in written.items():
+        with Image.open(path) as image:
+            sizes[name] = image.size
+    assert sizes == {"medium": (960, 540), "thumb": (320, 180), "tiny": (1, 1)}
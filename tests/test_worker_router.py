@@ -0,0 +1,136 @@
+"""Worker router tests"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from worker_router import WorkerRouter, label_samples, presentation_name, worker_for
+
+STUB_APP = '''
+import os
+import json
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+CALLS = 0
+
+
+async def echo(request):
+    body = await request.body()
+    if b"get_server_metrics" in body:
+        message = {"jsonrpc": "2.0", "id": json.loads(body)["id"], "result": {"structuredContent": {"pid": os.getpid()}}}
+        return Response(f"event: message\\ndata: {json.dumps(message)}\\n\\n", media_type="text/event-stream")
+    return JSONResponse({"pid": os.getpid(), "path": request.url.path, "body": body.decode()})
+
+
+async def metrics(request):
+    global CALLS
+    CALLS += 1
+    return PlainTextResponse(
+        "# HELP calls_total Calls\\n# TYPE calls_total counter\\n"
+        f'calls_total{{tool="add_slide"}} {CALLS}\\n'
+        "# HELP pid Process\\n# TYPE pid gauge\\n"
+        f"pid {os.getpid()}\\n"
+    )
+
+
+def create_app():
+    return Starlette(routes=[
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/{path:path}", echo, methods=["GET", "POST"])
+    ])
+'''
+
+
+def call(tool: str, **arguments) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": tool, "arguments": arguments}}).encode()
+
+
+@pytest.mark.parametrize("body, expected", [
+    (call("add_slide", presentation_name="deck"), "deck"),
+    (call("create_presentation", name="new deck"), "new deck"),
+    (call("list_presentations"), None),
+    (json.dumps({"method": "resources/read", "params": {"uri": "pptx://presentations/my%20deck"}}).encode(), "my deck"),
+    (json.dumps({"method": "initialize", "params": {}}).encode(), None),
+    (b"not json", None)
+])
+def test_presentation_name(body, expected):
+    assert presentation_name(body) == expected
+
+
+def test_label_samples_groups_families_of_all_workers():
+    families = {}
+    for worker in range(2):
+        label_samples(
+            '# HELP a_total A\n# TYPE a_total counter\na_total{tool="x"} 1\n\n# HELP b B\n# TYPE b gauge\nb 2\n', worker, families
+        )
+
+    assert families == {
+        "a_total": (["# HELP a_total A", "# TYPE a_total counter"], ['a_total{worker="0",tool="x"} 1', 'a_total{worker="1",tool="x"} 1']),
+        "b": (["# HELP b B", "# TYPE b gauge"], ['b{worker="0"} 2', 'b{worker="1"} 2'])
+    }
+
+
+@pytest.fixture
+def router(tmp_path):
+    (tmp_path / "stub_app.py").write_text(STUB_APP)
+    router = WorkerRouter(2, tmp_path / "sockets", app="stub_app:create_app", app_dir=tmp_path)
+    router.start()
+    yield router
+    router.stop()
+
+
+def post(router: WorkerRouter, bodies):
+    async def send():
+        transport = httpx.ASGITransport(app=router.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://router") as client:
+            return [(await client.post("/mcp", content=body)).json() for body in bodies]
+    return asyncio.run(send())
+
+
+def test_calls_naming_a_presentation_go_to_one_worker(router):
+    names = [f"deck{i}" for i in range(8)]
+    replies = post(router, [call("add_slide", presentation_name=name) for name in names * 2])
+
+    owners = {}
+    for name, reply in zip(names * 2, replies):
+        assert reply["path"] == "/mcp" and json.loads(reply["body"])["params"]["arguments"]["presentation_name"] == name
+        owners.setdefault(name, set()).add(reply["pid"])
+    assert all(len(pids) == 1 for pids in owners.values())
+    pids = [process.pid for process in router._processes]
+    assert all(owners[name] == {pids[worker_for(name, 2)]} for name in names)
+
+
+def test_dead_worker_is_restarted(router):
+    index = worker_for("deck", 2)
+    router._processes[index].kill()
+    router._processes[index].wait()
+
+    reply, = post(router, [call("add_slide", presentation_name="deck")])
+    assert reply["pid"] == router._processes[index].pid
+
+
+def test_metrics_come_from_every_worker(router):
+    async def scrape():
+        transport = httpx.ASGITransport(app=router.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://router") as client:
+            return [(await client.get("/metrics")).text for _ in range(2)]
+    first, second = asyncio.run(scrape())
+
+    pids = [process.pid for process in router._processes]
+    assert first.count("# HELP calls_total") == 1
+    assert f'pid{{worker="0"}} {pids[0]}' in first and f'pid{{worker="1"}} {pids[1]}' in first
+    # Every scrape sees every worker, so counters only go up
+    assert 'calls_total{worker="0",tool="add_slide"} 1' in first and 'calls_total{worker="1",tool="add_slide"} 1' in first
+    assert 'calls_total{worker="0",tool="add_slide"} 2' in second and 'calls_total{worker="1",tool="add_slide"} 2' in second
+
+
+def test_server_metrics_tool_reports_every_worker(router):
+    reply, = post(router, [call("get_server_metrics")])
+
+    pids = [process.pid for process in router._processes]
+    assert reply["id"] == 1
+    assert reply["result"]["structuredContent"] == {"workers": {"0": {"pid": pids[0]}, "1": {"pid": pids[1]}}}